@@ -0,0 +1,16 @@
+"""
+Precompute every dashboard statistic and figure without Streamlit.
+
+    python batch_analysis.py [--out artifacts] [--variants raw clean] [--workers N]
+                             [--format parquet|csv] [--deadline SECONDS]
+
+Artifacts land in one directory per dataset selection; the dashboard serves
+them for unfiltered views whenever they match the loaded data.
+"""
+
+import sys
+
+from core.batch import main
+
+if __name__ == "__main__":
+    sys.exit(main())
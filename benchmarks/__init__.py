@@ -0,0 +1,3 @@
+"""
+Performance checks for the dashboard, run as scripts (python -m benchmarks.<name>).
+"""
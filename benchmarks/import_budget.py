@@ -0,0 +1,75 @@
+"""
+Import-time budget for the dashboard's cold start and its lazily loaded pages.
+
+Each target is imported in a fresh interpreter under `python -X importtime`;
+the cost of a page is measured after the dashboard itself is imported, so it
+is only what a first visit to that page adds. The best of several runs is
+compared with the budget and the script exits non-zero when any target is over.
+
+    python -m benchmarks.import_budget [--runs 3] [--scale 1.0]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Milliseconds; set with about 50% headroom over a measured single-core run
+# (dashboard ~1.25 s, with seaborn and matplotlib it used to be ~2.7 s)
+BUDGETS_MS = {
+    'dashboard_extended': 1900,
+    'views.overview': 250,
+    'views.visualizations': 1600,
+    'views.statistics': 1600,
+    'views.export': 250,
+}
+
+
+def import_time_ms(module, preload=()):
+    """Cumulative import time of a module in a fresh interpreter, after importing `preload`."""
+    statements = [f"import {name}" for name in (*preload, module)]
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "; ".join(statements)],
+                            cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and line.rsplit("|", 1)[-1].strip() == module:
+            return int(line.split("|")[1]) / 1000
+    raise RuntimeError(f"No import time reported for {module}")
+
+
+def measure(runs=3):
+    """Best-of-`runs` import time of every budgeted target in milliseconds."""
+    timings = {}
+    for module in BUDGETS_MS:
+        preload = () if module == 'dashboard_extended' else ('dashboard_extended',)
+        timings[module] = min(import_time_ms(module, preload) for _ in range(runs))
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3, help="runs per target, the fastest counts")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every budget, for slower machines")
+    args = parser.parse_args(argv)
+
+    timings = measure(args.runs)
+    over = []
+    print(f"{'module':<24}{'ms':>8}{'budget':>8}")
+    for module, elapsed in timings.items():
+        budget = BUDGETS_MS[module] * args.scale
+        flag = "" if elapsed <= budget else "  OVER"
+        print(f"{module:<24}{elapsed:>8.0f}{budget:>8.0f}{flag}")
+        if flag:
+            over.append(module)
+
+    if over:
+        print(f"Over budget: {', '.join(over)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
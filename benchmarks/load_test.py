@@ -0,0 +1,397 @@
+"""
+Load test: rerun latency, throughput and memory of one process as concurrent sessions grow.
+
+Each simulated user is a Streamlit AppTest session driving the dashboard
+through a click script (load, clean, charts, statistics tests, export) on its
+own thread, so the sessions of a level share one process and its dataset,
+figure and export caches, as the sessions of one server replica do. Every
+session level runs in a fresh interpreter, after one unmeasured warm-up visit
+unless --cold is given, and reports p50/p95/p99 rerun latency, reruns per
+second and the process RSS sampled while it runs. With --baseline, levels
+whose p95 latency or peak RSS grew past --tolerance times the baseline are
+listed and the script exits non-zero.
+
+    python -m benchmarks.load_test [--sessions 1,2,4,8] [--rounds 1] [--think-time 0.5] [--out FILE] [--baseline FILE]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from benchmarks.pipeline import DEFAULT_RESULTS_DIR, git_revision
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, "dashboard_extended.py")
+
+DEFAULT_SESSIONS = '1,2,4,8'
+DEFAULT_TIMEOUT = 300
+RSS_SAMPLE_SECONDS = 0.1
+PERCENTILES = (50, 95, 99)
+
+RESULTS_VERSION = 1
+
+VISUALIZATIONS = "📈 Visualizations"
+STATISTICS = "🧪 Statistical Analysis"
+EXPORT = "📥 Export"
+
+
+# ==================== CLICK SCRIPT ====================
+
+def _sidebar_button(label):
+    def act(at):
+        next(button for button in at.sidebar.button if label in button.label).click()
+    return act
+
+
+def _button(key):
+    return lambda at: at.button(key=key).click()
+
+
+def _page(page):
+    return lambda at: at.sidebar.radio[0].set_value(page)
+
+
+def _category(category):
+    def act(at):
+        next(box for box in at.selectbox if box.label == "Select Visualization Category").set_value(category)
+    return act
+
+
+def _select(key, value):
+    return lambda at: at.selectbox(key=key).set_value(value)
+
+
+def _download(at):
+    """
+    Build the export the Download button would serve.
+
+    The button's data is a callable that Streamlit only runs when the file is
+    requested, which AppTest cannot do, so the same cache entry is built here.
+    """
+    from core.dataset_store import STORE
+    from core.export import EXPORTS, export_bytes
+
+    state = at.session_state
+    fmt = state['export_format']
+    codec = state[f'export_codec_{fmt}'] if f'export_codec_{fmt}' in state else 'none'
+    key = ('export', state['df_key'], state['filter_key'] if 'filter_key' in state else (), fmt, codec)
+    df = STORE.get(state['df_key'])
+    EXPORTS.get_or_build(key, lambda: export_bytes(df, fmt, codec))
+
+
+# (step, action(at), reruns the app) in the order a user clicks through a first visit
+CLICK_SCRIPT = [
+    ('open', None, True),
+    ('load', _sidebar_button("Load Dataset"), True),
+    ('clean', _sidebar_button("Clean Dataset"), True),
+    ('page_visualizations', _page(VISUALIZATIONS), True),
+    ('age_hist', _button('age_hist'), True),
+    ('diag_pie', _button('diag_pie'), True),
+    ('wbc_dist', _button('wbc_dist'), True),
+    ('category_relationship', _category("🔗 Relationship Analysis"), True),
+    ('corr_heat', _button('corr_heat'), True),
+    ('age_wbc_scatter', _button('age_wbc_scatter'), True),
+    ('category_comparison', _category("📉 Comparison Charts"), True),
+    ('wbc_box', _button('wbc_box'), True),
+    ('page_statistics', _page(STATISTICS), True),
+    ('run_anova', _button('run_anova'), True),
+    ('run_ttest', _button('run_ttest'), True),
+    ('run_chi', _button('run_chi'), True),
+    ('page_export', _page(EXPORT), True),
+    ('export_format', _select('export_format', 'csv'), True),
+    ('download', _download, False),
+]
+
+
+def share_runtime():
+    """
+    Let AppTest sessions run concurrently in one process.
+
+    Each AppTest run installs a mock Runtime as the process-wide instance and
+    clears it when done, which would pull it from under sessions still running;
+    the last installed one stays visible instead. Each run also compiles the
+    script afresh, and CPython's parser is not safe to enter from several
+    threads, so the bytecode is compiled once and shared, as a server's script
+    cache does. The appTest option is set for good, so overlapping runs
+    restoring it out of order leave it on.
+    """
+    from streamlit import config
+    from streamlit.runtime.runtime import Runtime
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+
+    config.set_option("global.appTest", True)
+    if getattr(Runtime, '_shared_by_load_test', False):
+        return
+    last = []
+    compiled = {}
+    compile_lock = threading.Lock()
+    get_bytecode = ScriptCache.get_bytecode
+
+    def shared_bytecode(self, script_path):
+        with compile_lock:
+            if script_path not in compiled:
+                compiled[script_path] = get_bytecode(self, script_path)
+        return compiled[script_path]
+
+    def instance(cls):
+        if cls._instance is not None:
+            last[:] = [cls._instance]
+        if not last:
+            raise RuntimeError("Runtime hasn't been created!")
+        return last[0]
+
+    def exists(cls):
+        return cls._instance is not None or bool(last)
+
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(exists)
+    ScriptCache.get_bytecode = shared_bytecode
+    Runtime._shared_by_load_test = True
+
+
+def run_session(index, rounds, think_time, timeout, seed, results, start_at=0.0):
+    """Run the click script `rounds` times, each as a new user session; append one entry per step to results."""
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed * 1_000 + index)
+    delay = start_at - time.perf_counter()
+    if delay > 0:
+        time.sleep(delay)
+    for round_index in range(rounds):
+        at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        for step, act, reruns in CLICK_SCRIPT:
+            entry = {'session': index, 'round': round_index, 'step': step, 'started': time.perf_counter()}
+            try:
+                if act is not None:
+                    act(at)
+                if reruns:
+                    at.run()
+                entry['seconds'] = time.perf_counter() - entry['started']
+                if reruns and at.exception:
+                    entry['error'] = at.exception[0].message
+            except Exception as error:
+                entry['seconds'] = time.perf_counter() - entry['started']
+                entry['error'] = f"{type(error).__name__}: {error}"
+            entry['rerun'] = reruns
+            results.append(entry)
+            if 'error' in entry:
+                # Later steps depend on this one; the rest of the visit would only repeat the failure
+                break
+            if think_time:
+                time.sleep(rng.expovariate(1 / think_time))
+
+
+# ==================== MEASUREMENT ====================
+
+class RssSampler(threading.Thread):
+    """Samples the process RSS in the background until stopped."""
+
+    def __init__(self, interval=RSS_SAMPLE_SECONDS):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.samples = []
+        self._stop_event = threading.Event()
+
+    def run(self):
+        from core.dataset_store import process_rss_bytes
+
+        while True:
+            rss = process_rss_bytes()
+            if rss is not None:
+                self.samples.append(rss)
+            if self._stop_event.wait(self.interval):
+                return
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def percentiles(values):
+    if not values:
+        return {f'p{q}': None for q in PERCENTILES}
+    points = np.percentile(values, PERCENTILES)
+    return {f'p{q}': float(point) for q, point in zip(PERCENTILES, points)}
+
+
+def summarize(sessions, entries, wall_seconds, rss_samples, baseline_rss):
+    """Latency percentiles, throughput and memory of one level."""
+    reruns = [entry for entry in entries if entry['rerun'] and 'error' not in entry]
+    latencies = [entry['seconds'] for entry in reruns]
+    steps = {}
+    for entry in entries:
+        if 'error' not in entry:
+            steps.setdefault(entry['step'], []).append(entry['seconds'])
+
+    mb = 1024 * 1024
+    peak_rss = max(rss_samples) if rss_samples else None
+    return {
+        'sessions': sessions,
+        'reruns': len(reruns),
+        'errors': [f"session {entry['session']} {entry['step']}: {entry['error']}" for entry in entries if 'error' in entry],
+        'wall_seconds': wall_seconds,
+        'reruns_per_second': len(reruns) / wall_seconds if wall_seconds else None,
+        **percentiles(latencies),
+        'max': max(latencies) if latencies else None,
+        'rss_start_mb': baseline_rss / mb if baseline_rss is not None else None,
+        'rss_peak_mb': peak_rss / mb if peak_rss is not None else None,
+        'rss_mean_mb': sum(rss_samples) / len(rss_samples) / mb if rss_samples else None,
+        'steps': {step: {'count': len(values), **percentiles(values)} for step, values in steps.items()},
+    }
+
+
+def run_level(sessions, rounds=1, think_time=0.0, ramp=0.0, timeout=DEFAULT_TIMEOUT, seed=0, warm=True):
+    """Drive `sessions` concurrent sessions in this process. Returns the level summary."""
+    share_runtime()
+    if warm:
+        warmup = []
+        run_session(-1, 1, 0.0, timeout, seed, warmup)
+        failed = [entry for entry in warmup if 'error' in entry]
+        if failed:
+            raise RuntimeError(f"Warm-up visit failed at {failed[0]['step']}: {failed[0]['error']}")
+
+    from core.dataset_store import process_rss_bytes
+
+    entries = []
+    sampler = RssSampler()
+    baseline_rss = process_rss_bytes()
+    sampler.start()
+    started = time.perf_counter()
+    # Staggered starts: session i begins i/sessions of the way through the ramp
+    threads = [threading.Thread(target=run_session, args=(index, rounds, think_time, timeout, seed, entries,
+                                                         started + ramp * index / sessions))
+               for index in range(sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall_seconds = time.perf_counter() - started
+    sampler.stop()
+    return summarize(sessions, entries, wall_seconds, sampler.samples, baseline_rss)
+
+
+def measure_level(sessions, args):
+    """Run one level in a fresh interpreter, so its RSS and caches start from a clean process."""
+    with tempfile.TemporaryDirectory() as directory:
+        out = os.path.join(directory, "level.json")
+        command = [sys.executable, "-m", "benchmarks.load_test", "--level", str(sessions), "--level-out", out,
+                   "--rounds", str(args.rounds), "--think-time", str(args.think_time), "--ramp", str(args.ramp),
+                   "--timeout", str(args.timeout), "--seed", str(args.seed)]
+        if args.cold:
+            command.append("--cold")
+        result = subprocess.run(command, cwd=ROOT, capture_output=True, text=True)
+        if result.returncode != 0 or not os.path.exists(out):
+            return {'sessions': sessions, 'errors': [f"level process failed:\n{result.stderr[-2000:]}"]}
+        with open(out, encoding="utf-8") as handle:
+            return json.load(handle)
+
+
+def format_level(level):
+    if 'reruns' not in level:
+        return f"{level['sessions']:>8}  ERROR {level['errors'][0]}"
+    latency = "".join(f"{level[f'p{q}'] * 1000:>9.0f}" if level[f'p{q}'] is not None else f"{'-':>9}"
+                      for q in PERCENTILES)
+    rss = f"{level['rss_peak_mb']:>10.0f}" if level['rss_peak_mb'] is not None else f"{'-':>10}"
+    errors = f"  {len(level['errors'])} errors" if level['errors'] else ""
+    return f"{level['sessions']:>8}{level['reruns']:>8}{latency}{level['reruns_per_second']:>10.2f}{rss}{errors}"
+
+
+def compare(levels, baseline, tolerance):
+    """Levels whose p95 latency or peak RSS grew past tolerance x baseline: [(sessions, metric, value, before)]."""
+    previous = {level['sessions']: level for level in baseline.get('levels', []) if 'reruns' in level}
+    worse = []
+    for level in levels:
+        before = previous.get(level['sessions'])
+        if before is None or 'reruns' not in level:
+            continue
+        for metric in ('p95', 'rss_peak_mb'):
+            if before.get(metric) and level.get(metric) and level[metric] > before[metric] * tolerance:
+                worse.append((level['sessions'], metric, level[metric], before[metric]))
+    return worse
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", default=DEFAULT_SESSIONS, help="comma-separated concurrent session counts")
+    parser.add_argument("--rounds", type=int, default=1, help="visits per session, each a new user session")
+    parser.add_argument("--think-time", type=float, default=0.0, help="mean seconds between clicks (exponential)")
+    parser.add_argument("--ramp", type=float, default=0.0, help="seconds over which session starts are spread")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="seconds allowed for one rerun")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the think times")
+    parser.add_argument("--cold", action="store_true", help="skip the warm-up visit, so the first load is measured")
+    parser.add_argument("--out", help="results JSON (default: benchmarks/results/load-<revision>.json)")
+    parser.add_argument("--baseline", help="results JSON of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=1.25, help="growth ratio reported as a regression")
+    parser.add_argument("--level", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--level-out", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.level:
+        level = run_level(args.level, args.rounds, args.think_time, args.ramp, args.timeout, args.seed, not args.cold)
+        with open(args.level_out, "w", encoding="utf-8") as handle:
+            json.dump(level, handle, default=str)
+        return 0
+
+    counts = [int(count) for count in args.sessions.split(",") if count.strip()]
+    revision = git_revision()
+
+    print(f"{'sessions':>8}{'reruns':>8}" + "".join(f"{f'p{q} ms':>9}" for q in PERCENTILES)
+          + f"{'reruns/s':>10}{'RSS MB':>10}", flush=True)
+    levels = []
+    for sessions in counts:
+        level = measure_level(sessions, args)
+        levels.append(level)
+        print(format_level(level), flush=True)
+
+    slowest = next((level for level in reversed(levels) if level.get('steps')), None)
+    if slowest:
+        print(f"\nSlowest steps at {slowest['sessions']} sessions (p95 ms):")
+        ranked = sorted(slowest['steps'].items(), key=lambda item: item[1]['p95'], reverse=True)
+        for step, stats in ranked[:5]:
+            print(f"  {step:<24}{stats['p95'] * 1000:>9.0f}")
+
+    document = {
+        'version': RESULTS_VERSION,
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'revision': revision,
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+        },
+        'settings': {'sessions': counts, 'rounds': args.rounds, 'think_time': args.think_time, 'ramp': args.ramp,
+                     'seed': args.seed, 'warm': not args.cold, 'script': [step for step, _, _ in CLICK_SCRIPT]},
+        'levels': levels,
+    }
+    out = args.out or os.path.join(DEFAULT_RESULTS_DIR, f"load-{revision or datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as handle:
+        json.dump(document, handle, indent=2, default=str)
+    print(f"Results written to {out}")
+
+    for level in levels:
+        for error in level['errors'][:3]:
+            print(f"ERROR  {error}")
+    failed = any(level['errors'] for level in levels)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            worse = compare(levels, json.load(handle), args.tolerance)
+        for sessions, metric, value, before in worse:
+            print(f"WORSE  {sessions:>4} sessions  {metric:<12}{before:>10.3f} -> {value:.3f} ({value / before:.2f}x)")
+        if worse:
+            return 1
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,284 @@
+"""
+Pipeline benchmark: time and peak memory of every stage across cohort sizes.
+
+For each size a synthetic cohort (core.synthetic) is written as CSV once and
+reused across runs. The stages are the dashboard's: loading (CSV parse, as
+load_data on a cold cache, and the Arrow snapshot read of a warm one),
+cleaning, every statistics test and every figure builder, each fed the way
+the dashboard or batch runner feeds it. Each stage is timed as the best of
+--repeat runs, then run once more under tracemalloc for its peak allocation.
+Results are written as JSON; with --baseline, stages that got slower than
+--tolerance times the baseline are listed and the script exits non-zero.
+
+    python -m benchmarks.pipeline [--sizes 10k,100k,1M] [--repeat 3] [--out FILE] [--baseline FILE]
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from core import charts
+from core.batch import CHART_JOBS
+from core.cleaning import clean_frame
+from core.correlation import RankIndex, correlation_columns, pearson_matrix, rank_matrix
+from core.dataset import TEST_VARIABLES, parse_dataset
+from core.incremental import IncrementalStats
+from core.resampling import resample_test
+from core.screening import run_screening
+from core.snapshot import CACHE_DIR, read_snapshot, snapshots_available, write_snapshot
+from core.statistics import anova_batch, chi_square, largest_groups_ttest
+from core.synthetic import COHORT_VERSION, DEFAULT_SEED, write_cohort_csv
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_SIZES = '10k,100k,1M'
+DEFAULT_DATA_DIR = os.path.join(CACHE_DIR, "synthetic")
+DEFAULT_RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+RESULTS_VERSION = 1
+
+_SUFFIXES = {'k': 1_000, 'm': 1_000_000}
+
+
+def parse_size(text):
+    """'10k' -> 10000, '50M' -> 50000000."""
+    text = text.strip().lower().replace('_', '')
+    if text[-1:] in _SUFFIXES:
+        return int(float(text[:-1]) * _SUFFIXES[text[-1]])
+    return int(text)
+
+
+def cohort_file(n_rows, seed=DEFAULT_SEED, data_dir=DEFAULT_DATA_DIR):
+    """Path of the synthetic CSV of a size, written on first use."""
+    path = os.path.join(data_dir, f"cohort-{n_rows}-{seed}-v{COHORT_VERSION}.csv")
+    if not os.path.exists(path):
+        print(f"Writing {n_rows:,}-row cohort to {path}", flush=True)
+        write_cohort_csv(path, n_rows, seed)
+    return path
+
+
+def git_revision():
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+# ==================== STAGES ====================
+
+class StageSkipped(Exception):
+    """A stage that does not apply to this data (e.g. a chart of a column the extract lacks)."""
+
+
+def _two_groups(df, col):
+    counts = df[col].value_counts()
+    return counts.index[0], counts.index[1]
+
+
+def _resampling(df, **options):
+    group1, group2 = _two_groups(df, 'Gender')
+    groups = df['Gender']
+    return resample_test(df.loc[groups == group1, 'WBC'], df.loc[groups == group2, 'WBC'], **options)
+
+
+def stage_list(csv_path, snapshot_dir):
+    """
+    (group, stage, run(state)) in dependency order.
+
+    state carries the frames and summaries built by earlier stages, as the
+    dashboard's shared store does; chart stages include building their inputs
+    (histogram summaries, binned points), so each timing covers what a user waits for.
+    """
+    stages = [
+        ('data', 'load_csv', lambda state: state.update(raw=parse_dataset(csv_path))),
+        ('data', 'clean', lambda state: state.update(clean=clean_frame(state['raw'])[0])),
+    ]
+    if snapshots_available():
+        stages += [
+            ('data', 'snapshot_write', lambda state: write_snapshot('benchmark', state['raw'], snapshot_dir)),
+            ('data', 'load_snapshot', lambda state: read_snapshot('benchmark', snapshot_dir)),
+        ]
+
+    stages += [
+        ('statistics', 'incremental_stats', lambda state: state.update(stats=IncrementalStats.from_frame(state['raw']))),
+        ('statistics', 'anova', lambda state: anova_batch(state['stats'].group_moments('Diagnosis', TEST_VARIABLES))),
+        ('statistics', 'ttest', lambda state: largest_groups_ttest(state['stats'], 'Gender', TEST_VARIABLES)),
+        ('statistics', 'chi_square', lambda state: chi_square(state['stats'].contingency('Gender', 'Diagnosis'))),
+        ('statistics', 'correlation_pearson', lambda state: pearson_matrix(
+            state['stats'].comoments, correlation_columns(state['raw']))),
+        ('statistics', 'correlation_spearman', lambda state: rank_matrix(RankIndex(state['raw']), 'spearman')),
+        ('statistics', 'correlation_kendall', lambda state: rank_matrix(RankIndex(state['raw']), 'kendall')),
+        ('statistics', 'screening', lambda state: run_screening(state['raw'])),
+        # The dashboard's default: DEFAULT_RESAMPLES, exact or binned as the group sizes decide
+        ('statistics', 'resampling', lambda state: _resampling(state['raw'])),
+    ]
+
+    for chart, (required, build) in CHART_JOBS.items():
+        stages.append(('figures', chart, _chart_stage(required, build)))
+    stages.append(('figures', 'corr_heat', lambda state: charts.correlation_heatmap(
+        pearson_matrix(state['stats'].comoments, correlation_columns(state['raw'])))))
+    return stages
+
+
+def _chart_stage(required, build):
+    def run(state):
+        df = state['raw']
+        if not all(col in df.columns for col in required):
+            raise StageSkipped(f"needs {', '.join(col for col in required if col not in df.columns)}")
+        return build(df)
+    return run
+
+
+# ==================== MEASUREMENT ====================
+
+def time_stage(run, state, repeat):
+    """Best and all wall-clock times of `repeat` runs, in seconds."""
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        run(state)
+        times.append(time.perf_counter() - start)
+    return min(times), times
+
+
+def peak_memory(run, state):
+    """Peak bytes allocated by one run (numpy and pandas buffers included), above what was live before it."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        run(state)
+        return tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+
+
+def rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def benchmark_size(n_rows, repeat=3, memory=True, only=None, seed=DEFAULT_SEED, data_dir=DEFAULT_DATA_DIR, log=print):
+    """Results of every stage at one cohort size."""
+    csv_path = cohort_file(n_rows, seed, data_dir)
+    results = []
+    state = {}
+    with tempfile.TemporaryDirectory() as snapshot_dir:
+        for group, stage, run in stage_list(csv_path, snapshot_dir):
+            # Stages that build state always run, so later stages have their inputs
+            selected = only is None or stage in only or group in only
+            if not selected and stage not in ('load_csv', 'incremental_stats'):
+                continue
+            entry = {'size': n_rows, 'group': group, 'stage': stage}
+            try:
+                best, times = time_stage(run, state, repeat if selected else 1)
+                entry.update(seconds=best, runs=times, rows_per_second=n_rows / best if best else None)
+                if memory and selected:
+                    entry['peak_mb'] = peak_memory(run, state) / (1024 * 1024)
+            except StageSkipped as skipped:
+                entry.update(skipped=str(skipped))
+            except Exception as error:
+                entry.update(error=f"{type(error).__name__}: {error}")
+            if not selected:
+                continue
+            results.append(entry)
+            log(format_entry(entry))
+    return results
+
+
+def format_entry(entry):
+    label = f"{entry['size']:>11,}  {entry['group']:<11}{entry['stage']:<22}"
+    if 'skipped' in entry:
+        return f"{label}skipped ({entry['skipped']})"
+    if 'error' in entry:
+        return f"{label}ERROR {entry['error']}"
+    memory = f"{entry['peak_mb']:>10.1f} MB" if 'peak_mb' in entry else ''
+    return f"{label}{entry['seconds'] * 1000:>11.1f} ms{memory}"
+
+
+def compare(results, baseline, tolerance):
+    """Stages slower than tolerance x their baseline time: [(size, stage, seconds, baseline seconds)]."""
+    previous = {(entry['size'], entry['stage']): entry['seconds']
+                for entry in baseline.get('results', []) if 'seconds' in entry}
+    slower = []
+    for entry in results:
+        before = previous.get((entry['size'], entry['stage']))
+        if before and 'seconds' in entry and entry['seconds'] > before * tolerance:
+            slower.append((entry['size'], entry['stage'], entry['seconds'], before))
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="comma-separated row counts, e.g. 10k,1M,50M")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per stage, the fastest counts")
+    parser.add_argument("--only", help="comma-separated stages or groups (data, statistics, figures) to run")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run of each stage")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR, help="where synthetic cohorts are kept")
+    parser.add_argument("--out", help="results JSON (default: benchmarks/results/pipeline-<revision>.json)")
+    parser.add_argument("--baseline", help="results JSON of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=1.25, help="slowdown ratio reported as a regression")
+    args = parser.parse_args(argv)
+
+    sizes = [parse_size(size) for size in args.sizes.split(",") if size.strip()]
+    only = {name.strip() for name in args.only.split(",")} if args.only else None
+    revision = git_revision()
+
+    results = []
+    for n_rows in sizes:
+        results.extend(benchmark_size(n_rows, args.repeat, not args.no_memory, only, args.seed, args.data_dir))
+
+    document = {
+        'version': RESULTS_VERSION,
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'revision': revision,
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+        },
+        'settings': {'sizes': sizes, 'repeat': args.repeat, 'seed': args.seed, 'memory': not args.no_memory},
+        'peak_rss_mb': rss_mb(),
+        'results': results,
+    }
+    out = args.out or os.path.join(DEFAULT_RESULTS_DIR, f"pipeline-{revision or datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as handle:
+        json.dump(document, handle, indent=2, default=str)
+    print(f"Results written to {out}")
+
+    failed = [entry for entry in results if 'error' in entry]
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            slower = compare(results, json.load(handle), args.tolerance)
+        for n_rows, stage, seconds, before in slower:
+            print(f"SLOWER  {n_rows:>11,}  {stage:<22}{before * 1000:>9.1f} ms -> {seconds * 1000:.1f} ms "
+                  f"({seconds / before:.2f}x)")
+        if slower:
+            return 1
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,4 @@
+"""
+Core data and analysis helpers for the Blood Cancer Analysis Dashboard.
+These modules do not import Streamlit so they can be reused outside the app.
+"""
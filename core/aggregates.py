@@ -0,0 +1,181 @@
+"""
+Precomputed aggregate cube for dashboard metrics and group charts.
+
+The cube holds row counts and, for every clinical measure, the non-null count,
+sum, sum of squares, min and max grouped by Diagnosis x Gender x Treatment x
+Treatment_Outcome x age bucket. It is built once per dataset version; metrics,
+value counts and per-group means/variances are then rolled up from the cube in
+O(groups) instead of scanning the rows again.
+"""
+
+import numpy as np
+import pandas as pd
+
+from core.instrumentation import timed
+from core.statistics import GroupMoments
+
+DIMENSIONS = ['Diagnosis', 'Gender', 'Treatment', 'Treatment_Outcome']
+MEASURES = ['Age', 'WBC', 'RBC', 'Hemoglobin', 'Platelets']
+
+AGE_BUCKET = 'Age_Bucket'
+# One-year buckets keep the age frequency chart exact
+AGE_BUCKET_WIDTH = 1
+
+
+class AggregateCube:
+    """Grouped sufficient statistics of one dataset version."""
+
+    def __init__(self, table, dimensions, measures, null_counts, n_rows, columns):
+        self.table = table
+        self.dimensions = dimensions
+        self.measures = measures
+        self.null_counts = null_counts
+        self.n_rows = n_rows
+        self.columns = columns
+
+    @property
+    def nbytes(self):
+        return int(self.table.memory_usage(deep=True).sum())
+
+    @property
+    def n_columns(self):
+        return len(self.columns)
+
+    def missing_total(self):
+        """Total missing cells across all columns."""
+        return int(self.null_counts.sum())
+
+    def completeness(self):
+        """Share of non-missing cells, in percent."""
+        cells = self.n_rows * self.n_columns
+        return 100 - (self.missing_total() / cells * 100) if cells else 100.0
+
+    def merge(self, other):
+        """Cube of both datasets combined, regrouped over the cells of the two tables."""
+        sum_cols = ['n_rows'] + [f'{m}_{stat}' for m in self.measures for stat in ('count', 'sum', 'sumsq')]
+        min_cols = [f'{m}_min' for m in self.measures]
+        max_cols = [f'{m}_max' for m in self.measures]
+        table = pd.concat([self.table, other.table.reindex(columns=self.table.columns)], ignore_index=True)
+
+        if self.dimensions:
+            grouped = table.groupby(self.dimensions, observed=True, dropna=False, sort=False)
+            table = pd.concat([grouped[sum_cols].sum(), grouped[min_cols].min(), grouped[max_cols].max()],
+                              axis=1).reset_index()
+        else:
+            table = pd.concat([table[sum_cols].sum(), table[min_cols].min(), table[max_cols].max()]).to_frame().T
+
+        return AggregateCube(
+            table=table,
+            dimensions=self.dimensions,
+            measures=self.measures,
+            null_counts=self.null_counts.add(other.null_counts, fill_value=0).astype('int64'),
+            n_rows=self.n_rows + other.n_rows,
+            columns=list(dict.fromkeys(self.columns + other.columns)),
+        )
+
+    def rollup(self, dims):
+        """Aggregate the cube down to the given dimensions (rows with missing keys dropped)."""
+        sum_cols = ['n_rows'] + [f'{m}_{stat}' for m in self.measures for stat in ('count', 'sum', 'sumsq')]
+        min_cols = [f'{m}_min' for m in self.measures]
+        max_cols = [f'{m}_max' for m in self.measures]
+
+        if not dims:
+            totals = self.table[sum_cols].sum()
+            totals = pd.concat([totals, self.table[min_cols].min(), self.table[max_cols].max()])
+            return totals.to_frame().T
+
+        grouped = self.table.groupby(dims, observed=True, dropna=True)
+        return pd.concat([grouped[sum_cols].sum(), grouped[min_cols].min(), grouped[max_cols].max()], axis=1)
+
+    def value_counts(self, dim):
+        """Row counts per value of one dimension, largest first."""
+        counts = self.rollup([dim])['n_rows']
+        return counts[counts > 0].sort_values(ascending=False)
+
+    def nunique(self, dim):
+        return int((self.rollup([dim])['n_rows'] > 0).sum())
+
+    def mean(self, measure):
+        totals = self.rollup([]).iloc[0]
+        count = totals[f'{measure}_count']
+        return totals[f'{measure}_sum'] / count if count else np.nan
+
+    def group_moments(self, dim, measures):
+        """Per-group count/mean/variance matrices of several measures from one rollup."""
+        measures = [m for m in measures if m in self.measures]
+        rolled = self.rollup([dim])
+        rolled = rolled[rolled['n_rows'] > 0]
+
+        count = rolled[[f'{m}_count' for m in measures]].to_numpy(dtype=float)
+        total = rolled[[f'{m}_sum' for m in measures]].to_numpy(dtype=float)
+        sumsq = rolled[[f'{m}_sumsq' for m in measures]].to_numpy(dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = np.where(count > 0, total / count, np.nan)
+            var = np.where(count > 1, (sumsq - total * mean) / (count - 1), np.nan)
+        return GroupMoments(groups=list(rolled.index), variables=measures,
+                            count=count, mean=mean, var=np.clip(var, 0, None))
+
+    def group_stats(self, dim, measure):
+        """Count, mean and sample variance of a measure per value of a dimension."""
+        rolled = self.rollup([dim])
+        count = rolled[f'{measure}_count'].astype(float)
+        total = rolled[f'{measure}_sum']
+        sumsq = rolled[f'{measure}_sumsq']
+        mean = total / count.where(count > 0)
+        variance = (sumsq - total * mean) / (count - 1).where(count > 1)
+        stats = pd.DataFrame({'count': count, 'mean': mean, 'var': variance.clip(lower=0)})
+        return stats[stats['count'] > 0]
+
+
+def age_buckets(age, width=AGE_BUCKET_WIDTH):
+    """Lower edge of each patient's age bucket."""
+    return (np.floor(pd.to_numeric(age, errors='coerce') / width) * width).astype('float32')
+
+
+@timed(kind='data')
+def build_cube(df, dimensions=DIMENSIONS, measures=MEASURES):
+    """Scan the frame once and return its AggregateCube."""
+    dims = [d for d in dimensions if d in df.columns]
+    measures = [m for m in measures if m in df.columns]
+
+    keys = {d: df[d] for d in dims}
+    if 'Age' in df.columns:
+        keys[AGE_BUCKET] = age_buckets(df['Age'])
+    group_cols = list(keys)
+
+    frame = pd.DataFrame(keys)
+    frame['n_rows'] = 1
+    agg_cols = []
+    for m in measures:
+        values = df[m].astype('float64')
+        frame[m] = values
+        frame[f'{m}__sq'] = values * values
+        agg_cols.append(m)
+
+    if group_cols:
+        grouped = frame.groupby(group_cols, observed=True, dropna=False, sort=False)
+    else:
+        grouped = frame.groupby(np.zeros(len(frame)), sort=False)
+
+    parts = {'n_rows': grouped['n_rows'].sum()}
+    if agg_cols:
+        stats = grouped[agg_cols].agg(['count', 'sum', 'min', 'max'])
+        sumsq = grouped[[f'{m}__sq' for m in agg_cols]].sum()
+        for m in agg_cols:
+            parts[f'{m}_count'] = stats[(m, 'count')]
+            parts[f'{m}_sum'] = stats[(m, 'sum')]
+            parts[f'{m}_sumsq'] = sumsq[f'{m}__sq']
+            parts[f'{m}_min'] = stats[(m, 'min')]
+            parts[f'{m}_max'] = stats[(m, 'max')]
+
+    table = pd.DataFrame(parts)
+    table = table.reset_index() if group_cols else table.reset_index(drop=True)
+
+    return AggregateCube(
+        table=table,
+        dimensions=dims + ([AGE_BUCKET] if AGE_BUCKET in group_cols else []),
+        measures=agg_cols,
+        null_counts=df.isna().sum(),
+        n_rows=len(df),
+        columns=list(df.columns),
+    )
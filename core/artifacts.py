@@ -0,0 +1,175 @@
+"""
+Precomputed analysis artifacts, written by the batch runner and served by the dashboard.
+
+Each dataset selection gets its own directory, named from a hash of its store
+key (('raw', version) or ('clean', version, options)) and ARTIFACT_VERSION.
+It holds stats tables as Parquet or CSV, figures as JSON in the figure cache's
+on-disk format, and a manifest.json written last. The key already covers the
+source file's content and the cleaning options, so a selection's directory
+is fresh by construction: changed data or code (with a bumped
+ARTIFACT_VERSION) simply looks for a directory that does not exist yet.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+import pandas as pd
+
+from core.correlation import CorrelationResult
+
+# Bump when a chart, test or table layout changes so old artifacts are not served
+ARTIFACT_VERSION = 1
+
+DEFAULT_ARTIFACT_DIR = os.environ.get(
+    "BLOOD_CANCER_ARTIFACT_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "artifacts")
+)
+
+MANIFEST_FILE = "manifest.json"
+
+CORRELATION_PARTS = ('corr', 'pvalues', 'counts')
+
+# Manifests already read in this process, keyed by (path, mtime)
+_manifests = {}
+
+
+def key_digest(df_key):
+    return hashlib.sha256(repr((ARTIFACT_VERSION, df_key)).encode()).hexdigest()[:32]
+
+
+def artifact_dir(df_key, root=None):
+    """Directory holding the artifacts of one dataset selection."""
+    return os.path.join(root or DEFAULT_ARTIFACT_DIR, key_digest(df_key))
+
+
+def figure_id(chart, params=()):
+    """Manifest key of a figure, matching the dashboard's (chart, *params) figure key."""
+    return repr((chart,) + tuple(params))
+
+
+def _replace_atomically(directory, file_name, write):
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, os.path.join(directory, file_name))
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def write_table(directory, name, frame, fmt='parquet'):
+    """Write a stats table. Returns its file name."""
+    file_name = f"{name}.{fmt}"
+    if fmt == 'parquet':
+        _replace_atomically(directory, file_name, frame.to_parquet)
+    else:
+        _replace_atomically(directory, file_name, frame.to_csv)
+    return file_name
+
+
+def write_figure(directory, chart, params, figure, caption):
+    """Write a figure as {caption, figure} JSON. Returns its file name."""
+    file_name = hashlib.sha256(figure_id(chart, params).encode()).hexdigest()[:32] + ".json"
+    document = f'{{"caption": {json.dumps(caption)}, "figure": {figure.to_json() if figure is not None else "null"}}}'
+
+    def write(path):
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.write(document)
+
+    _replace_atomically(directory, file_name, write)
+    return file_name
+
+
+def write_manifest(directory, manifest):
+    def write(path):
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(manifest, handle, indent=2, default=str)
+
+    _replace_atomically(directory, MANIFEST_FILE, write)
+
+
+class Artifacts:
+    """Read access to the artifacts of one dataset selection."""
+
+    def __init__(self, directory, manifest):
+        self.directory = directory
+        self.manifest = manifest
+
+    @classmethod
+    def load(cls, df_key, root=None):
+        """Artifacts of a selection, or None when none have been written for it."""
+        directory = artifact_dir(df_key, root)
+        path = os.path.join(directory, MANIFEST_FILE)
+        try:
+            cache_key = (path, os.stat(path).st_mtime_ns)
+        except OSError:
+            return None
+        if cache_key not in _manifests:
+            try:
+                with open(path, encoding="utf-8") as handle:
+                    manifest = json.load(handle)
+            except (OSError, ValueError):
+                return None
+            if manifest.get('artifact_version') != ARTIFACT_VERSION:
+                return None
+            _manifests[cache_key] = cls(directory, manifest)
+        return _manifests[cache_key]
+
+    @property
+    def created(self):
+        return self.manifest.get('created')
+
+    def meta(self, name):
+        return self.manifest['tables'].get(name, {}).get('meta', {})
+
+    def table(self, name):
+        """A stats table, or None when it was not written."""
+        entry = self.manifest['tables'].get(name)
+        if entry is None:
+            return None
+        path = os.path.join(self.directory, entry['file'])
+        try:
+            if path.endswith('.parquet'):
+                return pd.read_parquet(path)
+            return pd.read_csv(path, index_col=0)
+        except (OSError, ValueError, ImportError):
+            return None
+
+    def figure(self, chart, *params):
+        """(figure, caption) of a chart, or None when it was not written."""
+        entry = self.manifest['figures'].get(figure_id(chart, params))
+        if entry is None:
+            return None
+        try:
+            with open(os.path.join(self.directory, entry['file']), encoding="utf-8") as handle:
+                document = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        if document['figure'] is None:
+            return None, document['caption']
+
+        import plotly.io as pio
+
+        return pio.from_json(json.dumps(document['figure'])), document['caption']
+
+    def correlation(self, method):
+        """CorrelationResult of a method, or None when it was not written."""
+        parts = [self.table(f"correlation_{method}_{part}") for part in CORRELATION_PARTS]
+        if any(part is None for part in parts):
+            return None
+        return CorrelationResult(method, *parts)
+
+    def test_result(self, test, spec):
+        """Result of a dashboard statistics block, in the shape the page expects, or None."""
+        if self.meta(test).get('spec') != repr(spec):
+            return None
+        table = self.table(test)
+        if table is None:
+            return None
+        if test == 'ttest':
+            groups = self.meta(test)['groups']
+            return groups[0], groups[1], table
+        return table
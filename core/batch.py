@@ -0,0 +1,309 @@
+"""
+Headless batch analysis: every dashboard artifact, computed without Streamlit.
+
+The dataset is loaded and cleaned once in the parent and written as Arrow
+snapshots, which pool workers memory-map instead of re-parsing the CSV or
+receiving pickled frames. Independent analyses (summary tables, ANOVA and
+t-tests, all-pairs screening, each correlation method, each chart) run as
+separate jobs, longest first, and each job writes its own files into the
+selection's artifact directory (see core.artifacts); the manifest goes last.
+With a deadline, jobs still running when it passes are terminated and the
+manifest is marked incomplete, so a nightly run never overruns its window.
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from core import charts
+from core.aggregates import AGE_BUCKET, build_cube
+from core.artifacts import ARTIFACT_VERSION, CORRELATION_PARTS, DEFAULT_ARTIFACT_DIR, artifact_dir, figure_id, key_digest, write_figure, write_manifest, write_table
+from core.cleaning import DEFAULT_CLEANING_OPTIONS, clean_frame, options_key
+from core.correlation import METHODS, RankIndex, correlation_columns, pearson_matrix, rank_matrix
+from core.dataset import TEST_VARIABLES, dataset_version, find_data_file, read_dataset
+from core.distributions import summarize
+from core.incremental import IncrementalStats
+from core.pairplot import PAIR_BINS, pair_histogram
+from core.screening import run_screening
+from core.snapshot import read_snapshot, snapshot_path, snapshots_available, write_snapshot
+from core.statistics import anova_batch, largest_groups_ttest
+
+VARIANTS = ('raw', 'clean')
+
+
+def _pair_histograms(df, columns, summaries):
+    return {(a, b): pair_histogram(df[a].to_numpy(dtype=np.float64, na_value=np.nan),
+                                   df[b].to_numpy(dtype=np.float64, na_value=np.nan),
+                                   summaries[a].edges, summaries[b].edges, a, b)
+            for i, a in enumerate(columns) for b in columns[i + 1:]}
+
+
+def _pairplot(df):
+    # Same default columns as the page's pairplot multiselect
+    columns = correlation_columns(df)[:4]
+    if len(columns) < 2:
+        return None
+    summaries = {col: summarize(df[col], bins=PAIR_BINS) for col in columns}
+    return (tuple(columns),), charts.pairplot(columns, summaries, _pair_histograms(df, columns, summaries))
+
+
+# Chart -> (required columns, build(df) returning (figure params, (figure, caption)) or None)
+CHART_JOBS = {
+    'age_hist': (['Age'], lambda df: ((), charts.age_histogram(summarize(df['Age'], bins=40)))),
+    'age_line': (['Age'], lambda df: ((), charts.age_line(build_cube(df).value_counts(AGE_BUCKET).sort_index()))),
+    'diag_pie': (['Diagnosis'], lambda df: ((), charts.diagnosis_pie(df))),
+    'wbc_dist': (['WBC'], lambda df: ((), charts.wbc_violin(summarize(df['WBC'])))),
+    'hgb_kde': (['Hemoglobin'], lambda df: ((), charts.hemoglobin_kde(summarize(df['Hemoglobin'])))),
+    'age_wbc_scatter': (['Age', 'WBC', 'Diagnosis'], lambda df: ((), charts.age_wbc_scatter(df))),
+    'pairplot': ([], _pairplot),
+    'wbc_box': (['Diagnosis', 'WBC'], lambda df: ((), charts.wbc_box(df))),
+    'hgb_gender': (['Gender', 'Hemoglobin'], lambda df: ((), charts.hemoglobin_by_gender(df))),
+    'outcome_sun': (['Treatment_Outcome', 'Diagnosis'], lambda df: ((), charts.outcome_sunburst(df))),
+    'risk_tree': (['Risk_Category', 'Diagnosis'], lambda df: ((), charts.risk_treemap(df))),
+    '3d_scatter': (['Age', 'WBC', 'Hemoglobin', 'Diagnosis'], lambda df: ((), charts.scatter_3d(df))),
+    'bubble_anim': (['Age', 'WBC', 'Diagnosis', 'Platelets'], lambda df: ((), charts.bubble_chart(df))),
+    'parallel': (['Diagnosis'], lambda df: ((), charts.parallel_coordinates(
+        df, [col for col in charts.PARALLEL_COLUMNS if col in df.columns]))),
+}
+
+
+def selection_keys(version, variants=VARIANTS, cleaning_options=DEFAULT_CLEANING_OPTIONS):
+    """Store keys of the dataset selections the dashboard serves, as in its load and clean steps."""
+    keys = {'raw': ('raw', version), 'clean': ('clean', version, options_key(cleaning_options))}
+    return {variant: keys[variant] for variant in variants}
+
+
+def job_list(variants=VARIANTS):
+    """(variant, job, argument) for every analysis, longest-running kinds first."""
+    jobs = []
+    for variant in variants:
+        jobs.append((variant, 'screening', None))
+        jobs.append((variant, 'correlation', 'kendall'))
+    for variant in variants:
+        jobs.append((variant, 'tests', None))
+        jobs.extend((variant, 'correlation', method) for method in METHODS if method != 'kendall')
+        jobs.append((variant, 'summary', None))
+        jobs.extend((variant, 'chart', chart) for chart in CHART_JOBS)
+    return jobs
+
+
+# ==================== WORKERS ====================
+
+# Set per worker by _init_worker: variant -> {directory, format, source}
+_context = {}
+_frames = {}
+
+
+def _init_worker(context):
+    _context.update(context)
+
+
+def _frame(variant):
+    if variant not in _frames:
+        source = _context[variant]['source']
+        # Either a snapshot key to memory-map or, without pyarrow, the frame itself
+        _frames[variant] = read_snapshot(source) if isinstance(source, str) else source
+    return _frames[variant]
+
+
+def _job_name(job):
+    variant, kind, argument = job
+    return f"{variant}/{kind}" + (f"/{argument}" if argument else "")
+
+
+def _summary_tables(df):
+    numeric = df.select_dtypes(include='number')
+    missing = df.isna().sum()
+    return {
+        'describe': numeric.describe().T,
+        'missing': pd.DataFrame({'Missing': missing, 'Missing %': missing / max(len(df), 1) * 100}),
+    }
+
+
+def _run_analysis(df, kind, argument, directory, fmt):
+    """Compute one job and write its files. Returns the manifest entries (tables, figures)."""
+    tables, figures = {}, {}
+
+    def table(name, frame, **meta):
+        tables[name] = {'file': write_table(directory, name, frame, fmt), 'meta': meta}
+
+    def figure(chart, params, built):
+        fig, caption = built
+        figures[figure_id(chart, params)] = {'file': write_figure(directory, chart, params, fig, caption),
+                                             'caption': caption}
+
+    if kind == 'summary':
+        for name, frame in _summary_tables(df).items():
+            table(name, frame)
+    elif kind == 'tests':
+        stats = IncrementalStats.from_frame(df)
+        if 'Diagnosis' in df.columns:
+            table('anova', anova_batch(stats.group_moments('Diagnosis', TEST_VARIABLES)),
+                  spec=repr(('Diagnosis', tuple(TEST_VARIABLES))))
+        ttest = largest_groups_ttest(stats, 'Gender', TEST_VARIABLES) if 'Gender' in df.columns else None
+        if ttest is not None:
+            table('ttest', ttest[2], spec=repr(('Gender', tuple(TEST_VARIABLES))), groups=[str(ttest[0]), str(ttest[1])])
+    elif kind == 'screening':
+        # The pool already runs one job per core
+        table('screening', run_screening(df, max_workers=1), spec=repr(()))
+    elif kind == 'correlation':
+        columns = correlation_columns(df)
+        if argument == 'pearson':
+            comoments = IncrementalStats.from_frame(df).comoments
+            result = pearson_matrix(comoments, [col for col in columns if col in comoments.columns])
+        else:
+            result = rank_matrix(RankIndex(df, columns), argument)
+        for part, frame in zip(CORRELATION_PARTS, (result.corr, result.pvalues, result.counts)):
+            table(f"correlation_{argument}_{part}", frame)
+        if len(result.corr.columns) >= 2:
+            figure('corr_heat', (argument,), charts.correlation_heatmap(result))
+    elif kind == 'chart':
+        required, build = CHART_JOBS[argument]
+        if all(col in df.columns for col in required):
+            built = build(df)
+            if built is not None:
+                params, result = built
+                figure(argument, params, result)
+    return tables, figures
+
+
+def _run_job(job):
+    """Worker entry point. Never raises; failures are reported in the result."""
+    variant, kind, argument = job
+    start = time.perf_counter()
+    try:
+        context = _context[variant]
+        tables, figures = _run_analysis(_frame(variant), kind, argument, context['directory'], context['format'])
+        error = None
+    except Exception:
+        tables, figures, error = {}, {}, traceback.format_exc()
+    return job, tables, figures, error, time.perf_counter() - start
+
+
+# ==================== RUNNER ====================
+
+def run_batch(out_dir=DEFAULT_ARTIFACT_DIR, variants=VARIANTS, max_workers=None, fmt='parquet',
+              deadline=None, file_path=None, log=print):
+    """
+    Compute and write every artifact. Returns {variant: manifest}.
+
+    deadline is in seconds from the start of the run; log receives one line per finished job.
+    """
+    start = time.perf_counter()
+    file_path = find_data_file(file_path)
+    if file_path is None:
+        raise FileNotFoundError("Dataset CSV not found")
+    if fmt == 'parquet' and not snapshots_available():
+        fmt = 'csv'
+
+    version = dataset_version(file_path)
+    raw = read_dataset(file_path, version)
+    keys = selection_keys(version, variants)
+    context, frames = {}, {'raw': raw}
+    for variant, df_key in keys.items():
+        if variant == 'clean':
+            frames['clean'] = clean_frame(raw, DEFAULT_CLEANING_OPTIONS)[0]
+        directory = artifact_dir(df_key, out_dir)
+        os.makedirs(directory, exist_ok=True)
+        # Workers memory-map a snapshot of the frame (the raw one was written by read_dataset)
+        source = frames[variant]
+        if variant == 'raw' and os.path.exists(snapshot_path(version)):
+            source = version
+        elif variant == 'clean' and write_snapshot(key_digest(df_key), source) is not None:
+            source = key_digest(df_key)
+        context[variant] = {'directory': directory, 'format': fmt, 'source': source}
+    log(f"Loaded {len(raw):,} rows in {time.perf_counter() - start:.1f}s")
+
+    jobs = job_list(variants)
+    results = {}
+
+    def record(result):
+        job, tables, figures, error, seconds = result
+        results[job] = result
+        status = "FAILED" if error else f"{seconds:.1f}s"
+        log(f"[{len(results)}/{len(jobs)}] {_job_name(job)} {status}")
+        if error:
+            log(error)
+
+    def remaining():
+        return None if deadline is None else max(deadline - (time.perf_counter() - start), 0)
+
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers == 1:
+        _init_worker(context)
+        _frames.update({variant: frames[variant] for variant in keys})
+        for job in jobs:
+            # In-process jobs cannot be interrupted, so the deadline is checked between them
+            if remaining() == 0:
+                break
+            record(_run_job(job))
+    else:
+        pool = multiprocessing.get_context('spawn').Pool(max_workers, initializer=_init_worker, initargs=(context,))
+        try:
+            finished = pool.imap_unordered(_run_job, jobs)
+            for _ in jobs:
+                try:
+                    record(finished.next(timeout=remaining()))
+                except multiprocessing.TimeoutError:
+                    break
+        finally:
+            # Terminate rather than join so a passed deadline stops running jobs too
+            pool.terminate()
+            pool.join()
+
+    manifests = {}
+    created = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    for variant, df_key in keys.items():
+        variant_jobs = [job for job in jobs if job[0] == variant]
+        manifest = {
+            'artifact_version': ARTIFACT_VERSION,
+            'df_key': repr(df_key),
+            'variant': variant,
+            'dataset_version': version,
+            'source': os.path.abspath(file_path),
+            'rows': len(frames[variant]),
+            'created': created,
+            'complete': all(job in results and results[job][3] is None for job in variant_jobs),
+            'jobs': {},
+            'tables': {},
+            'figures': {},
+        }
+        for job in variant_jobs:
+            if job not in results:
+                manifest['jobs'][_job_name(job)] = {'status': 'not run'}
+                continue
+            _, tables, figures, error, seconds = results[job]
+            manifest['jobs'][_job_name(job)] = {'status': 'failed' if error else 'ok', 'seconds': round(seconds, 3)}
+            manifest['tables'].update(tables)
+            manifest['figures'].update(figures)
+        write_manifest(context[variant]['directory'], manifest)
+        manifests[variant] = manifest
+
+    log(f"Finished {len(results)}/{len(jobs)} jobs in {time.perf_counter() - start:.1f}s -> {out_dir}")
+    return manifests
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute dashboard statistics and figures without Streamlit.")
+    parser.add_argument("--out", default=DEFAULT_ARTIFACT_DIR, help="artifact directory (default: %(default)s)")
+    parser.add_argument("--data", default=None, help="dataset CSV (default: the dashboard's data file)")
+    parser.add_argument("--variants", nargs="+", choices=VARIANTS, default=list(VARIANTS))
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per core)")
+    parser.add_argument("--format", choices=['parquet', 'csv'], default='parquet', help="stats table format")
+    parser.add_argument("--deadline", type=float, default=None,
+                        help="seconds; jobs still running then are stopped and the run is marked incomplete")
+    args = parser.parse_args(argv)
+
+    manifests = run_batch(args.out, tuple(args.variants), args.workers, args.format, args.deadline, args.data)
+    return 0 if all(manifest['complete'] for manifest in manifests.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+"""
+Figure builders for every dashboard chart.
+
+Each builder takes the data it draws (a frame, or precomputed summaries) and
+returns (figure or None, caption or None), the contract of the figure cache.
+The Visualizations page feeds them cached selection summaries; the batch runner
+feeds them the whole dataset.
+"""
+
+import numpy as np
+import plotly.graph_objects as go
+import plotly.express as px
+
+from core.distributions import histogram_figure, violin_figure
+from core.pairplot import PAIR_BINS, pairplot_figure
+from core.rendering import COUNT_COLUMN, describe_reduction, reduce_points
+
+PARALLEL_COLUMNS = ['Age', 'WBC', 'RBC', 'Hemoglobin', 'Platelets']
+
+
+def age_histogram(summary):
+    if summary is None:
+        return None, None
+    fig = histogram_figure(summary, 'Patient Age Distribution', '#636EFA', marginal='box')
+    fig.update_layout(showlegend=False, height=500)
+    return fig, None
+
+
+def age_line(age_counts):
+    """Line graph of patient counts per one-year age bucket."""
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=age_counts.index,
+        y=age_counts.values,
+        mode='lines+markers',
+        name='Patient Count',
+        line=dict(color='#636EFA', width=3),
+        marker=dict(size=6, color='#636EFA')
+    ))
+    fig.update_layout(
+        title='Patient Age Distribution (Line Graph)',
+        xaxis_title='Age',
+        yaxis_title='Count',
+        height=500,
+        showlegend=False,
+        hovermode='x unified'
+    )
+    return fig, None
+
+
+def diagnosis_pie(df):
+    fig = px.pie(df, names='Diagnosis',
+               title='Cancer Type Distribution',
+               hole=0.4,
+               color_discrete_sequence=px.colors.qualitative.Set3)
+    fig.update_traces(textposition='inside', textinfo='percent+label')
+    return fig, None
+
+
+def wbc_violin(summary):
+    if summary is None:
+        return None, None
+    return violin_figure(summary, 'WBC Count Distribution', '#EF553B'), None
+
+
+def hemoglobin_kde(summary):
+    if summary is None:
+        return None, None
+    return histogram_figure(summary, 'Hemoglobin Distribution with KDE', '#00CC96', marginal='kde'), None
+
+
+def correlation_heatmap(result):
+    """Heatmap of a CorrelationResult, with p-values and pair counts on hover."""
+    corr_matrix = result.corr
+    fig = go.Figure(data=go.Heatmap(
+        z=corr_matrix.values,
+        x=corr_matrix.columns,
+        y=corr_matrix.columns,
+        colorscale='RdBu',
+        zmid=0,
+        zmin=-1,
+        zmax=1,
+        text=np.round(corr_matrix.values, 2),
+        texttemplate='%{text}',
+        textfont={"size": 10},
+        customdata=np.dstack([result.pvalues.values, result.counts.values]),
+        hovertemplate='%{y} × %{x}<br>r = %{z:.3f}<br>p = %{customdata[0]:.2e}<br>n = %{customdata[1]:,}<extra></extra>'
+    ))
+    fig.update_layout(title=f'{result.method.title()} Correlation Matrix', height=600)
+    return fig, None
+
+
+def age_wbc_scatter(df):
+    plot_df, reduction = reduce_points(df, ['Age', 'WBC'], color='Diagnosis')
+    if len(plot_df) == 0:
+        return None, None
+    fig = px.scatter(plot_df, x='Age', y='WBC',
+                   color='Diagnosis',
+                   size=COUNT_COLUMN if reduction.strategy == 'binned' else None,
+                   title='Age vs WBC by Diagnosis Type',
+                   hover_data=['Diagnosis'])
+    fig.update_layout(height=500)
+    return fig, describe_reduction(reduction)
+
+
+def pairplot(columns, summaries, histograms):
+    return (pairplot_figure(columns, summaries, histograms),
+            f"Each panel is a {PAIR_BINS} × {PAIR_BINS} density grid over rows where both columns are present")
+
+
+def wbc_box(df):
+    df_clean = df.dropna(subset=['Diagnosis', 'WBC'])
+    fig = px.box(df_clean, x='Diagnosis', y='WBC',
+               title='WBC Levels Across Cancer Types',
+               color='Diagnosis',
+               points='outliers')
+    fig.update_layout(xaxis_tickangle=-45, showlegend=False)
+    return fig, None
+
+
+def hemoglobin_by_gender(df):
+    # Violins need rows, so large data is sampled (never binned)
+    df_clean, reduction = reduce_points(df, ['Hemoglobin'], color='Gender',
+                                        density_threshold=float('inf'))
+    fig = px.violin(df_clean, x='Gender', y='Hemoglobin',
+                  title='Hemoglobin Comparison by Gender',
+                  color='Gender',
+                  box=True,
+                  points='all' if reduction.strategy == 'raw' else 'outliers')
+    return fig, describe_reduction(reduction)
+
+
+def outcome_sunburst(df):
+    df_clean = df.dropna(subset=['Treatment_Outcome', 'Diagnosis'])
+    fig = px.sunburst(df_clean, path=['Treatment_Outcome', 'Diagnosis'],
+                    title='Treatment Outcomes by Diagnosis')
+    return fig, None
+
+
+def risk_treemap(df):
+    df_clean = df.dropna(subset=['Risk_Category', 'Diagnosis'])
+    fig = px.treemap(df_clean, path=['Risk_Category', 'Diagnosis'],
+                   title='Patient Distribution by Risk & Diagnosis')
+    return fig, None
+
+
+def scatter_3d(df):
+    df_clean, reduction = reduce_points(df, ['Age', 'WBC', 'Hemoglobin'], color='Diagnosis')
+    fig = px.scatter_3d(df_clean, x='Age', y='WBC', z='Hemoglobin',
+                      color='Diagnosis',
+                      size=COUNT_COLUMN if reduction.strategy == 'binned' else None,
+                      title='3D View: Age, WBC & Hemoglobin',
+                      height=700)
+    return fig, describe_reduction(reduction)
+
+
+def bubble_chart(df):
+    # Binned cells carry the mean Platelets of their patients
+    df_clean, reduction = reduce_points(df, ['Age', 'WBC'], color='Diagnosis', size='Platelets')
+    fig = px.scatter(df_clean, x='Age', y='WBC',
+                   size='Platelets',
+                   color='Diagnosis',
+                   hover_data=[COUNT_COLUMN] if reduction.strategy == 'binned' else None,
+                   title='Bubble Chart: Age vs WBC (bubble = Platelets)',
+                   size_max=50,
+                   height=600)
+    return fig, describe_reduction(reduction)
+
+
+def parallel_coordinates(df, columns):
+    # Reproducible sample of 500 lines, stratified by diagnosis
+    df_plot, reduction = reduce_points(df, columns, color='Diagnosis',
+                                       raw_limit=500, density_threshold=float('inf'))
+
+    fig = px.parallel_coordinates(df_plot,
+                                dimensions=columns,
+                                color='Age',
+                                title='Parallel Coordinates: Clinical Parameters',
+                                color_continuous_scale=px.colors.sequential.Viridis)
+    return fig, describe_reduction(reduction)
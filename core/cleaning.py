@@ -0,0 +1,221 @@
+"""
+Cleaning engine for the patient frame.
+
+Implements the documented 5-step pipeline: duplicates, missing values, text
+standardization, IQR outlier flagging and dtype optimization. Statistics for
+every column are computed in one batch, text is standardized on category
+labels rather than rows, and duplicates are found by row hashing, so the frame
+is walked a fixed number of times regardless of its width.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from core.dtypes import optimize_dtypes, text_columns
+from core.instrumentation import timed
+
+DEFAULT_CLEANING_OPTIONS = {
+    'remove_duplicates': True,
+    'fill_missing': True,
+    'standardize_text': True,
+    'flag_outliers': True,
+    'iqr_multiplier': 1.5,
+}
+
+OUTLIER_COLUMN = 'Outlier_Flag'
+
+
+def options_key(options):
+    """Hashable form of a cleaning options dict."""
+    return tuple(sorted(options.items()))
+
+
+def find_duplicates(df):
+    """Boolean mask of duplicate rows (keeping the first), found by row hashing."""
+    if len(df) == 0:
+        return np.zeros(0, dtype=bool)
+
+    hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    candidates = pd.Series(hashes).duplicated(keep=False).to_numpy()
+    mask = np.zeros(len(df), dtype=bool)
+    if not candidates.any():
+        return mask
+
+    # Confirm hash matches on the candidate rows only, so collisions never drop real rows
+    positions = np.flatnonzero(candidates)
+    mask[positions] = df.iloc[positions].duplicated(keep='first').to_numpy()
+    return mask
+
+
+def column_modes(df, cols):
+    """Most frequent value of each text column, None when a column is empty."""
+    modes = {}
+    for col in cols:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes = series.cat.codes.to_numpy()
+            counts = np.bincount(codes[codes >= 0], minlength=len(series.cat.categories))
+            modes[col] = series.cat.categories[counts.argmax()] if counts.any() else None
+        else:
+            counts = series.value_counts(dropna=True)
+            modes[col] = counts.index[0] if len(counts) else None
+    return modes
+
+
+def standardize_labels(labels):
+    """Strip and collapse whitespace, then title-case labels that are not all-caps codes (AML, BCR-ABL)."""
+    stripped = labels.str.strip().str.replace(r'\s+', ' ', regex=True)
+    is_code = np.asarray(stripped.str.isupper(), dtype=object) == True  # noqa: E712 (NaN -> False)
+    return stripped.where(is_code, stripped.str.title())
+
+
+def standardize_text(df, cols):
+    """Standardize text columns. Categoricals are rewritten through their labels, not row by row."""
+    changed = {}
+    for col in cols:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            categories = series.cat.categories
+            categories = categories.astype(str)
+            standardized = standardize_labels(categories)
+            if standardized.equals(categories):
+                continue
+
+            # Labels that collapse to the same text (e.g. 'male ' and 'Male') share one code
+            uniques, inverse = np.unique(standardized.to_numpy(dtype=object), return_inverse=True)
+            codes = series.cat.codes.to_numpy()
+            new_codes = np.where(codes >= 0, inverse[codes], -1)
+            df[col] = pd.Categorical.from_codes(new_codes, categories=uniques)
+            changed[col] = int((standardized != categories).sum())
+        else:
+            standardized = standardize_labels(series)
+            n_changed = int((standardized != series)[series.notna()].sum())
+            if n_changed:
+                df[col] = standardized
+                changed[col] = n_changed
+    return changed
+
+
+def flag_outliers(df, cols, multiplier=1.5):
+    """IQR bounds for all numeric columns from one quantile call. Returns (row mask, per-column summary)."""
+    cols = [col for col in cols if df[col].notna().any()]
+    if not cols or len(df) == 0:
+        return np.zeros(len(df), dtype=bool), {}
+
+    quartiles = df[cols].quantile([0.25, 0.75])
+    q1 = quartiles.loc[0.25].to_numpy(dtype=float)
+    q3 = quartiles.loc[0.75].to_numpy(dtype=float)
+    iqr = q3 - q1
+    lower = q1 - multiplier * iqr
+    upper = q3 + multiplier * iqr
+
+    values = df[cols].to_numpy(dtype=float)
+    outside = (values < lower) | (values > upper)
+
+    summary = {
+        col: {'lower': float(lower[i]), 'upper': float(upper[i]), 'outliers': int(outside[:, i].sum())}
+        for i, col in enumerate(cols)
+    }
+    return outside.any(axis=1), summary
+
+
+@timed(kind='data')
+def clean_frame(df, options=DEFAULT_CLEANING_OPTIONS):
+    """Clean a frame. Returns (cleaned_df, report)."""
+    timings = {}
+    started = time.perf_counter()
+    report = {'rows_before': len(df), 'options': dict(options)}
+
+    # Shallow copy: with copy-on-write the caller's (shared) frame is never modified
+    df = df.copy(deep=False)
+
+    # Remove duplicates
+    stage = time.perf_counter()
+    duplicates_removed = 0
+    if options.get('remove_duplicates', True):
+        duplicate_mask = find_duplicates(df)
+        duplicates_removed = int(duplicate_mask.sum())
+        if duplicates_removed:
+            df = df.loc[~duplicate_mask]
+    report['duplicates_removed'] = duplicates_removed
+    timings['duplicates'] = time.perf_counter() - stage
+
+    # Handle missing values
+    fills = {}
+    if options.get('fill_missing', True):
+        stage = time.perf_counter()
+        missing_counts = df.isna().sum()
+        missing_cols = missing_counts[missing_counts > 0].index
+
+        numeric_cols = [col for col in df.select_dtypes(include=[np.number]).columns if col in missing_cols]
+        text_cols = [col for col in text_columns(df) if col in missing_cols]
+
+        # One batched pass for all medians, one bincount per text column for modes
+        medians = df[numeric_cols].median() if numeric_cols else pd.Series(dtype=float)
+        modes = column_modes(df, text_cols)
+        timings['statistics'] = time.perf_counter() - stage
+
+        stage = time.perf_counter()
+        fill_values = {}
+        for col in numeric_cols:
+            if pd.notna(medians[col]):
+                fill_values[col] = medians[col]
+        for col in text_cols:
+            fill_value = modes[col] if modes[col] is not None else 'Unknown'
+            if isinstance(df[col].dtype, pd.CategoricalDtype) and fill_value not in df[col].cat.categories:
+                df[col] = df[col].cat.add_categories([fill_value])
+            fill_values[col] = fill_value
+
+        if fill_values:
+            df = df.fillna(value=fill_values)
+
+        for col in missing_cols:
+            fill_value = fill_values.get(col)
+            if isinstance(fill_value, np.generic):
+                # Plain Python values keep the report JSON-serializable
+                fill_value = fill_value.item()
+            fills[col] = {
+                'missing': int(missing_counts[col]),
+                'filled': int(missing_counts[col]) if col in fill_values else 0,
+                'fill_value': fill_value,
+                'method': 'median' if col in numeric_cols else 'mode' if col in text_cols else 'none',
+            }
+        timings['fill'] = time.perf_counter() - stage
+
+    report['missing_handled'] = options.get('fill_missing', True)
+    report['fills'] = fills
+
+    # Standardize text
+    text_changes = {}
+    if options.get('standardize_text', True):
+        stage = time.perf_counter()
+        text_changes = standardize_text(df, text_columns(df))
+        timings['text'] = time.perf_counter() - stage
+    report['text_standardized'] = text_changes
+
+    # Outlier detection (flagged, not removed)
+    outlier_summary = {}
+    if options.get('flag_outliers', True):
+        stage = time.perf_counter()
+        numeric_cols = [col for col in df.select_dtypes(include=[np.number]).columns]
+        outlier_mask, outlier_summary = flag_outliers(df, numeric_cols, options.get('iqr_multiplier', 1.5))
+        df[OUTLIER_COLUMN] = outlier_mask
+        report['outlier_rows'] = int(outlier_mask.sum())
+        timings['outliers'] = time.perf_counter() - stage
+    report['outliers'] = outlier_summary
+
+    # Filling can widen dtypes again (e.g. median of an integer column)
+    stage = time.perf_counter()
+    df, dtype_report = optimize_dtypes(df)
+    df.attrs['dtype_report'] = dtype_report
+    report['dtype_optimization'] = dtype_report
+    timings['dtypes'] = time.perf_counter() - stage
+
+    report['rows_after'] = len(df)
+    report['rows_dropped'] = report['rows_before'] - len(df)
+    timings['total'] = time.perf_counter() - started
+    report['timings'] = timings
+    df.attrs['cleaning_report'] = report
+    return df, report
@@ -0,0 +1,129 @@
+"""
+Correlation matrices with pairwise-complete counts and p-values.
+
+Pearson comes straight from the mergeable co-moments of the selection.
+Spearman and Kendall share one RankIndex: every numeric column is sorted once,
+and the ranks of any pair over the rows where both are present are then read
+off those sort orders in linear time, so missing values never force a re-sort.
+All-NaN columns are left out.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from core.instrumentation import timed
+from core.statistics import tied_ranks
+
+METHODS = ('pearson', 'spearman', 'kendall')
+
+CorrelationResult = namedtuple('CorrelationResult', ['method', 'corr', 'pvalues', 'counts'])
+
+
+def correlation_columns(df):
+    """Numeric columns with at least two values."""
+    return [col for col in df.select_dtypes(include=[np.number]).columns
+            if not pd.api.types.is_bool_dtype(df[col]) and df[col].notna().sum() >= 2]
+
+
+class RankIndex:
+    """Sort order of every numeric column of a frame, shared by the rank-based methods."""
+
+    @timed('RankIndex', kind='test')
+    def __init__(self, df, columns=None):
+        self.columns = list(columns) if columns is not None else correlation_columns(df)
+        self.values = df[self.columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        self.valid = ~np.isnan(self.values)
+        position_dtype = np.int32 if len(df) < 2 ** 31 else np.int64
+        # NaN sorts last, so the first n_valid positions are each column's sorted values
+        self.orders = [np.argsort(self.values[:, j], kind='stable')[:int(self.valid[:, j].sum())].astype(position_dtype)
+                       for j in range(len(self.columns))]
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes + self.valid.nbytes + sum(order.nbytes for order in self.orders)
+
+    def ranks(self, j, rows=None):
+        """Ranks of column j (NaN where missing), optionally only among the rows where `rows` is True."""
+        order = self.orders[j]
+        if rows is not None:
+            order = order[rows[order]]
+        ranks = np.full(len(self.values), np.nan)
+        ranks[order] = tied_ranks(self.values[order, j])[0]
+        return ranks
+
+    def pair_ranks(self, i, j):
+        """Ranks of columns i and j over the rows where both are present, aligned row by row."""
+        both = self.valid[:, i] & self.valid[:, j]
+        return self.ranks(i, both)[both], self.ranks(j, both)[both]
+
+
+def correlation_pvalues(corr, counts):
+    """Two-sided p-values of correlation coefficients from the t distribution with n - 2 dof."""
+    from scipy import stats
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dof = counts - 2
+        t_stat = corr * np.sqrt(dof / np.clip(1 - corr ** 2, 0, None))
+        p_value = 2 * stats.t.sf(np.abs(t_stat), dof)
+    p_value = np.where(np.abs(corr) >= 1, 0.0, p_value)
+    return np.where((counts > 2) & ~np.isnan(corr), p_value, np.nan)
+
+
+def _frame(matrix, columns):
+    return pd.DataFrame(matrix, index=columns, columns=columns)
+
+
+@timed(kind='test')
+def pearson_matrix(comoments, columns=None):
+    """Pearson matrix, counts and p-values of the given columns from a CoMoments."""
+    columns = list(columns) if columns is not None else comoments.columns
+    index = [comoments.columns.index(col) for col in columns]
+    corr = comoments.correlation().to_numpy()[np.ix_(index, index)]
+    counts = comoments.count[np.ix_(index, index)]
+    return CorrelationResult('pearson', _frame(corr, columns), _frame(correlation_pvalues(corr, counts), columns),
+                             _frame(counts.astype(np.int64), columns))
+
+
+@timed(kind='test')
+def rank_matrix(rank_index, method):
+    """Spearman or Kendall (tau-b) matrix, counts and p-values from a RankIndex."""
+    from scipy import stats
+    k = len(rank_index.columns)
+    corr = np.eye(k)
+    pvalues = np.zeros((k, k))
+    counts = rank_index.valid.T.astype(np.int64) @ rank_index.valid.astype(np.int64)
+
+    for i in range(k):
+        for j in range(i + 1, k):
+            if counts[i, j] < 2:
+                corr[i, j] = corr[j, i] = pvalues[i, j] = pvalues[j, i] = np.nan
+                continue
+            ranks_i, ranks_j = rank_index.pair_ranks(i, j)
+            if method == 'spearman':
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    coefficient = np.corrcoef(ranks_i, ranks_j)[0, 1]
+                p_value = correlation_pvalues(np.array(coefficient), np.array(counts[i, j]))
+            else:
+                coefficient, p_value = stats.kendalltau(ranks_i, ranks_j)
+            corr[i, j] = corr[j, i] = coefficient
+            pvalues[i, j] = pvalues[j, i] = p_value
+
+    for i in range(k):
+        if counts[i, i] < 2:
+            corr[i, i] = pvalues[i, i] = np.nan
+    columns = rank_index.columns
+    return CorrelationResult(method, _frame(corr, columns), _frame(pvalues, columns), _frame(counts, columns))
+
+
+def correlation_pairs(result):
+    """One row per column pair, strongest correlation first."""
+    columns = list(result.corr.columns)
+    rows = []
+    for i in range(len(columns)):
+        for j in range(i + 1, len(columns)):
+            rows.append({'Variable 1': columns[i], 'Variable 2': columns[j],
+                         'Correlation': result.corr.iat[i, j], 'P-Value': result.pvalues.iat[i, j],
+                         'N': int(result.counts.iat[i, j])})
+    pairs = pd.DataFrame(rows, columns=['Variable 1', 'Variable 2', 'Correlation', 'P-Value', 'N'])
+    return pairs.reindex(pairs['Correlation'].abs().sort_values(ascending=False, na_position='last').index)
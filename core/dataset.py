@@ -0,0 +1,94 @@
+"""
+The registry extract: where it lives, how its columns map, and how it is parsed.
+
+Shared by the dashboard and the headless tools so both produce the same frame
+and the same dataset version (the snapshot fingerprint) from the same file.
+"""
+
+import os
+
+import numpy as np
+
+from core.dtypes import CATEGORICAL_COLUMNS, optimize_dtypes
+from core.ingestion import read_csv_chunked
+from core.instrumentation import timed
+from core.missingness import DEFAULT_MISSING_RATES, simulate_missing
+from core.snapshot import read_snapshot, source_fingerprint, write_snapshot
+
+DATA_FILE = "Blood Cancer Diseases dataset  - Sheet1.csv"
+FALLBACK_DATA_FILE = r"c:\Users\User\Desktop\assignment\Assignment\Blood Cancer Diseases dataset  - Sheet1.csv"
+
+# Map actual column names to simplified names for consistent code usage
+COLUMN_MAPPING = {
+    'Age': 'Age',  # Already correct
+    'Gender': 'Gender',  # Already correct
+    'Total WBC count(/cumm)': 'WBC',
+    'Cancer_Type(AML, ALL, CLL)': 'Diagnosis',
+    'Treatment_Type(Chemotherapy, Radiation)': 'Treatment',
+    'Platelet Count( (/cumm)': 'Platelets',
+    'Treatment_Outcome': 'Treatment_Outcome',
+    'Diagnosis_Result': 'Diagnosis_Result',
+    'Genetic_Data(BCR-ABL, FLT3)': 'Genetic_Data',
+    'Side_Effects': 'Side_Effects'
+}
+
+MISSING_VALUE_SEED = 42
+MISSING_RATES = DEFAULT_MISSING_RATES
+SIMULATE_MISSING = os.environ.get("BLOOD_CANCER_SIMULATE_MISSING", "1") != "0"
+
+NUMERIC_COLUMNS = ['WBC', 'RBC', 'Hemoglobin', 'Platelets', 'Age']
+
+# Variables compared across groups by the ANOVA and t-test blocks
+TEST_VARIABLES = ['Age', 'WBC', 'RBC', 'Hemoglobin', 'Platelets']
+
+
+def find_data_file(file_path=None):
+    """The first of the given path, DATA_FILE and FALLBACK_DATA_FILE that exists, or None."""
+    for candidate in (file_path, DATA_FILE, FALLBACK_DATA_FILE):
+        if candidate and os.path.exists(candidate):
+            return candidate
+    return None
+
+
+@timed(kind='data')
+def parse_dataset(file_path, progress=None):
+    """Stream the raw CSV in chunks and introduce realistic missing values."""
+    # Rename, numeric coercion, dtype narrowing and categoricals happen per chunk
+    df = read_csv_chunked(file_path, COLUMN_MAPPING, NUMERIC_COLUMNS, CATEGORICAL_COLUMNS,
+                          progress=progress)
+
+    # Add missing columns if needed (for code compatibility)
+    if 'RBC' not in df.columns:
+        df['RBC'] = np.nan
+    if 'Hemoglobin' not in df.columns:
+        df['Hemoglobin'] = np.nan
+
+    # Introduce realistic missing values (disable for production extracts)
+    if SIMULATE_MISSING:
+        df = simulate_missing(df, MISSING_RATES, seed=MISSING_VALUE_SEED)
+
+    # Categoricals for text, narrowest lossless types for numbers
+    df, dtype_report = optimize_dtypes(df)
+    df.attrs['dtype_report'] = dtype_report
+
+    return df
+
+
+def dataset_version(file_path):
+    """Snapshot key covering the file itself plus everything that shapes the parsed frame."""
+    return source_fingerprint(file_path,
+                              column_mapping=COLUMN_MAPPING,
+                              missing_seed=MISSING_VALUE_SEED,
+                              missing_rates=MISSING_RATES if SIMULATE_MISSING else None)
+
+
+@timed(kind='data')
+def read_dataset(file_path, version=None, progress=None):
+    """Parsed frame of a file, from the on-disk snapshot when fresh, tagged with its dataset version."""
+    version = version or dataset_version(file_path)
+    df = read_snapshot(version)
+    if df is None:
+        df = parse_dataset(file_path, progress=progress)
+        write_snapshot(version, df)
+    df.attrs['dataset_version'] = version
+    return df
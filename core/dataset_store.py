@@ -0,0 +1,122 @@
+"""
+Process-wide, read-only dataset store.
+
+Every session used to keep its own deep copies of the dataset. The store keeps
+one frame per key for the whole process and hands sessions shallow
+copy-on-write views, so memory no longer grows with the number of users.
+"""
+
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+if int(pd.__version__.split('.')[0]) < 3:
+    # pandas 3 always uses copy-on-write, older versions need it switched on
+    pd.set_option('mode.copy_on_write', True)
+
+
+def _column_buffer(series):
+    """The array backing a column, used to detect shared memory."""
+    values = series.array
+    if isinstance(values, pd.Categorical):
+        return values.codes
+    try:
+        return np.asarray(values)
+    except (TypeError, ValueError):
+        return None
+
+
+def _nbytes(obj):
+    """Memory of a stored object: deep usage for frames, nbytes for derived structures."""
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True).sum())
+    return int(getattr(obj, 'nbytes', 0))
+
+
+def private_bytes(df, base):
+    """Bytes held by df that are not shared with base."""
+    total = 0
+    for col in df.columns:
+        col_bytes = int(df[col].memory_usage(deep=True, index=False))
+        if base is not None and col in base.columns:
+            own = _column_buffer(df[col])
+            shared = _column_buffer(base[col])
+            if own is not None and shared is not None and np.shares_memory(own, shared):
+                continue
+        total += col_bytes
+    return total
+
+
+class DatasetStore:
+    """Thread-safe registry of shared frames (and objects derived from them) keyed by (kind, dataset version, ...)."""
+
+    def __init__(self):
+        self._frames = {}
+        self._lock = threading.Lock()
+        self._building = {}
+
+    def get(self, key):
+        return self._frames.get(key)
+
+    def get_or_build(self, key, builder):
+        """Return the frame for key, building it once even under concurrent requests."""
+        df = self._frames.get(key)
+        if df is not None:
+            return df
+
+        with self._lock:
+            key_lock = self._building.setdefault(key, threading.Lock())
+
+        with key_lock:
+            df = self._frames.get(key)
+            if df is None:
+                df = builder()
+                if df is not None:
+                    self._frames[key] = df
+
+        with self._lock:
+            self._building.pop(key, None)
+        return df
+
+    def view(self, key):
+        """Shallow copy-on-write view of a stored frame for one session."""
+        df = self._frames.get(key)
+        if df is None:
+            return None
+        return df.copy(deep=False)
+
+    def evict(self, predicate):
+        """Drop every entry whose key matches predicate."""
+        with self._lock:
+            for key in [k for k in self._frames if predicate(k)]:
+                del self._frames[key]
+
+    def keys(self):
+        return list(self._frames)
+
+    def memory_bytes(self):
+        """Deep memory held by all stored frames and derived objects."""
+        return sum(_nbytes(obj) for obj in list(self._frames.values()))
+
+
+# One store per process, shared by every Streamlit session
+STORE = DatasetStore()
+
+
+def process_rss_bytes():
+    """Current resident set size of this process, or None when it cannot be read."""
+    try:
+        with open('/proc/self/statm') as handle:
+            resident_pages = int(handle.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+
+    try:
+        import resource
+        # No /proc (macOS): fall back to the peak, which is reported in bytes there
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    except ImportError:
+        return None
@@ -0,0 +1,134 @@
+"""
+Server-side distribution summaries for histogram, box and violin charts.
+
+summarize() reduces a column to histogram counts, box-plot quantiles and a
+Gaussian KDE curve with NumPy. The figure builders below draw from those
+summaries, so the browser receives a few hundred numbers per chart no matter
+how many patients are behind them.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+# Resolution of the grid the KDE is evaluated on
+KDE_GRID_POINTS = 512
+
+DistributionSummary = namedtuple('DistributionSummary', [
+    'column', 'count', 'mean', 'std', 'edges', 'counts', 'quantiles', 'kde_x', 'kde_y',
+])
+
+
+def box_quantiles(values):
+    """Quartiles and Tukey fences clipped to the data, as plotly's go.Box expects them."""
+    q1, median, q3 = np.quantile(values, [0.25, 0.5, 0.75])
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    return {
+        'min': float(values.min()),
+        'q1': float(q1),
+        'median': float(median),
+        'q3': float(q3),
+        'max': float(values.max()),
+        'lowerfence': float(inside.min()),
+        'upperfence': float(inside.max()),
+    }
+
+
+def binned_kde(values, grid_points=KDE_GRID_POINTS):
+    """Gaussian KDE (Scott's bandwidth) from a fine histogram convolved with the kernel."""
+    n = len(values)
+    std = values.std(ddof=1) if n > 1 else 0.0
+    low, high = values.min(), values.max()
+    if n < 2 or std == 0 or high == low:
+        return np.array([low, high], dtype=float), np.array([1.0, 1.0])
+
+    bandwidth = 1.06 * std * n ** (-1 / 5)
+    # Pad the grid so the tails are not cut off
+    low, high = low - 3 * bandwidth, high + 3 * bandwidth
+    counts, edges = np.histogram(values, bins=grid_points, range=(low, high))
+    step = edges[1] - edges[0]
+    centers = edges[:-1] + step / 2
+
+    half_width = int(np.ceil(4 * bandwidth / step))
+    offsets = np.arange(-half_width, half_width + 1) * step
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2) / (bandwidth * np.sqrt(2 * np.pi))
+    density = np.convolve(counts, kernel, mode='same') / n
+    if len(kernel) > len(counts):
+        # Kernel wider than the grid: np.convolve returns the longer length, trim to the grid
+        start = (len(density) - len(counts)) // 2
+        density = density[start:start + len(counts)]
+    return centers, density
+
+
+def summarize(series, bins=40):
+    """Histogram, quantiles and KDE of a numeric column, or None if it has no values."""
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    values = values[~np.isnan(values)]
+    if len(values) == 0:
+        return None
+
+    counts, edges = np.histogram(values, bins=bins)
+    kde_x, kde_y = binned_kde(values)
+    return DistributionSummary(
+        column=series.name,
+        count=len(values),
+        mean=float(values.mean()),
+        std=float(values.std(ddof=1)) if len(values) > 1 else 0.0,
+        edges=edges,
+        counts=counts,
+        quantiles=box_quantiles(values),
+        kde_x=kde_x,
+        kde_y=kde_y,
+    )
+
+
+def _box_trace(summary, color):
+    """Horizontal box from precomputed quantiles."""
+    q = summary.quantiles
+    return go.Box(y=[summary.column], orientation='h',
+                  q1=[q['q1']], median=[q['median']], q3=[q['q3']],
+                  lowerfence=[q['lowerfence']], upperfence=[q['upperfence']],
+                  mean=[summary.mean], name=summary.column, marker_color=color, showlegend=False)
+
+
+def histogram_figure(summary, title, color, marginal='box'):
+    """Pre-binned histogram with a box or KDE (violin-style) marginal on top."""
+    fig = make_subplots(rows=2, cols=1, shared_xaxes=True, row_heights=[0.2, 0.8], vertical_spacing=0.02)
+
+    if marginal == 'box':
+        fig.add_trace(_box_trace(summary, color), row=1, col=1)
+    else:
+        fig.add_trace(go.Scatter(x=summary.kde_x, y=summary.kde_y, mode='lines', fill='tozeroy',
+                                 line=dict(color=color), name='KDE', showlegend=False), row=1, col=1)
+
+    centers = (summary.edges[:-1] + summary.edges[1:]) / 2
+    fig.add_trace(go.Bar(x=centers, y=summary.counts, width=np.diff(summary.edges),
+                         marker_color=color, name='count', showlegend=False), row=2, col=1)
+
+    fig.update_yaxes(showticklabels=False, row=1, col=1)
+    fig.update_yaxes(title_text='count', row=2, col=1)
+    fig.update_xaxes(title_text=summary.column, row=2, col=1)
+    fig.update_layout(title=title, bargap=0, showlegend=False)
+    return fig
+
+
+def violin_figure(summary, title, color):
+    """Violin drawn from the server-side KDE with a precomputed box inside."""
+    half = summary.kde_y / summary.kde_y.max() * 0.4
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=np.concatenate([half, -half[::-1]]),
+        y=np.concatenate([summary.kde_x, summary.kde_x[::-1]]),
+        fill='toself', mode='lines', line=dict(color=color), name=summary.column, hoverinfo='skip',
+    ))
+    q = summary.quantiles
+    fig.add_trace(go.Box(x=[0], q1=[q['q1']], median=[q['median']], q3=[q['q3']],
+                         lowerfence=[q['lowerfence']], upperfence=[q['upperfence']],
+                         width=0.1, marker_color='black', fillcolor='white', name='box'))
+    fig.update_layout(title=title, showlegend=False,
+                      xaxis=dict(showticklabels=False, zeroline=False, range=[-0.5, 0.5]),
+                      yaxis_title=summary.column)
+    return fig
@@ -0,0 +1,69 @@
+"""
+Schema-driven dtype optimization for the patient frame.
+
+Text columns with a small vocabulary become categoricals and numeric columns
+are narrowed to the smallest dtype that holds them without loss.
+"""
+
+import pandas as pd
+
+from core.ingestion import narrow_numeric
+
+# Known low-cardinality text columns in the patient dataset
+CATEGORICAL_COLUMNS = [
+    'Gender', 'Diagnosis', 'Treatment', 'Treatment_Outcome', 'Genetic_Data',
+    'Side_Effects', 'Diagnosis_Result', 'Comments',
+]
+
+# Other text columns become categorical when unique values are at most this share of rows
+CATEGORY_RATIO = 0.5
+
+
+def text_columns(df):
+    """Names of the text-like columns, whether stored as strings or categoricals."""
+    return [col for col in df.columns
+            if pd.api.types.is_object_dtype(df[col])
+            or pd.api.types.is_string_dtype(df[col])
+            or isinstance(df[col].dtype, pd.CategoricalDtype)]
+
+
+def memory_footprint(df):
+    """Deep memory usage of a frame in bytes."""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def optimize_dtypes(df, categorical_cols=CATEGORICAL_COLUMNS, numeric_cols=None):
+    """Convert columns to compact dtypes in place. Returns (df, report)."""
+    if numeric_cols is None:
+        # core.dataset imports this module, so its column list is looked up at call time
+        from core.dataset import NUMERIC_COLUMNS as numeric_cols
+
+    memory_before = memory_footprint(df)
+    changes = {}
+    text_cols = set(text_columns(df))
+
+    for col in df.columns:
+        series = df[col]
+        before = str(series.dtype)
+
+        if col in numeric_cols or pd.api.types.is_numeric_dtype(series):
+            if pd.api.types.is_bool_dtype(series):
+                continue
+            df[col] = narrow_numeric(series)
+        elif col in text_cols and not isinstance(series.dtype, pd.CategoricalDtype):
+            n_unique = series.nunique(dropna=True)
+            if col in categorical_cols or n_unique <= max(len(series) * CATEGORY_RATIO, 1):
+                df[col] = series.astype('category')
+
+        after = str(df[col].dtype)
+        if after != before:
+            changes[col] = (before, after)
+
+    memory_after = memory_footprint(df)
+    report = {
+        'memory_before': memory_before,
+        'memory_after': memory_after,
+        'reduction_pct': (1 - memory_after / memory_before) * 100 if memory_before else 0.0,
+        'columns': changes,
+    }
+    return df, report
@@ -0,0 +1,236 @@
+"""
+On-demand, chunked export of a selection.
+
+A format is serialized only when a download is requested. Text formats (CSV,
+JSON, NDJSON) are produced chunk by chunk from generators and streamed through
+an optional gzip or zstd compressor, Excel goes through a write-only openpyxl
+workbook, and Parquet is written one row group per chunk, so at most one chunk
+of text is held besides the output. Finished files are kept in a byte-bounded
+LRU keyed by (dataset version, filter, format, compression) and shared by every
+session in the process.
+"""
+
+import gzip
+import os
+import threading
+from collections import OrderedDict, namedtuple
+from io import BytesIO
+
+try:
+    import zstandard
+except ImportError:  # zstandard is optional, zstd compression is hidden without it
+    zstandard = None
+
+from core.instrumentation import timed
+
+EXPORT_CHUNK_ROWS = 50_000
+
+DEFAULT_MAX_MB = int(os.environ.get("BLOOD_CANCER_EXPORT_CACHE_MB", 256))
+
+# Rows per worksheet, including the header row
+EXCEL_MAX_ROWS = 1_048_576
+
+ExportFormat = namedtuple('ExportFormat', ['label', 'extension', 'mime', 'compressible'])
+
+FORMATS = {
+    'csv': ExportFormat('CSV', 'csv', 'text/csv', True),
+    'xlsx': ExportFormat('Excel', 'xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', False),
+    'json': ExportFormat('JSON', 'json', 'application/json', True),
+    'ndjson': ExportFormat('NDJSON', 'ndjson', 'application/x-ndjson', True),
+    'parquet': ExportFormat('Parquet', 'parquet', 'application/vnd.apache.parquet', True),
+}
+
+# Compression -> (file suffix, mime); Parquet applies it per column chunk inside the file instead
+CODECS = {
+    'none': ('', None),
+    'gzip': ('.gz', 'application/gzip'),
+    'zstd': ('.zst', 'application/zstd'),
+}
+
+
+def parquet_available():
+    """Return True when pyarrow's Parquet writer is installed."""
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def available_formats():
+    """Formats that can be written with the installed packages."""
+    return [fmt for fmt in FORMATS if fmt != 'parquet' or parquet_available()]
+
+
+def available_codecs(fmt):
+    """Compression choices for a format."""
+    if not FORMATS[fmt].compressible:
+        return ['none']
+    if fmt == 'parquet':
+        # pyarrow ships both codecs itself
+        return list(CODECS)
+    return [codec for codec in CODECS if codec != 'zstd' or zstandard is not None]
+
+
+def export_file_name(base, fmt, codec='none'):
+    suffix = '' if fmt == 'parquet' else CODECS[codec][0]
+    return f"{base}.{FORMATS[fmt].extension}{suffix}"
+
+
+def export_mime(fmt, codec='none'):
+    if fmt == 'parquet' or codec == 'none':
+        return FORMATS[fmt].mime
+    return CODECS[codec][1]
+
+
+def _chunks(df, chunk_rows):
+    for start in range(0, len(df), chunk_rows):
+        yield start, df.iloc[start:start + chunk_rows]
+
+
+def iter_csv(df, chunk_rows=EXPORT_CHUNK_ROWS):
+    """CSV text of a frame, one chunk of rows at a time."""
+    if len(df) == 0:
+        yield df.to_csv(index=False)
+        return
+    for start, chunk in _chunks(df, chunk_rows):
+        yield chunk.to_csv(index=False, header=start == 0)
+
+
+def iter_ndjson(df, chunk_rows=EXPORT_CHUNK_ROWS):
+    """One JSON record per line, one chunk of rows at a time."""
+    for _, chunk in _chunks(df, chunk_rows):
+        text = chunk.to_json(orient='records', lines=True, date_format='iso')
+        yield text if text.endswith('\n') else text + '\n'
+
+
+def iter_json(df, chunk_rows=EXPORT_CHUNK_ROWS):
+    """A JSON array of records, one chunk of rows at a time."""
+    yield '['
+    for start, chunk in _chunks(df, chunk_rows):
+        body = chunk.to_json(orient='records', date_format='iso')[1:-1]
+        yield body if start == 0 else ',' + body
+    yield ']'
+
+
+TEXT_WRITERS = {'csv': iter_csv, 'json': iter_json, 'ndjson': iter_ndjson}
+
+
+def _open_codec(sink, codec):
+    if codec == 'gzip':
+        # mtime=0 keeps the output identical across builds
+        return gzip.GzipFile(fileobj=sink, mode='wb', mtime=0)
+    if codec == 'zstd':
+        if zstandard is None:
+            raise ValueError("zstd compression needs the zstandard package")
+        return zstandard.ZstdCompressor().stream_writer(sink, closefd=False)
+    return None
+
+
+def write_text(chunks, sink, codec='none'):
+    """Encode text chunks as UTF-8 into sink, through a streaming compressor if one is given."""
+    compressor = _open_codec(sink, codec)
+    target = compressor or sink
+    for chunk in chunks:
+        target.write(chunk.encode('utf-8'))
+    if compressor is not None:
+        compressor.close()
+
+
+def write_excel(df, sink, chunk_rows=EXPORT_CHUNK_ROWS, sheet_name='Data'):
+    """Write-only workbook, continued on further sheets past Excel's row limit."""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    header = [str(col) for col in df.columns]
+    sheet, sheet_rows, sheet_number = None, EXCEL_MAX_ROWS, 0
+    for _, chunk in _chunks(df, chunk_rows):
+        rows = chunk.astype(object).where(chunk.notna(), None).itertuples(index=False, name=None)
+        for row in rows:
+            if sheet_rows == EXCEL_MAX_ROWS:
+                sheet_number += 1
+                sheet = workbook.create_sheet(sheet_name if sheet_number == 1 else f"{sheet_name} {sheet_number}")
+                sheet.append(header)
+                sheet_rows = 1
+            sheet.append(row)
+            sheet_rows += 1
+    if sheet is None:
+        workbook.create_sheet(sheet_name).append(header)
+    workbook.save(sink)
+
+
+def write_parquet(df, sink, codec='none', chunk_rows=EXPORT_CHUNK_ROWS):
+    """Parquet file with one row group per chunk."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(sink, schema, compression=codec) as writer:
+        for _, chunk in _chunks(df, chunk_rows):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+        if len(df) == 0:
+            writer.write_table(schema.empty_table())
+
+
+@timed(kind='export')
+def export_bytes(df, fmt, codec='none', chunk_rows=EXPORT_CHUNK_ROWS):
+    """Serialize a frame to one export format."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}, expected one of {tuple(FORMATS)}")
+    if codec not in available_codecs(fmt):
+        raise ValueError(f"Compression {codec!r} is not available for {fmt}")
+
+    sink = BytesIO()
+    if fmt in TEXT_WRITERS:
+        write_text(TEXT_WRITERS[fmt](df, chunk_rows), sink, codec)
+    elif fmt == 'xlsx':
+        write_excel(df, sink, chunk_rows)
+    else:
+        write_parquet(df, sink, codec, chunk_rows)
+    return sink.getvalue()
+
+
+class ExportCache:
+    """Byte-bounded LRU of finished export files."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def nbytes(self):
+        return self._bytes
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get_or_build(self, key, builder):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        data = builder()
+        with self._lock:
+            if key not in self._entries and len(data) <= self.max_bytes:
+                self._entries[key] = data
+                self._bytes += len(data)
+                while self._bytes > self.max_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self._bytes -= len(evicted)
+        return data
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+# Shared by every session in the process
+EXPORTS = ExportCache()
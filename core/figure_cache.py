@@ -0,0 +1,143 @@
+"""
+Process-wide cache of serialized Plotly figures.
+
+Streamlit reruns the script on every interaction, so the same chart used to be
+rebuilt again and again. Figures are cached as JSON under a key of
+(chart, dataset version, filter, params) and shared by every session in the
+process. Memory use is bounded in bytes with LRU eviction; with a cache
+directory configured, entries are also written to disk and survive restarts.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+from core.instrumentation import span
+
+# Bump when figure builders change so persisted entries are not reused
+FIGURE_CACHE_VERSION = 1
+
+DEFAULT_MAX_MB = int(os.environ.get("BLOOD_CANCER_FIGURE_CACHE_MB", 64))
+
+# Empty disables persistence
+DEFAULT_CACHE_DIR = os.environ.get("BLOOD_CANCER_FIGURE_CACHE_DIR", "")
+
+
+class FigureCache:
+    """Byte-bounded LRU of (figure JSON, caption) entries with optional disk persistence."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_MB * 1024 * 1024, cache_dir=DEFAULT_CACHE_DIR or None):
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def nbytes(self):
+        return self._bytes
+
+    def stats(self):
+        requests = self.hits + self.disk_hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self._bytes,
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': (self.hits + self.disk_hits) / requests if requests else 0.0,
+        }
+
+    def _path(self, key):
+        digest = hashlib.sha256(repr((FIGURE_CACHE_VERSION, key)).encode()).hexdigest()[:32]
+        return os.path.join(self.cache_dir, f"{digest}.json")
+
+    def _read_disk(self, key):
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._path(key), encoding="utf-8") as handle:
+                document = json.load(handle)
+            return json.dumps(document['figure']) if document['figure'] is not None else None, document['caption']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _write_disk(self, key, entry):
+        if not self.cache_dir:
+            return
+        figure_json, caption = entry
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                handle.write(f'{{"caption": {json.dumps(caption)}, "figure": {figure_json or "null"}}}')
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            pass
+
+    def _store(self, key, entry):
+        size = len(entry[0] or '') + len(entry[1] or '')
+        with self._lock:
+            if key in self._entries:
+                return
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (entry, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def get_or_build(self, key, builder):
+        """
+        (figure, caption) for a key; builder returns (go.Figure or None, caption or None).
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                entry = self._entries[key][0]
+            else:
+                entry = None
+
+        if entry is None:
+            entry = self._read_disk(key)
+            if entry is not None:
+                with self._lock:
+                    self.disk_hits += 1
+                self._store(key, entry)
+
+        if entry is None:
+            with self._lock:
+                self.misses += 1
+            with span('figure_build', 'chart'):
+                figure, caption = builder()
+            with span('figure_serialize', 'chart'):
+                entry = (figure.to_json() if figure is not None else None, caption)
+            self._store(key, entry)
+            self._write_disk(key, entry)
+
+        # Deferred so the sidebar can report cache stats without loading plotly
+        import plotly.io as pio
+
+        figure_json, caption = entry
+        with span('figure_deserialize', 'chart'):
+            return (pio.from_json(figure_json) if figure_json is not None else None), caption
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+# Shared by every session in the process
+FIGURES = FigureCache()
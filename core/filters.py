@@ -0,0 +1,163 @@
+"""
+Cross-filter engine for cohort selection.
+
+Categorical columns get one packed bitmap (1 bit per row) per value and numeric
+columns get a sorted index, both built once per dataset version. A filter is
+then an OR of bitmaps within a column, a binary search for each range, and a
+bitwise AND across columns, with no fresh scan of the frame.
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from core.instrumentation import timed
+
+CATEGORICAL_FILTER_COLUMNS = ['Diagnosis', 'Gender', 'Treatment', 'Treatment_Outcome', 'Genetic_Data']
+RANGE_FILTER_COLUMNS = ['Age', 'WBC', 'Platelets']
+
+
+class FilterIndex:
+    """Per-value bitmaps and sorted range indexes over one frame."""
+
+    @timed('FilterIndex', kind='data')
+    def __init__(self, df, categorical_cols=CATEGORICAL_FILTER_COLUMNS, range_cols=RANGE_FILTER_COLUMNS):
+        self.n_rows = len(df)
+        self.bitmaps = {}
+        self.sorted_index = {}
+
+        for col in categorical_cols:
+            if col not in df.columns:
+                continue
+            series = df[col]
+            if not isinstance(series.dtype, pd.CategoricalDtype):
+                series = series.astype('category')
+            codes = series.cat.codes.to_numpy()
+            bitmaps = {}
+            for code, value in enumerate(series.cat.categories):
+                hits = codes == code
+                if hits.any():
+                    bitmaps[value] = np.packbits(hits)
+            self.bitmaps[col] = bitmaps
+
+        position_dtype = np.int32 if self.n_rows < 2 ** 31 else np.int64
+        for col in range_cols:
+            if col not in df.columns:
+                continue
+            values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            n_valid = int((~np.isnan(values)).sum())
+            if n_valid == 0:
+                continue
+            # NaN sorts last, so the first n_valid positions are the searchable range
+            order = np.argsort(values, kind='stable')[:n_valid]
+            self.sorted_index[col] = (values[order], order.astype(position_dtype))
+
+    @property
+    def nbytes(self):
+        total = sum(bits.nbytes for col in self.bitmaps.values() for bits in col.values())
+        total += sum(v.nbytes + o.nbytes for v, o in self.sorted_index.values())
+        return total
+
+    def values(self, col):
+        """Values of a categorical column that occur in the frame."""
+        return list(self.bitmaps.get(col, {}))
+
+    def bounds(self, col):
+        """(min, max) of a range column."""
+        sorted_values, _ = self.sorted_index[col]
+        return float(sorted_values[0]), float(sorted_values[-1])
+
+    def normalize(self, filters):
+        """Drop no-op predicates and return a hashable filter key (empty tuple when nothing is filtered)."""
+        key = []
+        for col, predicate in sorted(filters.items()):
+            if col in self.bitmaps:
+                selected = tuple(sorted(str(v) for v in predicate or ()))
+                if selected and set(selected) != set(str(v) for v in self.bitmaps[col]):
+                    key.append((col, selected))
+            elif col in self.sorted_index and predicate is not None:
+                low, high = predicate
+                min_value, max_value = self.bounds(col)
+                if low > min_value or high < max_value:
+                    key.append((col, (float(low), float(high))))
+        return tuple(key)
+
+    def select(self, filter_key):
+        """Packed bitmap of the rows matching a normalized filter key, or None for no filter."""
+        result = None
+        for col, predicate in filter_key:
+            if col in self.bitmaps:
+                bits = np.zeros((self.n_rows + 7) // 8, dtype=np.uint8)
+                by_label = {str(v): b for v, b in self.bitmaps[col].items()}
+                for value in predicate:
+                    if value in by_label:
+                        np.bitwise_or(bits, by_label[value], out=bits)
+            else:
+                low, high = predicate
+                sorted_values, order = self.sorted_index[col]
+                start = np.searchsorted(sorted_values, low, side='left')
+                stop = np.searchsorted(sorted_values, high, side='right')
+                hits = np.zeros(self.n_rows, dtype=bool)
+                hits[order[start:stop]] = True
+                bits = np.packbits(hits)
+
+            result = bits if result is None else np.bitwise_and(result, bits, out=result)
+        return result
+
+    @timed('filter_mask', kind='data')
+    def mask(self, filter_key):
+        """Boolean row mask for a normalized filter key."""
+        bits = self.select(filter_key)
+        if bits is None:
+            return np.ones(self.n_rows, dtype=bool)
+        return np.unpackbits(bits, count=self.n_rows).view(bool)
+
+
+def describe_filters(filter_key):
+    """Short human-readable summary of a filter key."""
+    parts = []
+    for col, predicate in filter_key:
+        if predicate and isinstance(predicate[0], str):
+            parts.append(f"{col} ∈ {{{', '.join(predicate)}}}")
+        else:
+            parts.append(f"{predicate[0]:g} ≤ {col} ≤ {predicate[1]:g}")
+    return '; '.join(parts)
+
+
+class SelectionCache:
+    """Small thread-safe LRU for objects derived from a filtered selection."""
+
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key, builder):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        value = builder()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    @property
+    def nbytes(self):
+        total = 0
+        for value in list(self._entries.values()):
+            if isinstance(value, pd.DataFrame):
+                total += int(value.memory_usage(deep=True).sum())
+            else:
+                total += int(getattr(value, 'nbytes', 0))
+        return total
+
+
+# Filtered frames and cubes, shared by sessions that pick the same cohort
+SELECTIONS = SelectionCache()
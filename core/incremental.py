@@ -0,0 +1,360 @@
+"""
+Mergeable sufficient statistics for appending patient batches.
+
+Every summary here can be built from one batch and merged with the summary of
+everything before it, so a new batch costs time proportional to the batch, not
+the history:
+
+- MomentTable:    per-group count / mean / M2 of each measure (Chan's parallel update)
+- CoMoments:      pairwise-complete co-moments for the correlation matrix
+- QuantileSketch: KLL sketch with bounded memory and ~1/k rank error
+- contingency counts of every pair of categorical columns
+
+IncrementalStats bundles them for one dataset version. Objects are never
+mutated once built; merge() returns a new one, so they can be shared between
+sessions.
+
+Only these summaries are incremental. The row-level frame of the new version
+is one contiguous copy (append_rows), and the indexes built from it (filter
+bitmaps, ranks) are rebuilt over all rows on first use, so those cost time
+proportional to the history.
+"""
+
+import hashlib
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from core.dtypes import CATEGORICAL_COLUMNS
+from core.ingestion import narrow_numeric
+from core.instrumentation import timed
+from core.statistics import GroupMoments, contingency_table
+
+# Label of the single group of an ungrouped MomentTable
+ALL_ROWS = '__all__'
+
+QUANTILE_SKETCH_K = 200
+
+
+def batch_version(parent_version, batch_bytes):
+    """Dataset version of a parent version with one batch appended."""
+    digest = hashlib.blake2b(batch_bytes, digest_size=16).hexdigest()
+    return hashlib.sha256(f"{parent_version}+{digest}".encode()).hexdigest()[:32]
+
+
+def append_rows(df, batch):
+    """Concatenate a batch onto a frame, keeping categoricals categorical and numbers narrow.
+
+    Copies every row of df, so this is O(history), not O(batch).
+    """
+    batch = batch.reindex(columns=df.columns.union(batch.columns, sort=False))
+    frames = [df.reindex(columns=batch.columns), batch]
+    combined = {}
+    for col in batch.columns:
+        left, right = frames[0][col], frames[1][col]
+        if isinstance(left.dtype, pd.CategoricalDtype) or isinstance(right.dtype, pd.CategoricalDtype):
+            merged = pd.api.types.union_categoricals(
+                [left.astype('category'), right.astype(str).where(right.notna()).astype('category')],
+                ignore_order=True)
+            combined[col] = pd.Series(merged, name=col)
+        elif pd.api.types.is_numeric_dtype(left) and pd.api.types.is_numeric_dtype(right):
+            combined[col] = narrow_numeric(pd.concat([left, right], ignore_index=True))
+        else:
+            combined[col] = pd.concat([left, right], ignore_index=True)
+    return pd.DataFrame(combined)
+
+
+def _chan_merge(count_a, mean_a, m2_a, count_b, mean_b, m2_b):
+    """Combine two sets of (count, mean, M2) elementwise."""
+    count = count_a + count_b
+    with np.errstate(divide='ignore', invalid='ignore'):
+        delta = mean_b - mean_a
+        mean = np.where(count > 0, mean_a + delta * count_b / count, 0.0)
+        m2 = np.where(count > 0, m2_a + m2_b + delta ** 2 * count_a * count_b / count, 0.0)
+    return count, mean, m2
+
+
+class MomentTable:
+    """Row count and per-measure count/mean/M2 for each value of one grouping column."""
+
+    def __init__(self, groups, measures, rows, count, mean, m2):
+        self.groups = groups
+        self.measures = measures
+        self.rows = rows
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+
+    @classmethod
+    def from_frame(cls, df, group_col, measures):
+        keys = df[group_col] if group_col is not None else pd.Series(ALL_ROWS, index=df.index)
+        values = df[measures].astype('float64')
+        grouped = values.groupby(keys, observed=True)
+        stats = grouped.agg(['count', 'mean', 'var'])
+        rows = keys.groupby(keys, observed=True).size().reindex(stats.index)
+
+        count = stats.xs('count', axis=1, level=1)[measures].to_numpy(dtype=float)
+        mean = np.nan_to_num(stats.xs('mean', axis=1, level=1)[measures].to_numpy(dtype=float))
+        var = np.nan_to_num(stats.xs('var', axis=1, level=1)[measures].to_numpy(dtype=float))
+        return cls(list(stats.index), list(measures), rows.to_numpy(dtype=float),
+                   count, mean, var * np.clip(count - 1, 0, None))
+
+    def merge(self, other):
+        """Combined table; groups are the union of both, in first-seen order."""
+        groups = list(dict.fromkeys(self.groups + other.groups))
+        position = {g: i for i, g in enumerate(groups)}
+
+        def aligned(table):
+            rows = np.zeros(len(groups))
+            arrays = [np.zeros((len(groups), len(self.measures))) for _ in range(3)]
+            index = [position[g] for g in table.groups]
+            rows[index] = table.rows
+            for target, source in zip(arrays, (table.count, table.mean, table.m2)):
+                target[index] = source
+            return rows, arrays
+
+        rows_a, (count_a, mean_a, m2_a) = aligned(self)
+        rows_b, (count_b, mean_b, m2_b) = aligned(other)
+        count, mean, m2 = _chan_merge(count_a, mean_a, m2_a, count_b, mean_b, m2_b)
+        return MomentTable(groups, self.measures, rows_a + rows_b, count, mean, m2)
+
+    def group_moments(self, measures=None):
+        """GroupMoments of the requested measures, for the closed-form tests."""
+        measures = [m for m in (measures or self.measures) if m in self.measures]
+        columns = [self.measures.index(m) for m in measures]
+        present = self.rows > 0
+        count = self.count[present][:, columns]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = np.where(count > 0, self.mean[present][:, columns], np.nan)
+            var = np.where(count > 1, self.m2[present][:, columns] / (count - 1), np.nan)
+        return GroupMoments(groups=[g for g, p in zip(self.groups, present) if p], variables=measures,
+                            count=count, mean=mean, var=var)
+
+
+class CoMoments:
+    """Pairwise-complete counts, means, M2 and co-moments of a set of numeric columns."""
+
+    def __init__(self, columns, count, mean, m2, comoment):
+        # mean[i, j] and m2[i, j] describe column i over rows where both i and j are present
+        self.columns = columns
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+        self.comoment = comoment
+
+    @classmethod
+    def from_frame(cls, df, columns):
+        values = df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        valid = ~np.isnan(values)
+        # Shift by a per-column center first so the sums below do not cancel
+        n_valid = valid.sum(axis=0)
+        center = np.where(valid, values, 0.0).sum(axis=0) / np.maximum(n_valid, 1)
+        shifted = np.where(valid, values - center, 0.0)
+        mask = valid.astype(np.float64)
+
+        count = mask.T @ mask
+        sums = shifted.T @ mask
+        sumsq = (shifted * shifted).T @ mask
+        cross = shifted.T @ shifted
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean_shifted = np.where(count > 0, sums / count, 0.0)
+            m2 = np.where(count > 0, sumsq - sums * mean_shifted, 0.0)
+            comoment = np.where(count > 0, cross - sums * mean_shifted.T, 0.0)
+        mean = np.where(count > 0, mean_shifted + center[:, None], 0.0)
+        return cls(list(columns), count, mean, m2, comoment)
+
+    def merge(self, other):
+        count = self.count + other.count
+        with np.errstate(divide='ignore', invalid='ignore'):
+            weight = np.where(count > 0, self.count * other.count / count, 0.0)
+        delta = other.mean - self.mean
+        _, mean, m2 = _chan_merge(self.count, self.mean, self.m2, other.count, other.mean, other.m2)
+        comoment = self.comoment + other.comoment + delta * delta.T * weight
+        return CoMoments(self.columns, count, mean, m2, comoment)
+
+    def correlation(self):
+        """Pearson correlation matrix (pairwise-complete, as DataFrame.corr)."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = self.comoment / np.sqrt(self.m2 * self.m2.T)
+        corr = np.where(self.count > 1, np.clip(corr, -1, 1), np.nan)
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+
+class QuantileSketch:
+    """KLL quantile sketch: level h holds items that each stand for 2**h values."""
+
+    def __init__(self, k=QUANTILE_SKETCH_K, levels=None, n=0, min_value=np.inf, max_value=-np.inf, seed=0):
+        self.k = k
+        self.levels = levels or [np.empty(0)]
+        self.n = n
+        self.min_value = min_value
+        self.max_value = max_value
+        self._rng = np.random.default_rng(seed + n)
+
+    @classmethod
+    def from_values(cls, values, k=QUANTILE_SKETCH_K):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return cls(k)
+        sketch = cls(k, [values.copy()], len(values), float(values.min()), float(values.max()))
+        sketch._compress()
+        return sketch
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        while True:
+            over = [h for h, items in enumerate(self.levels) if len(items) > self._capacity(h)]
+            if not over:
+                return
+            level = over[0]
+            if level + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+            items = np.sort(self.levels[level])
+            leftover = items[len(items) - len(items) % 2:]
+            # Keep every other item (random phase) and promote it one level up
+            promoted = items[:len(items) - len(leftover)][self._rng.integers(2)::2]
+            self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            self.levels[level] = leftover
+
+    @property
+    def nbytes(self):
+        return sum(items.nbytes for items in self.levels)
+
+    def merge(self, other):
+        depth = max(len(self.levels), len(other.levels))
+        levels = [np.concatenate([self.levels[h] if h < len(self.levels) else np.empty(0),
+                                  other.levels[h] if h < len(other.levels) else np.empty(0)])
+                  for h in range(depth)]
+        merged = QuantileSketch(self.k, levels, self.n + other.n,
+                                min(self.min_value, other.min_value), max(self.max_value, other.max_value))
+        merged._compress()
+        return merged
+
+    def quantiles(self, qs):
+        """Approximate quantiles; the exact min and max are returned for q=0 and q=1."""
+        qs = np.atleast_1d(np.asarray(qs, dtype=float))
+        if self.n == 0:
+            return np.full(len(qs), np.nan)
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level), 2.0 ** h) for h, level in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        items, cumulative = items[order], np.cumsum(weights[order])
+        ranks = qs * cumulative[-1]
+        result = items[np.minimum(np.searchsorted(cumulative, ranks, side='left'), len(items) - 1)]
+        result = np.where(qs <= 0, self.min_value, result)
+        return np.where(qs >= 1, self.max_value, result)
+
+
+class IncrementalStats:
+    """All mergeable summaries of one dataset version."""
+
+    def __init__(self, n_rows, columns, null_counts, moments, contingency, comoments, sketches):
+        self.n_rows = n_rows
+        self.columns = columns
+        self.null_counts = null_counts
+        self.moments = moments
+        self.contingency_counts = contingency
+        self.comoments = comoments
+        self.sketches = sketches
+
+    @classmethod
+    @timed('IncrementalStats', kind='data')
+    def from_frame(cls, df, categorical_cols=CATEGORICAL_COLUMNS, measures=None):
+        categorical = [c for c in categorical_cols if c in df.columns]
+        if measures is None:
+            measures = [c for c in df.select_dtypes(include=[np.number]).columns
+                        if not pd.api.types.is_bool_dtype(df[c])]
+        df = df.assign(**{m: pd.to_numeric(df[m], errors='coerce') if m in df.columns else np.nan
+                          for m in measures})
+
+        moments = {None: MomentTable.from_frame(df, None, measures)}
+        for col in categorical:
+            moments[col] = MomentTable.from_frame(df, col, measures)
+
+        contingency = {(a, b): contingency_table(df[a], df[b]) for a, b in combinations(categorical, 2)}
+        sketches = {m: QuantileSketch.from_values(df[m].to_numpy(dtype=np.float64, na_value=np.nan))
+                    for m in measures}
+        return cls(len(df), list(df.columns), df.isna().sum(), moments, contingency,
+                   CoMoments.from_frame(df, measures), sketches)
+
+    def merge(self, other):
+        """Statistics of both datasets combined; cost depends on the number of groups, not rows."""
+        moments = {col: table.merge(other.moments[col]) if col in other.moments else table
+                   for col, table in self.moments.items()}
+        contingency = {pair: table.add(other.contingency_counts[pair], fill_value=0).fillna(0).astype(np.int64)
+                       if pair in other.contingency_counts else table
+                       for pair, table in self.contingency_counts.items()}
+        comoments = self.comoments
+        if other.comoments.columns == self.comoments.columns:
+            comoments = comoments.merge(other.comoments)
+        sketches = {m: sketch.merge(other.sketches[m]) if m in other.sketches else sketch
+                    for m, sketch in self.sketches.items()}
+        return IncrementalStats(
+            n_rows=self.n_rows + other.n_rows,
+            columns=list(dict.fromkeys(self.columns + other.columns)),
+            null_counts=self.null_counts.add(other.null_counts, fill_value=0).astype(np.int64),
+            moments=moments,
+            contingency=contingency,
+            comoments=comoments,
+            sketches=sketches,
+        )
+
+    def appended(self, batch):
+        """Statistics with one more batch of rows, built from the batch alone."""
+        return self.merge(IncrementalStats.from_frame(batch, [c for c in self.moments if c is not None],
+                                                      self.moments[None].measures))
+
+    @property
+    def nbytes(self):
+        total = sum(t.count.nbytes * 3 + t.rows.nbytes for t in self.moments.values())
+        total += sum(int(t.to_numpy().nbytes) for t in self.contingency_counts.values())
+        total += self.comoments.count.nbytes * 4
+        total += sum(s.nbytes for s in self.sketches.values())
+        return total
+
+    @property
+    def n_columns(self):
+        return len(self.columns)
+
+    def missing_total(self):
+        return int(self.null_counts.sum())
+
+    def completeness(self):
+        cells = self.n_rows * self.n_columns
+        return 100 - (self.missing_total() / cells * 100) if cells else 100.0
+
+    def value_counts(self, col):
+        """Row counts per value of a tracked categorical column, largest first."""
+        table = self.moments[col]
+        counts = pd.Series(table.rows, index=table.groups, name=col).astype(np.int64)
+        return counts[counts > 0].sort_values(ascending=False)
+
+    def mean(self, measure):
+        overall = self.moments[None]
+        j = overall.measures.index(measure)
+        return overall.mean[0, j] if overall.count[0, j] else np.nan
+
+    def group_moments(self, col, measures):
+        return self.moments[col].group_moments(measures)
+
+    def contingency(self, col1, col2):
+        """Contingency table of two tracked categorical columns, or None if the pair is not tracked."""
+        if (col1, col2) in self.contingency_counts:
+            table = self.contingency_counts[(col1, col2)]
+        elif (col2, col1) in self.contingency_counts:
+            table = self.contingency_counts[(col2, col1)].T
+        else:
+            return None
+        table = table.loc[table.sum(axis=1) > 0, table.sum(axis=0) > 0]
+        return table.sort_index().sort_index(axis=1)
+
+    def correlation(self):
+        return self.comoments.correlation()
+
+    def quantiles(self, measure, qs):
+        return self.sketches[measure].quantiles(qs)
@@ -0,0 +1,122 @@
+"""
+Chunked streaming ingestion for large patient CSV exports.
+
+The CSV is read in bounded chunks. Each chunk is renamed, coerced to numeric
+and narrowed, and its known categorical columns become categoricals, before it
+is kept. Chunks are joined with union_categoricals, so peak memory stays close
+to twice the compact result instead of the raw string parse, and the memory
+ceiling is checked against the compacted chunks held so far.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+DEFAULT_CHUNK_ROWS = int(os.environ.get("BLOOD_CANCER_CHUNK_ROWS", 250_000))
+
+# Ceiling on the accumulated frame, 0 disables the check
+DEFAULT_MEMORY_LIMIT_MB = int(os.environ.get("BLOOD_CANCER_MEMORY_LIMIT_MB", 0))
+
+
+class IngestionMemoryError(MemoryError):
+    """Raised when the ingested data grows past the configured memory ceiling."""
+
+
+def narrow_numeric(series):
+    """Downcast a numeric series to the smallest dtype that holds it without loss."""
+    if pd.api.types.is_integer_dtype(series):
+        return pd.to_numeric(series, downcast='integer')
+
+    if pd.api.types.is_float_dtype(series):
+        values = series.to_numpy()
+        # All-integer floats without gaps can become real integers
+        if len(values) and not np.isnan(values).any() and np.array_equal(values, np.round(values)):
+            return pd.to_numeric(series, downcast='integer')
+
+        narrowed = values.astype(np.float32)
+        if np.allclose(narrowed, values, rtol=0, atol=0, equal_nan=True):
+            return pd.Series(narrowed, index=series.index, name=series.name)
+
+    return series
+
+
+def prepare_chunk(chunk, column_mapping, numeric_cols, categorical_cols=()):
+    """Rename, coerce and narrow one chunk."""
+    rename_dict = {k: v for k, v in column_mapping.items() if k in chunk.columns}
+    chunk = chunk.rename(columns=rename_dict)
+
+    for col in numeric_cols:
+        if col in chunk.columns:
+            chunk[col] = narrow_numeric(pd.to_numeric(chunk[col], errors='coerce'))
+
+    for col in categorical_cols:
+        if col in chunk.columns:
+            chunk[col] = chunk[col].astype('category')
+
+    return chunk
+
+
+def concat_chunks(chunks):
+    """
+    Join compacted chunks into one frame.
+
+    Categorical columns are combined with union_categoricals, since pd.concat
+    falls back to object strings when the chunks' categories differ.
+    """
+    if len(chunks) == 1:
+        return chunks[0].reset_index(drop=True)
+
+    columns = list(chunks[0].columns)
+    categorical = [col for col in columns
+                   if all(isinstance(chunk[col].dtype, pd.CategoricalDtype) for chunk in chunks)]
+    df = pd.concat([chunk.drop(columns=categorical) for chunk in chunks], ignore_index=True)
+    for col in categorical:
+        # Sorted, as astype('category') on the whole column would give
+        df[col] = union_categoricals([chunk[col] for chunk in chunks], sort_categories=True)
+    return df[columns]
+
+
+def read_csv_chunked(file_path, column_mapping, numeric_cols, categorical_cols=(),
+                     chunk_rows=DEFAULT_CHUNK_ROWS,
+                     memory_limit_mb=DEFAULT_MEMORY_LIMIT_MB,
+                     progress=None):
+    """
+    Stream a CSV into one compact DataFrame.
+
+    progress, if given, is called as progress(fraction, rows_read) after each chunk.
+    """
+    total_bytes = max(os.path.getsize(file_path), 1)
+    limit_bytes = memory_limit_mb * 1024 * 1024
+    chunks = []
+    rows_read = 0
+    bytes_held = 0
+
+    with open(file_path, 'rb') as handle:
+        for chunk in pd.read_csv(handle, chunksize=chunk_rows):
+            chunk = prepare_chunk(chunk, column_mapping, numeric_cols, categorical_cols)
+            chunks.append(chunk)
+            rows_read += len(chunk)
+
+            bytes_held += int(chunk.memory_usage(deep=True).sum())
+            if limit_bytes and bytes_held > limit_bytes:
+                raise IngestionMemoryError(
+                    f"Dataset exceeds the {memory_limit_mb} MB memory limit "
+                    f"after {rows_read:,} rows"
+                )
+
+            if progress is not None:
+                progress(min(handle.tell() / total_bytes, 1.0), rows_read)
+
+    if not chunks:
+        return pd.DataFrame()
+
+    df = concat_chunks(chunks)
+
+    # Chunks may have narrowed differently, settle each column on one dtype
+    for col in numeric_cols:
+        if col in df.columns:
+            df[col] = narrow_numeric(df[col])
+
+    return df
@@ -0,0 +1,247 @@
+"""
+Per-rerun timing and memory instrumentation.
+
+A Recorder collects the spans of one dashboard rerun: page functions, data
+stages, statistics tests and each chart's build, serialization and rendering.
+It is held in a context variable, so concurrent sessions (one script thread
+each) never mix their spans, and code running outside a recorded rerun (batch
+workers, disabled sessions) pays only a context-variable lookup per call.
+
+Finished reruns can be appended to an NDJSON log (BLOOD_CANCER_PERF_LOG) and
+rolled up into a Prometheus textfile (BLOOD_CANCER_PERF_PROM) for the node
+exporter's textfile collector. BLOOD_CANCER_PERF=1, or either path, records
+every session; otherwise sessions opt in from the sidebar.
+"""
+
+import contextvars
+import functools
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime, timezone
+
+from core.dataset_store import process_rss_bytes
+
+LOG_PATH = os.environ.get("BLOOD_CANCER_PERF_LOG", "")
+PROMETHEUS_PATH = os.environ.get("BLOOD_CANCER_PERF_PROM", "")
+ENABLED = os.environ.get("BLOOD_CANCER_PERF", "0") != "0" or bool(LOG_PATH or PROMETHEUS_PATH)
+
+METRIC_PREFIX = "blood_cancer"
+
+# One finished span; depth is its nesting level, self_seconds excludes nested spans
+SpanRecord = namedtuple('SpanRecord', ['name', 'kind', 'depth', 'seconds', 'self_seconds', 'rss_delta'])
+
+_recorder = contextvars.ContextVar('blood_cancer_recorder', default=None)
+
+
+class _Span:
+    __slots__ = ('recorder', 'name', 'kind', 'index', 'started', 'rss', 'children')
+
+    def __init__(self, recorder, name, kind):
+        self.recorder = recorder
+        self.name = name
+        self.kind = kind
+
+    def __enter__(self):
+        recorder = self.recorder
+        # Reserve the slot now so spans are listed in start order
+        self.index = len(recorder.spans)
+        recorder.spans.append(None)
+        recorder.stack.append(self)
+        self.children = 0.0
+        self.rss = process_rss_bytes()
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        seconds = time.perf_counter() - self.started
+        rss = process_rss_bytes()
+        recorder = self.recorder
+        recorder.stack.pop()
+        if recorder.stack:
+            recorder.stack[-1].children += seconds
+        recorder.spans[self.index] = SpanRecord(
+            self.name, self.kind, len(recorder.stack), seconds, max(seconds - self.children, 0.0),
+            rss - self.rss if rss is not None and self.rss is not None else None,
+        )
+        return False
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+class Recorder:
+    """Spans of one rerun, in start order."""
+
+    def __init__(self, label, session=None):
+        self.label = label
+        self.session = session
+        self.spans = []
+        self.stack = []
+        self.started = time.perf_counter()
+        self.created = datetime.now(timezone.utc)
+        self.seconds = None
+        self._token = None
+
+    def span(self, name, kind='stage'):
+        return _Span(self, name, kind)
+
+    def records(self):
+        """Finished spans (a span still open when the rerun stopped is left out)."""
+        return [record for record in self.spans if record is not None]
+
+    def totals(self):
+        """{kind: self seconds}, so nested spans are not counted twice."""
+        totals = {}
+        for record in self.records():
+            totals[record.kind] = totals.get(record.kind, 0.0) + record.self_seconds
+        return totals
+
+    def to_dict(self):
+        return {
+            'time': self.created.isoformat(timespec='milliseconds'),
+            'session': self.session,
+            'label': self.label,
+            'seconds': self.seconds,
+            'spans': [record._asdict() for record in self.records()],
+        }
+
+
+def span(name, kind='stage'):
+    """Context manager timing a block in the current rerun; a shared no-op when none is recorded."""
+    recorder = _recorder.get()
+    if recorder is None:
+        return _NO_SPAN
+    return _Span(recorder, name, kind)
+
+
+def timed(name=None, kind='stage'):
+    """Decorator recording every call of a function as a span."""
+    def decorate(function):
+        label = name or function.__name__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            recorder = _recorder.get()
+            if recorder is None:
+                return function(*args, **kwargs)
+            with _Span(recorder, label, kind):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def recording():
+    return _recorder.get() is not None
+
+
+def start_run(label, session=None):
+    """Start recording a rerun in the current context. Returns its Recorder."""
+    recorder = Recorder(label, session)
+    recorder._token = _recorder.set(recorder)
+    return recorder
+
+
+def finish_run(recorder):
+    """Stop recording and write the rerun to the configured logs."""
+    recorder.seconds = time.perf_counter() - recorder.started
+    if recorder._token is not None:
+        _recorder.reset(recorder._token)
+        recorder._token = None
+    if LOG_PATH:
+        append_ndjson(LOG_PATH, recorder)
+    if PROMETHEUS_PATH:
+        METRICS.add(recorder)
+        METRICS.write_textfile(PROMETHEUS_PATH)
+    return recorder
+
+
+# ==================== SINKS ====================
+
+_log_lock = threading.Lock()
+
+
+def append_ndjson(path, recorder):
+    """Append one JSON line per rerun. Logging never breaks the dashboard."""
+    line = json.dumps(recorder.to_dict(), default=str) + "\n"
+    try:
+        with _log_lock, open(path, "a", encoding="utf-8") as handle:
+            handle.write(line)
+    except OSError:
+        pass
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Metrics:
+    """Process-wide totals of every span and rerun, rendered in the Prometheus text format."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.spans = {}
+        self.reruns = {}
+
+    def add(self, recorder):
+        with self._lock:
+            count, seconds = self.reruns.get(recorder.label, (0, 0.0))
+            self.reruns[recorder.label] = (count + 1, seconds + recorder.seconds)
+            for record in recorder.records():
+                key = (record.name, record.kind)
+                count, seconds, self_seconds = self.spans.get(key, (0, 0.0, 0.0))
+                self.spans[key] = (count + 1, seconds + record.seconds, self_seconds + record.self_seconds)
+
+    def render(self):
+        with self._lock:
+            spans = sorted(self.spans.items())
+            reruns = sorted(self.reruns.items())
+
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {METRIC_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name} {kind}")
+            for labels, value in samples:
+                label_text = ",".join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+                lines.append(f"{METRIC_PREFIX}_{name}{{{label_text}}} {value:.6g}")
+
+        metric("reruns_total", "counter", "Dashboard reruns recorded.",
+               [({'page': label}, count) for label, (count, _) in reruns])
+        metric("rerun_seconds_total", "counter", "Wall-clock time of recorded reruns.",
+               [({'page': label}, seconds) for label, (_, seconds) in reruns])
+        metric("span_calls_total", "counter", "Calls of each instrumented span.",
+               [({'name': name, 'kind': kind}, count) for (name, kind), (count, _, _) in spans])
+        metric("span_seconds_total", "counter", "Time in each instrumented span, nested spans included.",
+               [({'name': name, 'kind': kind}, seconds) for (name, kind), (_, seconds, _) in spans])
+        metric("span_self_seconds_total", "counter", "Time in each instrumented span, nested spans excluded.",
+               [({'name': name, 'kind': kind}, self_seconds) for (name, kind), (_, _, self_seconds) in spans])
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path):
+        """Replace the textfile atomically, as the textfile collector requires."""
+        directory = os.path.dirname(os.path.abspath(path))
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".prom.tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                handle.write(self.render())
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+
+# Shared by every session in the process
+METRICS = Metrics()
@@ -0,0 +1,80 @@
+"""
+Binned scatter matrix.
+
+Each off-diagonal panel is a 2D histogram of one column pair, computed in a
+single pass with np.bincount and cached per pair; the diagonal reuses the
+column's 1D distribution summary, and the 2D bins use that summary's edges so
+every panel in a row or column of the grid lines up with the diagonal. The
+figure holds bins² cells per panel no matter how many patients are behind it.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+PAIR_BINS = 40
+
+PairHistogram = namedtuple('PairHistogram', ['x', 'y', 'counts', 'n'])
+
+
+def _bin_index(values, edges):
+    bins = len(edges) - 1
+    low, high = edges[0], edges[-1]
+    width = (high - low) / bins if high > low else 1.0
+    # Right edge of the last bin is inclusive, as in np.histogram
+    return np.clip(((values - low) / width).astype(np.int64), 0, bins - 1)
+
+
+def pair_histogram(x_values, y_values, x_edges, y_edges, x_name=None, y_name=None):
+    """Counts of (x, y) over rows where both are present, shape (x bins, y bins)."""
+    both = ~np.isnan(x_values) & ~np.isnan(y_values)
+    x_index = _bin_index(x_values[both], x_edges)
+    y_index = _bin_index(y_values[both], y_edges)
+    n_y = len(y_edges) - 1
+    counts = np.bincount(x_index * n_y + y_index, minlength=(len(x_edges) - 1) * n_y)
+    return PairHistogram(x_name, y_name, counts.reshape(len(x_edges) - 1, n_y), int(both.sum()))
+
+
+def pairplot_figure(columns, summaries, histograms, title='Pairwise Relationships', colorscale='Viridis'):
+    """
+    Scatter-matrix figure from precomputed summaries.
+
+    summaries maps column -> DistributionSummary (diagonal); histograms maps
+    (column_a, column_b) with a before b in `columns` -> PairHistogram.
+    """
+    k = len(columns)
+    fig = make_subplots(rows=k, cols=k, horizontal_spacing=0.02, vertical_spacing=0.02)
+
+    for row, y_col in enumerate(columns, start=1):
+        for col, x_col in enumerate(columns, start=1):
+            if x_col == y_col:
+                summary = summaries[x_col]
+                centers = (summary.edges[:-1] + summary.edges[1:]) / 2
+                fig.add_trace(go.Bar(x=centers, y=summary.counts, width=np.diff(summary.edges),
+                                     marker_color='#636EFA', showlegend=False, name=x_col,
+                                     hovertemplate=f'{x_col}: %{{x:.4g}}<br>count: %{{y:,}}<extra></extra>'),
+                              row=row, col=col)
+                continue
+
+            if (x_col, y_col) in histograms:
+                counts = histograms[(x_col, y_col)].counts.T
+            else:
+                counts = histograms[(y_col, x_col)].counts
+            x_edges, y_edges = summaries[x_col].edges, summaries[y_col].edges
+            # Empty cells are left blank instead of drawn at the bottom of the scale
+            z = np.where(counts > 0, counts, np.nan)
+            fig.add_trace(go.Heatmap(x=(x_edges[:-1] + x_edges[1:]) / 2, y=(y_edges[:-1] + y_edges[1:]) / 2, z=z,
+                                     colorscale=colorscale, showscale=False,
+                                     hovertemplate=f'{x_col}: %{{x:.4g}}<br>{y_col}: %{{y:.4g}}'
+                                                   f'<br>patients: %{{z:,}}<extra></extra>'),
+                          row=row, col=col)
+
+    for index, column in enumerate(columns, start=1):
+        fig.update_xaxes(title_text=column, row=k, col=index)
+        fig.update_yaxes(title_text=column, row=index, col=1)
+    fig.update_xaxes(showticklabels=False)
+    fig.update_yaxes(showticklabels=False)
+    fig.update_layout(title=title, height=max(400, 200 * k), bargap=0, showlegend=False)
+    return fig
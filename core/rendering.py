@@ -0,0 +1,109 @@
+"""
+Server-side point reduction for scatter-style charts.
+
+Plotly serializes every row it is given, so large frames freeze the browser.
+reduce_points() picks a strategy from the row count:
+
+- raw:     small data is sent as is
+- sample:  medium data is sampled, stratified by the color column, with a fixed seed
+- binned:  large data is aggregated into a grid of cells (per color group), each
+           cell drawn once with its patient count
+
+and reports the reduction so the page can say what is shown.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+RAW_POINT_LIMIT = 5_000
+DENSITY_THRESHOLD = 100_000
+SAMPLE_SEED = 42
+
+COUNT_COLUMN = 'Patients'
+
+# Grid resolution per dimension for binned output
+BINS_BY_DIMENSIONS = {1: 200, 2: 80, 3: 15}
+
+Reduction = namedtuple('Reduction', ['strategy', 'rows_in', 'rows_out', 'detail'])
+
+
+def describe_reduction(reduction):
+    """One-line caption for a chart."""
+    if reduction.strategy == 'raw':
+        return f"Showing all {reduction.rows_in:,} points"
+    if reduction.strategy == 'sample':
+        return (f"Showing a reproducible sample of {reduction.rows_out:,} of {reduction.rows_in:,} points "
+                f"({reduction.detail})")
+    return (f"{reduction.rows_in:,} points aggregated into {reduction.rows_out:,} cells "
+            f"({reduction.detail}); each marker summarizes one cell, hover for its patient count")
+
+
+def stratified_sample(df, n, by=None, seed=SAMPLE_SEED):
+    """Reproducible sample of about n rows, proportional within each group of `by`."""
+    if len(df) <= n:
+        return df
+    frac = n / len(df)
+    if by is None or by not in df.columns:
+        return df.sample(n=n, random_state=seed)
+    return df.groupby(by, observed=True, group_keys=False).sample(frac=frac, random_state=seed)
+
+
+def bin_points(df, dims, color=None, size=None, bins=None):
+    """Aggregate points into a regular grid; one output row per non-empty (cell, color) pair."""
+    bins = bins or BINS_BY_DIMENSIONS.get(len(dims), 20)
+    cell = np.zeros(len(df), dtype=np.int64)
+    centers = {}
+
+    for dim in dims:
+        values = df[dim].to_numpy(dtype=np.float64)
+        low, high = values.min(), values.max()
+        width = (high - low) / bins if high > low else 1.0
+        index = np.minimum(((values - low) / width).astype(np.int64), bins - 1)
+        cell = cell * bins + index
+        centers[dim] = (low, width)
+
+    keys = {'cell': cell}
+    if color is not None:
+        keys[color] = df[color].to_numpy()
+    frame = pd.DataFrame(keys)
+    group_cols = list(keys)
+
+    if size is not None:
+        frame[size] = df[size].to_numpy(dtype=np.float64)
+        grouped = frame.groupby(group_cols, observed=True, sort=False)
+        binned = grouped[size].agg(['size', 'mean']).rename(columns={'size': COUNT_COLUMN, 'mean': size})
+    else:
+        binned = frame.groupby(group_cols, observed=True, sort=False).size().rename(COUNT_COLUMN).to_frame()
+    binned = binned.reset_index()
+
+    # Decode the cell id back into per-dimension bin centers
+    remaining = binned['cell'].to_numpy()
+    for dim in reversed(dims):
+        low, width = centers[dim]
+        binned[dim] = low + (remaining % bins + 0.5) * width
+        remaining = remaining // bins
+
+    return binned.drop(columns='cell')
+
+
+def reduce_points(df, dims, color=None, size=None,
+                  raw_limit=RAW_POINT_LIMIT, density_threshold=DENSITY_THRESHOLD, seed=SAMPLE_SEED):
+    """Choose and apply a reduction for a scatter-style chart. Returns (plot_df, Reduction)."""
+    columns = list(dict.fromkeys(dims + [c for c in (color, size) if c is not None]))
+    data = df[columns].dropna()
+    n_rows = len(data)
+
+    if n_rows <= raw_limit:
+        return data, Reduction('raw', n_rows, n_rows, '')
+
+    if n_rows <= density_threshold:
+        sampled = stratified_sample(data, raw_limit, by=color, seed=seed)
+        detail = f"stratified by {color}" if color else "uniform"
+        return sampled, Reduction('sample', n_rows, len(sampled), detail)
+
+    binned = bin_points(data, dims, color=color, size=size)
+    bins = BINS_BY_DIMENSIONS.get(len(dims), 20)
+    detail = ' × '.join([str(bins)] * len(dims)) + ' grid'
+    return binned, Reduction('binned', n_rows, len(binned), detail)
@@ -0,0 +1,275 @@
+"""
+Building blocks of the data-driven project report.
+
+A report section is a list of blocks (headings, paragraphs, tables, charts)
+plus the facts it derived, e.g. the number of significant tests. Sections and
+chart images are cached on disk under a fingerprint of exactly the columns
+they read, so after a small data change only the sections and charts that
+touch the changed columns are rebuilt. Charts are rendered with matplotlib
+(Agg) in worker processes, each receiving only its own columns.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from core.screening import MIN_LEVEL_COUNT
+from core.snapshot import CACHE_DIR
+
+# Bump when a section's wording or a chart's look changes so cached copies are rebuilt
+REPORT_CACHE_VERSION = 1
+
+DEFAULT_REPORT_CACHE_DIR = os.path.join(CACHE_DIR, "report")
+
+
+# ==================== FINGERPRINTS ====================
+
+def column_fingerprints(df):
+    """Content hash of every column (values and dtype, not the index)."""
+    fingerprints = {}
+    for col in df.columns:
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(str(df[col].dtype).encode())
+        digest.update(pd.util.hash_pandas_object(df[col], index=False).to_numpy().tobytes())
+        fingerprints[col] = digest.hexdigest()
+    return fingerprints
+
+
+def fingerprint(name, fingerprints, columns, *params):
+    """Cache key of one section or chart: its name, the columns it reads and any extra parameters."""
+    payload = (REPORT_CACHE_VERSION, name, tuple((col, fingerprints.get(col)) for col in columns), params)
+    return hashlib.sha256(repr(payload).encode()).hexdigest()[:32]
+
+
+# ==================== CACHE ====================
+
+class ReportCache:
+    """Sections (pickled blocks and facts) and chart PNGs on disk, keyed by fingerprint."""
+
+    def __init__(self, cache_dir=DEFAULT_REPORT_CACHE_DIR, enabled=True):
+        self.cache_dir = cache_dir
+        self.enabled = enabled
+
+    def _path(self, kind, key):
+        return os.path.join(self.cache_dir, kind, f"{key}.{'png' if kind == 'charts' else 'pkl'}")
+
+    def _read(self, kind, key):
+        if not self.enabled:
+            return None
+        try:
+            with open(self._path(kind, key), "rb") as handle:
+                data = handle.read()
+        except OSError:
+            return None
+        if kind == 'charts':
+            return data
+        try:
+            return pickle.loads(data)
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+
+    def _write(self, kind, key, value):
+        if not self.enabled:
+            return
+        directory = os.path.join(self.cache_dir, kind)
+        data = value if kind == 'charts' else pickle.dumps(value)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(data)
+            os.replace(tmp_path, self._path(kind, key))
+        except OSError:
+            pass
+
+    def section(self, key):
+        return self._read('sections', key)
+
+    def store_section(self, key, section):
+        self._write('sections', key, section)
+
+    def chart(self, key):
+        return self._read('charts', key)
+
+    def store_chart(self, key, png):
+        self._write('charts', key, png)
+
+
+# ==================== CHARTS ====================
+
+def frequent_levels(series):
+    """Counts of the levels seen at least MIN_LEVEL_COUNT times (stray header rows and typos are dropped)."""
+    counts = series.value_counts()
+    return counts[counts >= MIN_LEVEL_COUNT]
+
+
+def _age_histogram(df, ax):
+    ax.hist(df['Age'].dropna(), bins=30, color='#636EFA', edgecolor='white')
+    ax.set(title='Patient Age Distribution', xlabel='Age (years)', ylabel='Patients')
+
+
+def _counts_bar(col, title, color):
+    def render(df, ax):
+        counts = frequent_levels(df[col])
+        ax.barh(counts.index.astype(str)[::-1], counts.to_numpy()[::-1], color=color)
+        ax.set(title=title, xlabel='Patients')
+    return render
+
+
+def _by_diagnosis_box(col, title):
+    def render(df, ax):
+        levels = frequent_levels(df['Diagnosis']).index
+        groups = [df.loc[df['Diagnosis'] == level, col].dropna().to_numpy() for level in levels]
+        kept = [(str(level), values) for level, values in zip(levels, groups) if len(values)]
+        ax.boxplot([values for _, values in kept], tick_labels=[level for level, _ in kept], showfliers=False)
+        ax.set(title=title, ylabel=col)
+        ax.tick_params(axis='x', rotation=30)
+    return render
+
+
+def _age_vs_wbc(df, ax):
+    both = df[['Age', 'WBC']].dropna()
+    # Hexagonal bins keep the image the same cost at any row count
+    image = ax.hexbin(both['Age'], both['WBC'], gridsize=35, mincnt=1, cmap='viridis')
+    ax.figure.colorbar(image, ax=ax, label='Patients')
+    ax.set(title='Age vs WBC', xlabel='Age (years)', ylabel='WBC (/cumm)')
+
+
+def _correlation_heatmap(df, ax):
+    # Placeholder columns with no values would be all-NaN rows and columns
+    corr = df.loc[:, df.notna().sum() >= 2].astype(float).corr()
+    image = ax.imshow(corr.to_numpy(), cmap='RdBu_r', vmin=-1, vmax=1)
+    ax.set_xticks(range(len(corr)), corr.columns, rotation=30)
+    ax.set_yticks(range(len(corr)), corr.columns)
+    for i in range(len(corr)):
+        for j in range(len(corr)):
+            value = corr.iat[i, j]
+            ax.text(j, i, f"{value:.2f}", ha='center', va='center', fontsize=9,
+                    color='white' if abs(value) > 0.5 else 'black')
+    ax.figure.colorbar(image, ax=ax, label='Pearson r')
+    ax.set_title('Correlation Matrix (pairwise complete)')
+
+
+# Chart -> (renderer(df, ax), columns it reads, figure size in inches)
+CHART_RENDERERS = {
+    'age_histogram': (_age_histogram, ['Age'], (7, 4)),
+    'gender_counts': (_counts_bar('Gender', 'Patients by Gender', '#EF553B'), ['Gender'], (7, 3)),
+    'diagnosis_counts': (_counts_bar('Diagnosis', 'Patients by Diagnosis', '#00CC96'), ['Diagnosis'], (7, 4)),
+    'wbc_by_diagnosis': (_by_diagnosis_box('WBC', 'WBC by Diagnosis'), ['Diagnosis', 'WBC'], (7, 4)),
+    'platelets_by_diagnosis': (_by_diagnosis_box('Platelets', 'Platelets by Diagnosis'),
+                               ['Diagnosis', 'Platelets'], (7, 4)),
+    'age_vs_wbc': (_age_vs_wbc, ['Age', 'WBC'], (7, 4.5)),
+    'correlation_heatmap': (_correlation_heatmap, ['Age', 'WBC', 'RBC', 'Hemoglobin', 'Platelets'], (6, 5)),
+}
+
+
+def chart_columns(name):
+    return CHART_RENDERERS[name][1]
+
+
+def render_chart(name, df):
+    """PNG bytes of one chart. Runs in a worker process."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    renderer, _, size = CHART_RENDERERS[name]
+    fig, ax = plt.subplots(figsize=size)
+    try:
+        renderer(df, ax)
+        fig.tight_layout()
+        buffer = BytesIO()
+        fig.savefig(buffer, format='png', dpi=150)
+        return buffer.getvalue()
+    finally:
+        plt.close(fig)
+
+
+def render_charts(jobs, max_workers=None):
+    """{key: PNG bytes} for (key, chart name, frame) jobs, rendered in parallel when there are several."""
+    max_workers = max_workers or min(len(jobs), os.cpu_count() or 1)
+    if max_workers <= 1 or len(jobs) <= 1:
+        return {key: render_chart(name, df) for key, name, df in jobs}
+
+    images = {}
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(render_chart, name, df): key for key, name, df in jobs}
+        for future in as_completed(futures):
+            images[futures[future]] = future.result()
+    return images
+
+
+# ==================== BLOCKS ====================
+
+def heading(text, level=1, centered=False):
+    return ('heading', text, level, centered)
+
+
+def paragraph(text, style=None):
+    return ('paragraph', text, style)
+
+
+def bullets(items, style='List Bullet'):
+    return [paragraph(item, style) for item in items]
+
+
+def runs(*parts):
+    """A paragraph of (text, bold) runs."""
+    return ('runs', parts)
+
+
+def table(header, rows):
+    return ('table', list(header), [[str(cell) for cell in row] for row in rows])
+
+
+def chart(name, width=6.0):
+    return ('chart', name, width)
+
+
+def page_break():
+    return ('page_break',)
+
+
+def add_blocks(doc, blocks, images):
+    """Append blocks to a python-docx Document; images maps chart name -> PNG bytes."""
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.shared import Inches
+
+    for block in blocks:
+        kind = block[0]
+        if kind == 'heading':
+            docx_heading = doc.add_heading(block[1], level=block[2])
+            if block[3]:
+                docx_heading.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        elif kind == 'paragraph':
+            doc.add_paragraph(block[1], style=block[2])
+        elif kind == 'runs':
+            p = doc.add_paragraph()
+            for text, bold in block[1]:
+                p.add_run(text).bold = bold
+        elif kind == 'table':
+            header, rows = block[1], block[2]
+            docx_table = doc.add_table(rows=len(rows) + 1, cols=len(header))
+            docx_table.style = 'Light Grid Accent 1'
+            for cell, text in zip(docx_table.rows[0].cells, header):
+                cell.text = text
+            for docx_row, row in zip(docx_table.rows[1:], rows):
+                for cell, text in zip(docx_row.cells, row):
+                    cell.text = text
+        elif kind == 'chart':
+            if block[1] in images:
+                doc.add_picture(BytesIO(images[block[1]]), width=Inches(block[2]))
+        elif kind == 'page_break':
+            doc.add_page_break()
+
+
+def format_p(p_value):
+    if p_value is None or np.isnan(p_value):
+        return 'n/a'
+    return '< 0.0001' if p_value < 0.0001 else f"{p_value:.4f}"
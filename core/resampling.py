@@ -0,0 +1,207 @@
+"""
+Permutation tests and bootstrap confidence intervals for two-group differences.
+
+Columns with at most MAX_SUPPORT distinct values (ages, scores, codes) are
+reduced to counts over those values, and a resample is a vector of counts:
+
+- permutation: multivariate hypergeometric split of the pooled counts
+- bootstrap:   multinomial draw from each group's own counts
+
+so one resample costs O(distinct values) no matter how many patients are
+behind it. Columns with more distinct values (WBC, platelets) resample the
+raw values by index, in batches of at most BATCH_CELLS values so memory
+stays bounded. Both are exact, but the raw-value path costs O(group size)
+per resample, so once n_resamples x group size passes EXACT_MAX_CELLS such
+columns are instead binned into MAX_SUPPORT equal-frequency bins represented
+by their bin means. Resamples then draw bin means rather than observed
+values, so the p-value and CI are approximations (flagged by `binned`);
+approximate=True or False forces either path. Resamples run in fixed-size
+chunks, each seeded from its own child of the SeedSequence, so results
+depend on the seed but not on the number of workers.
+"""
+
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from core.instrumentation import timed
+
+DEFAULT_RESAMPLES = 10_000
+CHUNK_RESAMPLES = 1_000
+MAX_SUPPORT = 1_024
+
+# Values materialized at once by the raw-value path (resamples x group size)
+BATCH_CELLS = 4_000_000
+
+# Raw-value resample cells (resamples x group size) above which approximate=None bins instead,
+# a few seconds of single-core work at 40-80 ns per cell
+EXACT_MAX_CELLS = 50_000_000
+
+# Resample cells (support or group size per resample) below which a chunk runs faster
+# in-process than the pool starts and ships the values to its workers
+PARALLEL_MIN_CELLS = 1_000_000
+
+STATISTICS = ('mean', 'median')
+
+ResamplingResult = namedtuple('ResamplingResult', [
+    'statistic', 'n1', 'n2', 'observed', 'ci_low', 'ci_high', 'confidence', 'p_value',
+    'n_resamples', 'seed', 'support_size', 'binned', 'permuted',
+])
+
+
+def quantile_bins(values, n_bins):
+    """(bin means, bin code of every value) for up to n_bins equal-frequency bins."""
+    edges = np.unique(np.quantile(values, np.linspace(0, 1, n_bins + 1)))
+    codes = np.clip(np.searchsorted(edges, values, side='right') - 1, 0, len(edges) - 2)
+    counts = np.bincount(codes, minlength=len(edges) - 1)
+    sums = np.bincount(codes, weights=values, minlength=len(edges) - 1)
+    used = counts > 0
+    # Drop empty bins and renumber
+    remap = np.cumsum(used) - 1
+    return sums[used] / counts[used], remap[codes]
+
+
+def counts_statistic(counts, support, statistic):
+    """Mean or median of each row of a (resamples, support) count matrix."""
+    counts = np.atleast_2d(counts)
+    n = counts.sum(axis=1)
+    if statistic == 'mean':
+        return counts @ support / n
+
+    cumulative = np.cumsum(counts, axis=1)
+    # Median from the values at ranks ceil(n/2) and floor(n/2)+1 (1-based)
+    low = (cumulative < ((n + 1) // 2)[:, None]).sum(axis=1)
+    high = (cumulative < (n // 2 + 1)[:, None]).sum(axis=1)
+    return (support[low] + support[high]) / 2
+
+
+def _resample_counts_chunk(support, counts1, counts2, statistic, size, seed):
+    """Permutation and bootstrap differences (group 1 - group 2) for one chunk of resamples, drawn as counts."""
+    rng = np.random.default_rng(seed)
+    n1, n2 = int(counts1.sum()), int(counts2.sum())
+
+    pooled = (counts1 + counts2).astype(np.int64)
+    split = rng.multivariate_hypergeometric(pooled, n1, size=size)
+    permuted = counts_statistic(split, support, statistic) - counts_statistic(pooled - split, support, statistic)
+
+    boot1 = rng.multinomial(n1, counts1 / n1, size=size)
+    boot2 = rng.multinomial(n2, counts2 / n2, size=size)
+    bootstrapped = counts_statistic(boot1, support, statistic) - counts_statistic(boot2, support, statistic)
+    return permuted, bootstrapped
+
+
+def _rows_statistic(rows, statistic):
+    return rows.mean(axis=1) if statistic == 'mean' else np.median(rows, axis=1)
+
+
+def _resample_values_chunk(values1, values2, statistic, size, seed):
+    """Permutation and bootstrap differences (group 1 - group 2) for one chunk of resamples, drawn by index."""
+    rng = np.random.default_rng(seed)
+    n1 = len(values1)
+    pooled = np.concatenate([values1, values2])
+    # Deterministic in the group sizes, so results do not depend on where a chunk runs
+    batch = max(1, BATCH_CELLS // len(pooled))
+
+    permuted, bootstrapped = [], []
+    for start in range(0, size, batch):
+        rows = min(batch, size - start)
+        shuffled = rng.permuted(np.broadcast_to(pooled, (rows, len(pooled))), axis=1)
+        permuted.append(_rows_statistic(shuffled[:, :n1], statistic) - _rows_statistic(shuffled[:, n1:], statistic))
+        del shuffled
+        boot1 = values1[rng.integers(0, n1, size=(rows, n1))]
+        boot2 = values2[rng.integers(0, len(values2), size=(rows, len(values2)))]
+        bootstrapped.append(_rows_statistic(boot1, statistic) - _rows_statistic(boot2, statistic))
+    return np.concatenate(permuted), np.concatenate(bootstrapped)
+
+
+@timed(kind='test')
+def resample_test(values1, values2, statistic='mean', n_resamples=DEFAULT_RESAMPLES, seed=42,
+                  confidence=0.95, max_support=MAX_SUPPORT, approximate=None, max_workers=None, progress=None):
+    """
+    Permutation p-value and bootstrap CI of statistic(group 1) - statistic(group 2).
+
+    Values with more than max_support distinct values are resampled over
+    quantile bins when approximate=True, or when approximate=None and the
+    raw-value path would exceed EXACT_MAX_CELLS; approximate=False is always exact.
+    progress, if given, is called as progress(resamples_done, n_resamples) after each chunk.
+    """
+    if statistic not in STATISTICS:
+        raise ValueError(f"Unknown statistic {statistic!r}, expected one of {STATISTICS}")
+    values1 = np.asarray(values1, dtype=np.float64)
+    values2 = np.asarray(values2, dtype=np.float64)
+    values1, values2 = values1[~np.isnan(values1)], values2[~np.isnan(values2)]
+    if len(values1) < 2 or len(values2) < 2:
+        return None
+
+    observed = {'mean': np.mean, 'median': np.median}[statistic]
+    observed_difference = float(observed(values1) - observed(values2))
+
+    pooled = np.concatenate([values1, values2])
+    support, codes = np.unique(pooled, return_inverse=True)
+    if approximate is None:
+        approximate = n_resamples * len(pooled) > EXACT_MAX_CELLS
+    binned = len(support) > max_support and approximate
+    if binned:
+        support, codes = quantile_bins(pooled, max_support)
+
+    if len(support) <= max_support or binned:
+        counts1 = np.bincount(codes[:len(values1)], minlength=len(support))
+        counts2 = np.bincount(codes[len(values1):], minlength=len(support))
+        chunk, arguments, cost = _resample_counts_chunk, (support, counts1, counts2, statistic), len(support)
+        # The null distribution is drawn on the support, so compare against the statistic on the support too
+        test_difference = float(counts_statistic(counts1, support, statistic)[0] -
+                                counts_statistic(counts2, support, statistic)[0])
+    else:
+        chunk, arguments, cost = _resample_values_chunk, (values1, values2, statistic), len(pooled)
+        test_difference = observed_difference
+
+    sizes = [CHUNK_RESAMPLES] * (n_resamples // CHUNK_RESAMPLES)
+    if n_resamples % CHUNK_RESAMPLES:
+        sizes.append(n_resamples % CHUNK_RESAMPLES)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    max_workers = max_workers or min(len(sizes), os.cpu_count() or 1)
+
+    results = [None] * len(sizes)
+    done = 0
+    if max_workers > 1 and n_resamples * cost >= PARALLEL_MIN_CELLS:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = {pool.submit(chunk, *arguments, size, chunk_seed): i
+                       for i, (size, chunk_seed) in enumerate(zip(sizes, seeds))}
+            for future in as_completed(futures):
+                i = futures[future]
+                results[i] = future.result()
+                done += sizes[i]
+                if progress is not None:
+                    progress(done, n_resamples)
+    else:
+        for i, (size, chunk_seed) in enumerate(zip(sizes, seeds)):
+            results[i] = chunk(*arguments, size, chunk_seed)
+            done += size
+            if progress is not None:
+                progress(done, n_resamples)
+
+    permuted = np.concatenate([r[0] for r in results])
+    bootstrapped = np.concatenate([r[1] for r in results])
+    alpha = (1 - confidence) / 2
+    ci_low, ci_high = np.quantile(bootstrapped, [alpha, 1 - alpha])
+    # Two-sided, with the +1 correction so p is never exactly zero
+    extreme = np.abs(permuted) >= abs(test_difference) - 1e-12
+    p_value = (1 + int(extreme.sum())) / (n_resamples + 1)
+
+    return ResamplingResult(
+        statistic=statistic,
+        n1=len(values1),
+        n2=len(values2),
+        observed=observed_difference,
+        ci_low=float(ci_low),
+        ci_high=float(ci_high),
+        confidence=confidence,
+        p_value=p_value,
+        n_resamples=n_resamples,
+        seed=seed,
+        support_size=len(support),
+        binned=binned,
+        permuted=permuted,
+    )
@@ -0,0 +1,212 @@
+"""
+All-pairs statistical screening.
+
+Runs ANOVA and Kruskal-Wallis for every categorical x numeric pair and a
+chi-square test with Cramér's V for every categorical x categorical pair,
+then applies Benjamini-Hochberg FDR correction across all tests. Categorical
+columns are reduced to integer codes once, contingency tables come from
+np.bincount, and the per-column work is spread over a process pool when the
+data is large enough to be worth it.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from core.dtypes import text_columns
+from core.instrumentation import timed
+from core.statistics import GroupMoments, anova_batch, chi_square, tied_ranks
+
+# Categorical columns with more levels than this are skipped (free text, IDs)
+MAX_LEVELS = 50
+
+# Levels seen fewer times than this are left out of the tests (stray labels, typos)
+MIN_LEVEL_COUNT = 5
+
+# Below this many row x task units the pool costs more than it saves
+PARALLEL_MIN_WORK = 2_000_000
+
+# False discovery rate at which tests are flagged significant
+DEFAULT_ALPHA = 0.05
+
+# Result columns, followed by the significance flag named by significance_column()
+SCREENING_COLUMNS = ['Test', 'Variable 1', 'Variable 2', 'Statistic', 'P-Value', 'Q-Value (FDR)',
+                     'Effect Size', 'Effect Measure', 'N']
+
+# Data shared with worker processes, set once per worker by _init_worker
+_payload = None
+
+
+def significance_column(alpha=DEFAULT_ALPHA):
+    """Name of the results column flagging tests significant at FDR level alpha, e.g. 'Significant (FDR 5%)'."""
+    return f"Significant (FDR {alpha * 100:g}%)"
+
+
+def screening_columns(df, max_levels=MAX_LEVELS):
+    """(categorical, numeric) columns eligible for screening."""
+    categorical = [col for col in text_columns(df) if 2 <= df[col].nunique() <= max_levels]
+    numeric = [col for col in df.select_dtypes(include=[np.number]).columns
+               if not pd.api.types.is_bool_dtype(df[col]) and df[col].notna().sum() > 2]
+    return categorical, numeric
+
+
+def kept_levels(counts, min_count=MIN_LEVEL_COUNT):
+    """Mask of the levels that take part in the tests: those seen at least min_count times."""
+    return np.asarray(counts) >= min_count
+
+
+def drop_rare_levels(table, counts1, counts2, min_count=MIN_LEVEL_COUNT):
+    """
+    Contingency table without the rows and columns of rare levels, as screening leaves them out.
+
+    counts1 and counts2 are the value counts of the row and column variables.
+    Returns (table, {variable: [excluded levels]}).
+    """
+    excluded = {}
+    for axis, counts in ((0, counts1), (1, counts2)):
+        counts = counts[counts > 0]
+        rare = counts.index[~kept_levels(counts, min_count)]
+        excluded[table.axes[axis].name] = [str(level) for level in rare]
+        table = table.drop(labels=rare, axis=axis, errors='ignore')
+    return table.loc[table.sum(axis=1) > 0, table.sum(axis=0) > 0], excluded
+
+
+def encode(df, categorical, numeric, min_count=MIN_LEVEL_COUNT):
+    """Integer codes for categorical columns (rare levels coded -1) and a float matrix for numeric ones."""
+    codes = {}
+    for col in categorical:
+        col_codes, labels = pd.factorize(df[col], sort=True)
+        counts = np.bincount(col_codes[col_codes >= 0], minlength=len(labels))
+        keep = kept_levels(counts, min_count)
+        remap = np.where(keep, np.cumsum(keep) - 1, -1).astype(np.int32)
+        remap = np.append(remap, np.int32(-1))  # index -1 (missing) stays missing
+        codes[col] = (remap[col_codes], int(keep.sum()))
+    values = df[numeric].to_numpy(dtype=np.float64) if numeric else np.empty((len(df), 0))
+    # Sort each numeric column once; every Kruskal test then ranks a subset in O(n)
+    orders = [np.argsort(values[:, j], kind='stable')[:int((~np.isnan(values[:, j])).sum())]
+              for j in range(values.shape[1])]
+    return {'codes': codes, 'values': values, 'orders': orders,
+            'numeric': list(numeric), 'categorical': list(categorical)}
+
+
+def _init_worker(payload):
+    global _payload
+    _payload = payload
+
+
+def _kruskal(codes, n_groups, values):
+    """Kruskal-Wallis H and p-value (tie-corrected) from values already in ascending order."""
+    n = len(values)
+    ranks, ties = tied_ranks(values)
+
+    group_n = np.bincount(codes, minlength=n_groups)
+    rank_sums = np.bincount(codes, weights=ranks, minlength=n_groups)
+    present = group_n > 0
+    k = int(present.sum())
+    if k < 2:
+        return np.nan, np.nan
+
+    h = 12.0 / (n * (n + 1)) * (rank_sums[present] ** 2 / group_n[present]).sum() - 3 * (n + 1)
+    correction = 1 - (ties.astype(float) ** 3 - ties).sum() / (float(n) ** 3 - n)
+    if correction <= 0:
+        return np.nan, np.nan
+    h /= correction
+    return float(h), float(stats.chi2.sf(h, k - 1))
+
+
+def _screen_column(col, payload=None):
+    """All tests that have `col` as their first (categorical) variable."""
+    payload = payload or _payload
+    codes, n_groups = payload['codes'][col]
+    values = payload['values']
+    rows = []
+
+    # Categorical x numeric: ANOVA for all numerics in one batch, Kruskal per column
+    valid_group = codes >= 0
+    if payload['numeric']:
+        count = np.zeros((n_groups, len(payload['numeric'])))
+        mean = np.full_like(count, np.nan)
+        var = np.full_like(count, np.nan)
+        for j in range(len(payload['numeric'])):
+            valid = valid_group & ~np.isnan(values[:, j])
+            group_codes, column = codes[valid], values[valid, j]
+            n_g = np.bincount(group_codes, minlength=n_groups)
+            s_g = np.bincount(group_codes, weights=column, minlength=n_groups)
+            ss_g = np.bincount(group_codes, weights=column * column, minlength=n_groups)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                count[:, j] = n_g
+                mean[:, j] = s_g / n_g
+                var[:, j] = (ss_g - s_g * mean[:, j]) / (n_g - 1)
+        anova = anova_batch(GroupMoments(list(range(n_groups)), payload['numeric'], count, mean,
+                                         np.clip(var, 0, None)))
+
+        for j, num in enumerate(payload['numeric']):
+            result = anova.loc[num]
+            eta_squared = (result['F'] * result['df_between'] /
+                           (result['F'] * result['df_between'] + result['df_within'])) if result['df_within'] > 0 else np.nan
+            rows.append(('ANOVA', col, num, result['F'], result['p'], eta_squared, 'η²', int(result['n'])))
+
+            order = payload['orders'][j]
+            order = order[codes[order] >= 0]
+            n_valid = len(order)
+            h, p_value = _kruskal(codes[order], n_groups, values[order, j]) if n_valid > 2 else (np.nan, np.nan)
+            epsilon_squared = h / (n_valid - 1) if n_valid > 1 and not np.isnan(h) else np.nan
+            rows.append(('Kruskal-Wallis', col, num, h, p_value, epsilon_squared, 'ε²', n_valid))
+
+    # Categorical x categorical: pairs with every later categorical column
+    categorical = payload['categorical']
+    for other in categorical[categorical.index(col) + 1:]:
+        other_codes, n_other = payload['codes'][other]
+        valid = valid_group & (other_codes >= 0)
+        flat = codes[valid].astype(np.int64) * n_other + other_codes[valid]
+        table = np.bincount(flat, minlength=n_groups * n_other).reshape(n_groups, n_other)
+        table = table[table.sum(axis=1) > 0][:, table.sum(axis=0) > 0]
+        if min(table.shape) < 2:
+            continue
+        chi2, p_value, dof, _ = chi_square(table)
+        uncorrected, _, _, _ = chi_square(table, correction=False)
+        n = int(table.sum())
+        cramers_v = np.sqrt(uncorrected / (n * (min(table.shape) - 1)))
+        rows.append(('Chi-Square', col, other, chi2, p_value, cramers_v, "Cramér's V", n))
+
+    return rows
+
+
+def fdr_correct(p_values):
+    """Benjamini-Hochberg adjusted p-values; NaN stays NaN."""
+    p_values = np.asarray(p_values, dtype=float)
+    adjusted = np.full_like(p_values, np.nan)
+    valid = ~np.isnan(p_values)
+    if valid.any():
+        adjusted[valid] = stats.false_discovery_control(p_values[valid], method='bh')
+    return adjusted
+
+
+@timed(kind='test')
+def run_screening(df, max_workers=None, alpha=DEFAULT_ALPHA, max_levels=MAX_LEVELS, min_count=MIN_LEVEL_COUNT):
+    """Screen every eligible column pair. Returns one results frame sorted by q-value."""
+    columns = SCREENING_COLUMNS + [significance_column(alpha)]
+    categorical, numeric = screening_columns(df, max_levels)
+    if not categorical:
+        return pd.DataFrame(columns=columns)
+
+    payload = encode(df, categorical, numeric, min_count)
+    work = len(df) * len(categorical) * max(len(numeric), 1)
+    max_workers = max_workers or min(len(categorical), os.cpu_count() or 1)
+
+    if max_workers > 1 and work >= PARALLEL_MIN_WORK:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(payload,)) as pool:
+            batches = list(pool.map(_screen_column, categorical))
+    else:
+        batches = [_screen_column(col, payload) for col in categorical]
+
+    rows = [row for batch in batches for row in batch]
+    results = pd.DataFrame(rows, columns=['Test', 'Variable 1', 'Variable 2', 'Statistic', 'P-Value',
+                                          'Effect Size', 'Effect Measure', 'N'])
+    results['Q-Value (FDR)'] = fdr_correct(results['P-Value'])
+    results[columns[-1]] = results['Q-Value (FDR)'] < alpha
+    return results[columns].sort_values('Q-Value (FDR)', na_position='last').reset_index(drop=True)
@@ -0,0 +1,131 @@
+"""
+Columnar on-disk snapshot of the parsed dataset.
+
+After the first parse, load_data() writes the typed frame as an Arrow IPC
+(Feather v2) file. Later loads memory-map that file instead of re-parsing the
+CSV. Numeric columns are stored without null bitmaps (NaN stays a value), so
+they convert to pandas without a copy and stay backed by the mapped file:
+every worker pointing at the same cache directory shares those pages through
+the OS page cache. Categorical codes (one byte per row) are still copied.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # pyarrow is optional, snapshots are skipped without it
+    pa = None
+    feather = None
+
+# Bump when the parse logic changes so old snapshots are not reused
+SNAPSHOT_VERSION = 5
+
+CACHE_DIR = os.environ.get(
+    "BLOOD_CANCER_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache")
+)
+
+_HASH_BLOCK_SIZE = 4 * 1024 * 1024
+
+# Content hashes already computed in this process, keyed by (path, size, mtime)
+_content_hashes = {}
+
+
+def snapshots_available():
+    """Return True when pyarrow is installed."""
+    return feather is not None
+
+
+def file_content_hash(file_path):
+    """Hash the file contents in fixed-size blocks."""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(file_path, "rb") as handle:
+        for block in iter(lambda: handle.read(_HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_fingerprint(file_path, **params):
+    """Build the snapshot key from file size, mtime, content hash and parse parameters."""
+    stat = os.stat(file_path)
+    hash_key = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+    if hash_key not in _content_hashes:
+        _content_hashes[hash_key] = file_content_hash(file_path)
+
+    payload = {
+        "version": SNAPSHOT_VERSION,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "content": _content_hashes[hash_key],
+        "params": params,
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:32]
+
+
+def snapshot_path(key, cache_dir=None):
+    """Location of the snapshot file for a fingerprint."""
+    return os.path.join(cache_dir or CACHE_DIR, f"dataset-{key}.arrow")
+
+
+def read_snapshot(key, cache_dir=None):
+    """Memory-map a snapshot and return it as a DataFrame, or None on a miss."""
+    if not snapshots_available():
+        return None
+
+    path = snapshot_path(key, cache_dir)
+    if not os.path.exists(path):
+        return None
+
+    try:
+        table = feather.read_table(path, memory_map=True)
+        # One block per column so null-free numeric columns are views of the mapped file
+        return table.to_pandas(split_blocks=True, self_destruct=True)
+    except (OSError, pa.ArrowInvalid):
+        # Corrupt or truncated file: drop it so the next load rewrites it
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return None
+
+
+def _arrow_table(df):
+    """Arrow table of a frame with float columns kept as plain values, NaN included."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for i, col in enumerate(df.columns):
+        if pd.api.types.is_float_dtype(df[col]):
+            # from_pandas would turn NaN into nulls, and columns with nulls are copied on read
+            table = table.set_column(i, table.field(i), pa.array(df[col].to_numpy(), from_pandas=False))
+    return table
+
+
+def write_snapshot(key, df, cache_dir=None):
+    """Write a snapshot atomically. Returns the path, or None if it was not written."""
+    if not snapshots_available():
+        return None
+
+    cache_dir = cache_dir or CACHE_DIR
+    path = snapshot_path(key, cache_dir)
+    tmp_path = None
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write to a temp file and rename so concurrent replicas never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".arrow.tmp")
+        os.close(fd)
+        table = _arrow_table(df)
+        # Uncompressed so the file can be memory-mapped directly
+        feather.write_feather(table, tmp_path, compression="uncompressed")
+        os.replace(tmp_path, path)
+        return path
+    except (OSError, pa.ArrowException):
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return None
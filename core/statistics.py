@@ -0,0 +1,125 @@
+"""
+Closed-form statistical tests from grouped sufficient statistics.
+
+Tests are computed from per-group counts, means and variances (rolled up from
+the aggregate cube or taken in one grouped pass over the frame) rather than
+from the raw rows, and every test is vectorized across all variables at once.
+scipy is imported inside the tests, so modules that only need the moment
+helpers (the aggregate cube, incremental statistics) do not pay for it at import.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+# Per-group moments: arrays of shape (n_groups, n_variables)
+GroupMoments = namedtuple('GroupMoments', ['groups', 'variables', 'count', 'mean', 'var'])
+
+
+def group_moments(df, group_col, value_cols):
+    """Count, mean and sample variance of every value column per group, in one grouped pass."""
+    grouped = df.groupby(group_col, observed=True)[value_cols].agg(['count', 'mean', 'var'])
+    return GroupMoments(
+        groups=list(grouped.index),
+        variables=list(value_cols),
+        count=grouped.xs('count', axis=1, level=1)[value_cols].to_numpy(dtype=float),
+        mean=grouped.xs('mean', axis=1, level=1)[value_cols].to_numpy(dtype=float),
+        var=grouped.xs('var', axis=1, level=1)[value_cols].to_numpy(dtype=float),
+    )
+
+
+def anova_batch(moments):
+    """One-way ANOVA for every variable at once. Returns a frame indexed by variable."""
+    from scipy import stats
+    count = moments.count
+    present = count > 0
+    mean = np.where(present, moments.mean, 0.0)
+    var = np.nan_to_num(moments.var)
+
+    k = present.sum(axis=0)
+    n = count.sum(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        grand_mean = (count * mean).sum(axis=0) / n
+        ss_between = (count * (mean - grand_mean) ** 2).sum(axis=0)
+        ss_within = (np.clip(count - 1, 0, None) * var).sum(axis=0)
+        df_between = k - 1
+        df_within = n - k
+        f_stat = (ss_between / df_between) / (ss_within / df_within)
+
+    valid = (k >= 2) & (df_within > 0)
+    f_stat = np.where(valid, f_stat, np.nan)
+    p_value = np.where(valid, stats.f.sf(f_stat, df_between, df_within), np.nan)
+    return pd.DataFrame({'F': f_stat, 'p': p_value, 'groups': k, 'n': n,
+                         'df_between': df_between, 'df_within': df_within},
+                        index=moments.variables)
+
+
+def ttest_batch(moments, group1, group2):
+    """Student's two-sample t-test (pooled variance, as scipy.stats.ttest_ind) for every variable."""
+    from scipy import stats
+    i, j = moments.groups.index(group1), moments.groups.index(group2)
+    n1, n2 = moments.count[i], moments.count[j]
+    m1, m2 = moments.mean[i], moments.mean[j]
+    v1, v2 = moments.var[i], moments.var[j]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dof = n1 + n2 - 2
+        pooled = ((n1 - 1) * v1 + (n2 - 1) * v2) / dof
+        t_stat = (m1 - m2) / np.sqrt(pooled * (1 / n1 + 1 / n2))
+
+    valid = (n1 > 1) & (n2 > 1)
+    t_stat = np.where(valid, t_stat, np.nan)
+    p_value = np.where(valid, 2 * stats.t.sf(np.abs(t_stat), dof), np.nan)
+    return pd.DataFrame({'mean_1': m1, 'mean_2': m2, 'n_1': n1, 'n_2': n2, 't': t_stat, 'p': p_value},
+                        index=moments.variables)
+
+
+def largest_groups_ttest(stats, group_col, variables):
+    """
+    T-tests of every variable between the two largest groups of a column.
+
+    stats is an IncrementalStats (anything with value_counts and group_moments).
+    Returns (group 1, group 2, results), or None with fewer than two groups.
+    """
+    groups = stats.value_counts(group_col).index
+    if len(groups) < 2:
+        return None
+    group1, group2 = groups[0], groups[1]
+    return group1, group2, ttest_batch(stats.group_moments(group_col, variables), group1, group2)
+
+
+def tied_ranks(sorted_values):
+    """1-based ranks of values already in ascending order, ties averaged. Returns (ranks, tie group sizes)."""
+    n = len(sorted_values)
+    starts = np.flatnonzero(np.r_[True, sorted_values[1:] != sorted_values[:-1]])
+    ties = np.diff(np.r_[starts, n])
+    return np.repeat(starts + (ties + 1) / 2, ties), ties
+
+
+def contingency_table(a, b):
+    """Counts of every (a, b) pair, built from integer codes with one bincount."""
+    codes_a, labels_a = pd.factorize(a, sort=True)
+    codes_b, labels_b = pd.factorize(b, sort=True)
+    valid = (codes_a >= 0) & (codes_b >= 0)
+    flat = codes_a[valid].astype(np.int64) * len(labels_b) + codes_b[valid]
+    counts = np.bincount(flat, minlength=len(labels_a) * len(labels_b)).reshape(len(labels_a), len(labels_b))
+    return pd.DataFrame(counts, index=pd.Index(labels_a, name=getattr(a, 'name', None)),
+                        columns=pd.Index(labels_b, name=getattr(b, 'name', None)))
+
+
+def chi_square(table, correction=True):
+    """Pearson chi-square test of independence (Yates-corrected for 2x2, as scipy.stats.chi2_contingency)."""
+    from scipy import stats
+    observed = np.asarray(table, dtype=float)
+    total = observed.sum()
+    expected = np.outer(observed.sum(axis=1), observed.sum(axis=0)) / total
+    dof = (observed.shape[0] - 1) * (observed.shape[1] - 1)
+
+    diff = observed - expected
+    if correction and dof == 1:
+        diff = diff - np.sign(diff) * np.minimum(0.5, np.abs(diff))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        chi2 = float((diff ** 2 / expected).sum()) if dof > 0 else 0.0
+    p_value = float(stats.chi2.sf(chi2, dof)) if dof > 0 else 1.0
+    return chi2, p_value, dof, expected
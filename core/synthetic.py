@@ -0,0 +1,203 @@
+"""
+Synthetic patient cohorts in the registry extract's schema, at any size.
+
+Columns, column order and category vocabularies are those of the CSV, so a
+synthetic file goes through the same ingestion, cleaning and analysis code as
+the real one. Diagnosis drives the clinical values: age is normal and WBC and
+platelet counts are log-normal with per-diagnosis parameters (CLL and CML run
+high white counts, acute leukaemias low platelets), which gives the tests and
+charts real group differences to find. Rows are drawn in blocks of BLOCK_ROWS,
+every column in one vectorized call per block, and each block has its own
+seed. Blocks do not depend on the requested size or chunk size, so the first
+N rows are the same whatever the total size or chunking. Chunks are cut from
+the blocks, so 50M rows never need to be held in memory at once when written
+to disk.
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_SEED = 7
+
+# Bump when the generated rows change so cohort files cached on disk are rewritten
+COHORT_VERSION = 2
+
+# Rows per seeded block, the unit of reproducibility; changing it changes every cohort
+BLOCK_ROWS = 65_536
+
+# Default rows per yielded or written chunk
+CHUNK_ROWS = 1_000_000
+
+# Diagnosis -> (share, age mean, age sd, WBC median, WBC log-sd, platelets median, platelets log-sd)
+DIAGNOSIS_PROFILES = {
+    'CLL': (0.18, 70, 10, 40_000, 0.6, 160_000, 0.4),
+    'ALL': (0.175, 22, 18, 25_000, 0.9, 60_000, 0.7),
+    'CML': (0.167, 55, 15, 80_000, 0.7, 350_000, 0.5),
+    'Lymphoma': (0.164, 55, 18, 8_000, 0.4, 220_000, 0.35),
+    'AML': (0.16, 65, 15, 15_000, 1.0, 50_000, 0.7),
+    'Multiple Myeloma': (0.154, 68, 10, 6_000, 0.35, 180_000, 0.4),
+}
+
+AGE_RANGE = (1, 100)
+WBC_RANGE = (500, 500_000)
+PLATELET_RANGE = (5_000, 1_000_000)
+
+# Raw column -> {level: share}; shares below 1 leave the rest missing, as in the extract
+VOCABULARIES = {
+    'Gender': {'Male': 0.522, 'Female': 0.478},
+    'Treatment_Type(Chemotherapy, Radiation)': {
+        'Targeted Therapy': 0.203, 'Immunotherapy': 0.203, 'Chemotherapy': 0.2,
+        'Stem Cell Transplant': 0.199, 'Radiation': 0.195,
+    },
+    'Bone Marrow Aspiration(Positive / Negative / Not Done)': {'Negative': 0.34, 'Not Done': 0.335, 'Positive': 0.325},
+    'Serum Protein Electrophoresis (SPEP)(Normal / Abnormal)': {'Abnormal': 0.502, 'Normal': 0.498},
+    'Lymph Node Biopsy(Positive / Negative / Not Done)': {'Positive': 0.336, 'Not Done': 0.333, 'Negative': 0.331},
+    'Lumbar Puncture (Spinal Tap)': {'Not Done': 0.336, 'Negative': 0.334, 'Positive': 0.33},
+    'Treatment_Outcome': {'Cured': 0.345, 'Ongoing': 0.33, 'Deceased': 0.325},
+    'Genetic_Data(BCR-ABL, FLT3)': {'BCR-ABL': 0.274, 'FLT3': 0.247, 'TP53': 0.246},
+    'Side_Effects': {'Severe': 0.26, 'Moderate': 0.243, 'Mild': 0.241},
+    'Diagnosis_Result': {'Ruled Out': 0.353, 'Confirmed': 0.335, 'Suspected': 0.312},
+    'Comments': {
+        'Under Observation': 0.204, 'Critical': 0.204, 'Follow-up required': 0.202,
+        'Stable': 0.196, 'No additional notes': 0.194,
+    },
+}
+
+# Column order of the extract
+COHORT_COLUMNS = [
+    'Age',
+    'Gender',
+    'Cancer_Type(AML, ALL, CLL)',
+    'Treatment_Type(Chemotherapy, Radiation)',
+    'Bone Marrow Aspiration(Positive / Negative / Not Done)',
+    'Total WBC count(/cumm)',
+    'Serum Protein Electrophoresis (SPEP)(Normal / Abnormal)',
+    'Lymph Node Biopsy(Positive / Negative / Not Done)',
+    'Lumbar Puncture (Spinal Tap)',
+    'Platelet Count( (/cumm)',
+    'Treatment_Outcome',
+    'Genetic_Data(BCR-ABL, FLT3)',
+    'Side_Effects',
+    'Diagnosis_Result',
+    'Comments',
+]
+
+
+def _categorical(rng, shares, size):
+    """Draw a categorical column; the share left over by the levels becomes missing values."""
+    levels = list(shares)
+    p = np.array([shares[level] for level in levels])
+    missing = max(1.0 - p.sum(), 0.0)
+    codes = rng.choice(len(levels) + 1, size=size, p=np.append(p, missing) / (p.sum() + missing))
+    codes = np.where(codes == len(levels), -1, codes).astype(np.int8)
+    return pd.Categorical.from_codes(codes, categories=levels)
+
+
+def _lognormal(rng, medians, sigmas, bounds):
+    values = rng.lognormal(np.log(medians), sigmas)
+    return np.clip(np.rint(values), *bounds).astype(np.int32)
+
+
+def _draw(size, seed, block_index):
+    """size synthetic patients from the block's own generator, with the extract's column names."""
+    rng = np.random.default_rng([seed, block_index])
+    profiles = np.array([profile[1:] for profile in DIAGNOSIS_PROFILES.values()], dtype=np.float64)
+    shares = np.array([profile[0] for profile in DIAGNOSIS_PROFILES.values()])
+
+    diagnosis = rng.choice(len(DIAGNOSIS_PROFILES), size=size, p=shares / shares.sum())
+    age_mean, age_sd, wbc_median, wbc_sigma, platelet_median, platelet_sigma = profiles[diagnosis].T
+    age = np.clip(np.rint(rng.normal(age_mean, age_sd)), *AGE_RANGE).astype(np.int8)
+
+    columns = {
+        'Age': age,
+        'Cancer_Type(AML, ALL, CLL)': pd.Categorical.from_codes(diagnosis.astype(np.int8), list(DIAGNOSIS_PROFILES)),
+        'Total WBC count(/cumm)': _lognormal(rng, wbc_median, wbc_sigma, WBC_RANGE),
+        'Platelet Count( (/cumm)': _lognormal(rng, platelet_median, platelet_sigma, PLATELET_RANGE),
+    }
+    for col, vocabulary in VOCABULARIES.items():
+        columns[col] = _categorical(rng, vocabulary, size)
+    return pd.DataFrame({col: columns[col] for col in COHORT_COLUMNS})
+
+
+def cohort_block(block_index, seed=DEFAULT_SEED):
+    """Rows block_index * BLOCK_ROWS up to (block_index + 1) * BLOCK_ROWS of every cohort of this seed."""
+    return _draw(BLOCK_ROWS, seed, block_index)
+
+
+def empty_cohort():
+    return _draw(0, DEFAULT_SEED, 0)
+
+
+def cohort_chunks(n_rows, seed=DEFAULT_SEED, chunk_rows=CHUNK_ROWS):
+    """Yield the first n_rows rows of the cohort in chunks of chunk_rows rows (the last may be shorter)."""
+    pending, held = [], 0
+    for index in range(-(-n_rows // BLOCK_ROWS)):
+        # A partial last block is drawn whole and cut, since a shorter draw would give different rows
+        block = cohort_block(index, seed).iloc[:n_rows - index * BLOCK_ROWS]
+        pending.append(block)
+        held += len(block)
+        if held < chunk_rows:
+            continue
+        rows = pd.concat(pending, ignore_index=True)
+        full = len(rows) // chunk_rows * chunk_rows
+        for start in range(0, full, chunk_rows):
+            yield rows.iloc[start:start + chunk_rows].reset_index(drop=True)
+        pending, held = [rows.iloc[full:]], len(rows) - full
+    if held:
+        yield pd.concat(pending, ignore_index=True)
+
+
+def generate_cohort(n_rows, seed=DEFAULT_SEED, chunk_rows=CHUNK_ROWS):
+    """A synthetic cohort of n_rows patients as one frame."""
+    chunks = list(cohort_chunks(n_rows, seed, chunk_rows))
+    if not chunks:
+        return empty_cohort()
+    return pd.concat(chunks, ignore_index=True)
+
+
+def write_cohort_csv(path, n_rows, seed=DEFAULT_SEED, chunk_rows=CHUNK_ROWS, progress=None):
+    """
+    Write a synthetic cohort as CSV, one chunk at a time. Returns the path.
+
+    Written to a temporary name and renamed, so a partial file is never mistaken for a cohort.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    written = 0
+    try:
+        with open(tmp_path, 'w', encoding='utf-8', newline='') as handle:
+            for chunk in cohort_chunks(n_rows, seed, chunk_rows):
+                chunk.to_csv(handle, header=written == 0, index=False)
+                written += len(chunk)
+                if progress is not None:
+                    progress(written / n_rows, written)
+            if written == 0:
+                empty_cohort().to_csv(handle, index=False)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a synthetic patient cohort in the extract's CSV schema.")
+    parser.add_argument("--rows", type=int, required=True, help="number of patients")
+    parser.add_argument("--out", required=True, help="CSV file to write")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    args = parser.parse_args(argv)
+
+    write_cohort_csv(args.out, args.rows, args.seed,
+                     progress=lambda fraction, rows: print(f"\r{rows:,} rows ({fraction:.0%})", end="", flush=True))
+    print(f"\nWrote {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,14 +7,20 @@ Data Visualization Elective - Semester Project
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.graph_objects as go
-import plotly.express as px
-import seaborn as sns
-import matplotlib.pyplot as plt
-from scipy import stats
-import os
-from datetime import datetime
+from importlib import import_module
 from io import BytesIO
+from uuid import uuid4
+
+from core.aggregates import build_cube
+from core.cleaning import DEFAULT_CLEANING_OPTIONS, clean_frame, options_key
+from core.dataset import COLUMN_MAPPING, NUMERIC_COLUMNS, dataset_version, find_data_file, read_dataset
+from core.dataset_store import STORE, private_bytes, process_rss_bytes
+from core.incremental import append_rows, batch_version
+from core.ingestion import prepare_chunk
+from core.instrumentation import ENABLED as PERF_ENABLED, finish_run, span, start_run, timed
+from core.figure_cache import FIGURES
+from core.filters import CATEGORICAL_FILTER_COLUMNS, RANGE_FILTER_COLUMNS, SELECTIONS
+from views.session import dataset_cube, dataset_stats, get_artifacts, get_cube, get_filter_index, get_filtered_df
 
 # Page Configuration
 st.set_page_config(
@@ -38,111 +44,120 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # ==================== DATA LOADING ====================
-@st.cache_data
-def load_data():
-    """Load dataset with realistic missing values."""
-    file_path = "Blood Cancer Diseases dataset  - Sheet1.csv"
-    
-    if not os.path.exists(file_path):
-        file_path = r"c:\Users\User\Desktop\assignment\Assignment\Blood Cancer Diseases dataset  - Sheet1.csv"
+
+@timed(kind='data')
+def load_data(_progress=None):
+    """Load dataset with realistic missing values into the shared store, reusing the on-disk snapshot when fresh."""
+    file_path = find_data_file()
     
-    if not os.path.exists(file_path):
+    if file_path is None:
         return None
     
     try:
-        df = pd.read_csv(file_path)
-        
-        # Map actual column names to simplified names for consistent code usage
-        column_mapping = {
-            'Age': 'Age',  # Already correct
-            'Gender': 'Gender',  # Already correct
-            'Total WBC count(/cumm)': 'WBC',
-            'Cancer_Type(AML, ALL, CLL)': 'Diagnosis',
-            'Treatment_Type(Chemotherapy, Radiation)': 'Treatment',
-            'Platelet Count( (/cumm)': 'Platelets',
-            'Treatment_Outcome': 'Treatment_Outcome',
-            'Diagnosis_Result': 'Diagnosis_Result',
-            'Genetic_Data(BCR-ABL, FLT3)': 'Genetic_Data',
-            'Side_Effects': 'Side_Effects'
-        }
-        
-        # Only rename columns that exist
-        rename_dict = {k: v for k, v in column_mapping.items() if k in df.columns}
-        df = df.rename(columns=rename_dict)
-        
-        # Add missing columns if needed (for code compatibility)
-        if 'RBC' not in df.columns:
-            df['RBC'] = np.nan
-        if 'Hemoglobin' not in df.columns:
-            df['Hemoglobin'] = np.nan
-        
-        # Convert numeric columns
-        numeric_cols = ['WBC', 'RBC', 'Hemoglobin', 'Platelets', 'Age']
-        for col in numeric_cols:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-        
-        # Introduce realistic missing values
-        np.random.seed(42)
-        n_rows = len(df)
-        
-        if 'WBC' in df.columns:
-            missing_idx = np.random.choice(df.index, size=int(n_rows * 0.05), replace=False)
-            df.loc[missing_idx, 'WBC'] = np.nan
-        
-        if 'RBC' in df.columns:
-            missing_idx = np.random.choice(df.index, size=int(n_rows * 0.07), replace=False)
-            df.loc[missing_idx, 'RBC'] = np.nan
-        
-        if 'Hemoglobin' in df.columns:
-            missing_idx = np.random.choice(df.index, size=int(n_rows * 0.06), replace=False)
-            df.loc[missing_idx, 'Hemoglobin'] = np.nan
-        
-        if 'Platelets' in df.columns:
-            missing_idx = np.random.choice(df.index, size=int(n_rows * 0.08), replace=False)
-            df.loc[missing_idx, 'Platelets'] = np.nan
-        
-        if 'Treatment' in df.columns:
-            missing_idx = np.random.choice(df.index, size=int(n_rows * 0.03), replace=False)
-            df.loc[missing_idx, 'Treatment'] = np.nan
-        
-        if 'Gender' in df.columns:
-            missing_idx = np.random.choice(df.index, size=int(n_rows * 0.02), replace=False)
-            df.loc[missing_idx, 'Gender'] = np.nan
-        
-        return df
+        version = dataset_version(file_path)
+        # One shared read-only frame per dataset version for the whole process
+        return STORE.get_or_build(('raw', version), lambda: read_dataset(file_path, version, progress=_progress))
     except Exception as e:
         st.error(f"Error loading data: {e}")
         return None
 
-def clean_data(df):
-    """Enhanced data cleaning."""
-    df = df.copy()
-    cleaning_report = {}
-    
-    # Remove duplicates
-    duplicates_before = len(df)
-    df = df.drop_duplicates()
-    cleaning_report['duplicates_removed'] = duplicates_before - len(df)
-    
-    # Handle missing values
-    numeric_cols = df.select_dtypes(include=[np.number]).columns
-    for col in numeric_cols:
-        if df[col].isnull().any():
-            df[col] = df[col].fillna(df[col].median())
-    
-    text_cols = df.select_dtypes(include=['object']).columns
-    for col in text_cols:
-        if df[col].isnull().any():
-            fill_value = df[col].mode()[0] if len(df[col].mode()) > 0 else 'Unknown'
-            df[col] = df[col].fillna(fill_value)
-    
-    cleaning_report['missing_handled'] = True
-    
-    return df, cleaning_report
+CLEANING_OPTIONS = DEFAULT_CLEANING_OPTIONS
+
+def clean_key(dataset_version, options=CLEANING_OPTIONS):
+    """Store key of the cleaned variant of a dataset version."""
+    return ('clean', dataset_version, options_key(options))
+
+def load_clean_data(df, options=CLEANING_OPTIONS):
+    """Cleaned variant of a loaded dataset, built once per (dataset version, cleaning options)."""
+    key = clean_key(df.attrs['dataset_version'], options)
+    return STORE.get_or_build(key, lambda: clean_data(df, options)[0])
+
+@timed(kind='data')
+def clean_data(df, options=CLEANING_OPTIONS):
+    """Enhanced data cleaning. Returns the cleaned frame and a detailed cleaning report."""
+    return clean_frame(df, options)
+
+def parse_batch(data):
+    """Parse an uploaded CSV batch with the same column mapping as the main dataset (no simulated gaps)."""
+    batch = prepare_chunk(pd.read_csv(BytesIO(data)), COLUMN_MAPPING, NUMERIC_COLUMNS)
+    for col in NUMERIC_COLUMNS:
+        if col not in batch.columns:
+            batch[col] = np.nan
+    return batch
+
+@timed(kind='data')
+def append_batch(df, data):
+    """Append a batch of new patients to a raw dataset version. Returns the new store key.
+    
+    The combined frame is a new version; its cube and statistics are merged from the
+    parent's and the batch's, so they cost time proportional to the batch. The frame
+    itself is copied whole, and the filter and rank indexes are rebuilt over all rows
+    when first used, so those still cost time proportional to the history.
+    """
+    parent_key = ('raw', df.attrs['dataset_version'])
+    version = batch_version(parent_key[1], data)
+    key = ('raw', version)
+    
+    batch = parse_batch(data)
+    batch = batch.reindex(columns=df.columns.union(batch.columns, sort=False))
+    
+    def build():
+        combined = append_rows(STORE.get(parent_key), batch)
+        combined.attrs['dataset_version'] = version
+        return combined
+    
+    STORE.get_or_build(key, build)
+    STORE.get_or_build(('cube',) + key, lambda: dataset_cube(parent_key).merge(build_cube(batch)))
+    STORE.get_or_build(('stats',) + key, lambda: dataset_stats(parent_key).appended(batch))
+    return key
+
+@timed('filters', kind='widget')
+def show_filter_panel():
+    """Sidebar cohort filters backed by the filter index."""
+    index = get_filter_index()
+    filters = {}
+    
+    with st.sidebar.expander("🔎 Filters", expanded=bool(st.session_state.get('filter_key'))):
+        for col in CATEGORICAL_FILTER_COLUMNS:
+            if col not in index.bitmaps:
+                continue
+            options = sorted(index.values(col), key=str)
+            widget_key = f"filter_{col}"
+            if widget_key in st.session_state:
+                # Cleaning can rename labels, keep only selections that still exist
+                st.session_state[widget_key] = [v for v in st.session_state[widget_key] if v in options]
+            filters[col] = st.multiselect(col, options, key=widget_key, placeholder="All")
+        
+        for col in RANGE_FILTER_COLUMNS:
+            if col not in index.sorted_index:
+                continue
+            low, high = index.bounds(col)
+            if low >= high:
+                continue
+            widget_key = f"filter_{col}"
+            if widget_key in st.session_state:
+                selected_low, selected_high = st.session_state[widget_key]
+                st.session_state[widget_key] = (max(low, min(selected_low, high)), min(high, max(selected_high, low)))
+                filters[col] = st.slider(col, low, high, key=widget_key)
+            else:
+                filters[col] = st.slider(col, low, high, (low, high), key=widget_key)
+        
+        st.session_state['filter_key'] = index.normalize(filters)
+        if st.session_state['filter_key']:
+            st.caption(f"Showing {len(get_filtered_df()):,} of {index.n_rows:,} patients")
 
 # ==================== PAGE FUNCTIONS ====================
 
+# Pages other than Home live in views/ and are imported on first visit, so their
+# plotting and statistics dependencies stay out of the dashboard's cold start
+PAGES = {
+    "📊 Data Overview": ("views.overview", "show_data_overview"),
+    "📈 Visualizations": ("views.visualizations", "show_visualizations"),
+    "🧪 Statistical Analysis": ("views.statistics", "show_statistical_analysis"),
+    "📥 Export": ("views.export", "show_export"),
+}
+
+@timed(kind='page')
 def show_home():
     """Home page."""
     st.markdown('<h1 class="main-header">🩸 Blood Cancer Analysis Dashboard</h1>', unsafe_allow_html=True)
@@ -184,462 +199,37 @@ def show_home():
     if st.session_state.get('data_cleaned', False):
         st.success("✅ Data cleaning completed successfully!")
     
-    # Dashboard metrics
+    # Dashboard metrics (answered from the aggregate cube)
     if st.session_state.get('df') is not None:
-        df = st.session_state['df']
+        cube = get_cube()
         
         col1, col2, col3, col4, col5 = st.columns(5)
         
         with col1:
-            st.metric("📊 Total Patients", f"{len(df):,}")
+            st.metric("📊 Total Patients", f"{cube.n_rows:,}")
         with col2:
-            st.metric("📋 Variables", len(df.columns))
+            st.metric("📋 Variables", cube.n_columns)
         with col3:
-            if 'Diagnosis' in df.columns:
-                st.metric("🩺 Cancer Types", df['Diagnosis'].nunique())
+            if 'Diagnosis' in cube.dimensions:
+                st.metric("🩺 Cancer Types", cube.nunique('Diagnosis'))
         with col4:
-            if 'Age' in df.columns:
-                st.metric("👥 Avg Age", f"{df['Age'].mean():.1f} yrs")
+            if 'Age' in cube.measures:
+                st.metric("👥 Avg Age", f"{cube.mean('Age'):.1f} yrs")
         with col5:
-            st.metric("✨ Data Quality", f"{100 - (df.isnull().sum().sum() / (len(df) * len(df.columns)) * 100):.1f}%")
-
-def show_data_overview():
-    """Data overview page."""
-    st.markdown('<h2 class="section-header">📊 Data Overview & Exploration</h2>', unsafe_allow_html=True)
-    
-    if not st.session_state.get('data_loaded', False):
-        st.warning("⚠️ Please load the dataset first using the sidebar button.")
-        return
-    
-    df = st.session_state.get('df')
-    
-    # Dataset preview with toggle
-    if st.checkbox("📋 Show Dataset Preview", value=True):
-        st.markdown("### First 15 Rows")
-        st.dataframe(df.head(15), width='stretch', height=400)
-    
-    # Column information
-    if st.checkbox("ℹ️ Show Column Information"):
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("### Numeric Columns")
-            numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-            for col in numeric_cols:
-                st.write(f"• {col}: {df[col].dtype}")
-        
-        with col2:
-            st.markdown("### Categorical Columns")
-            cat_cols = df.select_dtypes(include=['object']).columns.tolist()
-            for col in cat_cols:
-                st.write(f"• {col}: {df[col].nunique()} unique values")
-    
-    # Interactive statistics
-    if st.checkbox("📊 Show Statistical Summary"):
-        if st.button("🔄 Generate Statistics", key="gen_stats"):
-            st.dataframe(df.describe(), width='stretch')
-
-def show_visualizations():
-    """Advanced visualizations page."""
-    st.markdown('<h2 class="section-header">📈 Advanced Data Visualizations</h2>', unsafe_allow_html=True)
-    
-    if not st.session_state.get('data_loaded', False):
-        st.warning("⚠️ Please load the dataset first.")
-        return
-    
-    df = st.session_state.get('df')
-    
-    # Visualization categories
-    viz_type = st.selectbox("Select Visualization Category", 
-                           ["📊 Distribution Plots", "🔗 Relationship Analysis", 
-                            "📉 Comparison Charts", "🎯 Advanced 3D & Animated"])
-    
-    if viz_type == "📊 Distribution Plots":
-        show_distribution_plots(df)
-    elif viz_type == "🔗 Relationship Analysis":
-        show_relationship_analysis(df)
-    elif viz_type == "📉 Comparison Charts":
-        show_comparison_charts(df)
-    elif viz_type == "🎯 Advanced 3D & Animated":
-        show_advanced_plots(df)
-
-def show_distribution_plots(df):
-    """Distribution visualization section."""
-    st.markdown("### 📊 Distribution Analysis")
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        if st.button("🎨 Age Distribution Histogram", key="age_hist"):
-            if 'Age' in df.columns:
-                fig = px.histogram(df, x='Age', nbins=40,
-                                 title='Patient Age Distribution',
-                                 color_discrete_sequence=['#636EFA'],
-                                 marginal='box')
-                fig.update_layout(showlegend=False, height=500)
-                st.plotly_chart(fig, width='stretch')
-        
-        if st.button("📈 Age Distribution Line Graph", key="age_line"):
-            if 'Age' in df.columns:
-                # Create age frequency data
-                age_counts = df['Age'].value_counts().sort_index()
-                
-                fig = go.Figure()
-                fig.add_trace(go.Scatter(
-                    x=age_counts.index,
-                    y=age_counts.values,
-                    mode='lines+markers',
-                    name='Patient Count',
-                    line=dict(color='#636EFA', width=3),
-                    marker=dict(size=6, color='#636EFA')
-                ))
-                fig.update_layout(
-                    title='Patient Age Distribution (Line Graph)',
-                    xaxis_title='Age',
-                    yaxis_title='Count',
-                    height=500,
-                    showlegend=False,
-                    hovermode='x unified'
-                )
-                st.plotly_chart(fig, use_container_width=True)
-    
-    with col2:
-        if st.button("📊 Diagnosis Pie Chart", key="diag_pie"):
-            if 'Diagnosis' in df.columns:
-                fig = px.pie(df, names='Diagnosis',
-                           title='Cancer Type Distribution',
-                           hole=0.4,
-                           color_discrete_sequence=px.colors.qualitative.Set3)
-                fig.update_traces(textposition='inside', textinfo='percent+label')
-                st.plotly_chart(fig, width='stretch')
-    
-    col3, col4 = st.columns(2)
-    
-    with col3:
-        if st.button("🎯 WBC Distribution", key="wbc_dist"):
-            if 'WBC' in df.columns:
-                fig = px.violin(df, y='WBC',
-                              title='WBC Count Distribution',
-                              box=True,
-                              color_discrete_sequence=['#EF553B'])
-                st.plotly_chart(fig, width='stretch')
-    
-    with col4:
-        if st.button("📉 Hemoglobin KDE Plot", key="hgb_kde"):
-            if 'Hemoglobin' in df.columns:
-                fig = px.histogram(df, x='Hemoglobin',
-                                 marginal='violin',
-                                 title='Hemoglobin Distribution with KDE',
-                                 color_discrete_sequence=['#00CC96'])
-                st.plotly_chart(fig, width='stretch')
-
-def show_relationship_analysis(df):
-    """Relationship analysis section."""
-    st.markdown("### 🔗 Correlation & Relationships")
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        if st.button("🔥 Correlation Heatmap", key="corr_heat"):
-            numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-            if len(numeric_cols) >= 2:
-                corr_matrix = df[numeric_cols].corr()
-                
-                fig = go.Figure(data=go.Heatmap(
-                    z=corr_matrix.values,
-                    x=corr_matrix.columns,
-                    y=corr_matrix.columns,
-                    colorscale='RdBu',
-                    zmid=0,
-                    text=np.round(corr_matrix.values, 2),
-                    texttemplate='%{text}',
-                    textfont={"size": 10}
-                ))
-                fig.update_layout(title='Correlation Matrix', height=600)
-                st.plotly_chart(fig, width='stretch')
-    
-    with col2:
-        if st.button("📈 Age vs WBC Scatter", key="age_wbc_scatter"):
-            if all(col in df.columns for col in ['Age', 'WBC', 'Diagnosis']):
-                df_clean = df.dropna(subset=['Age', 'WBC', 'Diagnosis'])
-                if len(df_clean) > 0:
-                    size_col = 'Hemoglobin' if 'Hemoglobin' in df.columns else None
-                    df_clean_no_na = df_clean.dropna(subset=['Age', 'WBC']) if size_col else df_clean
-                    
-                    fig = px.scatter(df_clean_no_na, x='Age', y='WBC',
-                                   color='Diagnosis',
-                                   title='Age vs WBC by Diagnosis Type',
-                                   hover_data=['Diagnosis'])
-                    fig.update_layout(height=500)
-                    st.plotly_chart(fig, width='stretch')
-    
-    # Pairplot section
-    if st.button("🎨 Generate Pairplot (Numeric Variables)", key="pairplot"):
-        with st.spinner("Creating pairplot..."):
-            numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()[:4]  # Limit to 4 for performance
-            if len(numeric_cols) >= 2:
-                fig = px.scatter_matrix(df[numeric_cols].dropna(),
-                                      title='Pairwise Relationships',
-                                      height=800)
-                st.plotly_chart(fig, width='stretch')
-
-def show_comparison_charts(df):
-    """Comparison charts section."""
-    st.markdown("### 📉 Group Comparisons")
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        if st.button("📊 WBC by Diagnosis (Box)", key="wbc_box"):
-            if all(col in df.columns for col in ['Diagnosis', 'WBC']):
-                df_clean = df.dropna(subset=['Diagnosis', 'WBC'])
-                fig = px.box(df_clean, x='Diagnosis', y='WBC',
-                           title='WBC Levels Across Cancer Types',
-                           color='Diagnosis',
-                           points='outliers')
-                fig.update_layout(xaxis_tickangle=-45, showlegend=False)
-                st.plotly_chart(fig, width='stretch')
-    
-    with col2:
-        if st.button("🎻 Hemoglobin by Gender", key="hgb_gender"):
-            if all(col in df.columns for col in ['Gender', 'Hemoglobin']):
-                df_clean = df.dropna(subset=['Gender', 'Hemoglobin'])
-                fig = px.violin(df_clean, x='Gender', y='Hemoglobin',
-                              title='Hemoglobin Comparison by Gender',
-                              color='Gender',
-                              box=True,
-                              points='all')
-                st.plotly_chart(fig, width='stretch')
-    
-    col3, col4 = st.columns(2)
-    
-    with col3:
-        if st.button("📊 Treatment Outcome Sunburst", key="outcome_sun"):
-            if 'Treatment_Outcome' in df.columns and 'Diagnosis' in df.columns:
-                df_clean = df.dropna(subset=['Treatment_Outcome', 'Diagnosis'])
-                fig = px.sunburst(df_clean, path=['Treatment_Outcome', 'Diagnosis'],
-                                title='Treatment Outcomes by Diagnosis')
-                st.plotly_chart(fig, width='stretch')
-    
-    with col4:
-        if st.button("🎯 Risk Category Treemap", key="risk_tree"):
-            if 'Risk_Category' in df.columns and 'Diagnosis' in df.columns:
-                df_clean = df.dropna(subset=['Risk_Category', 'Diagnosis'])
-                fig = px.treemap(df_clean, path=['Risk_Category', 'Diagnosis'],
-                               title='Patient Distribution by Risk & Diagnosis')
-                st.plotly_chart(fig, width='stretch')
-
-def show_advanced_plots(df):
-    """Advanced 3D and animated plots."""
-    st.markdown("### 🎯 Advanced 3D & Animated Visualizations")
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        if st.button("🌐 3D Scatter Plot", key="3d_scatter"):
-            if all(col in df.columns for col in ['Age', 'WBC', 'Hemoglobin', 'Diagnosis']):
-                df_clean = df.dropna(subset=['Age', 'WBC', 'Hemoglobin', 'Diagnosis'])
-                fig = px.scatter_3d(df_clean, x='Age', y='WBC', z='Hemoglobin',
-                                  color='Diagnosis',
-                                  title='3D View: Age, WBC & Hemoglobin',
-                                  height=700)
-                st.plotly_chart(fig, width='stretch')
-    
-    with col2:
-        if st.button("📊 Animated Bubble Chart", key="bubble_anim"):
-            if all(col in df.columns for col in ['Age', 'WBC', 'Diagnosis']):
-                df_clean = df.dropna(subset=['Age', 'WBC', 'Diagnosis'])
-                if 'Platelets' in df.columns:
-                    df_clean = df_clean.dropna(subset=['Platelets'])
-                    fig = px.scatter(df_clean, x='Age', y='WBC',
-                                   size='Platelets',
-                                   color='Diagnosis',
-                                   title='Bubble Chart: Age vs WBC (bubble = Platelets)',
-                                   size_max=50,
-                                   height=600)
-                    st.plotly_chart(fig, width='stretch')
-    
-    # Parallel coordinates
-    if st.button("🌈 Parallel Coordinates Plot", key="parallel"):
-        if 'Diagnosis' in df.columns:
-            numeric_cols = ['Age', 'WBC', 'RBC', 'Hemoglobin', 'Platelets']
-            available_cols = [col for col in numeric_cols if col in df.columns]
-            
-            if len(available_cols) >= 3:
-                df_plot = df[available_cols + ['Diagnosis']].dropna()
-                if len(df_plot) > 500:
-                    df_plot = df_plot.sample(500)
-                
-                fig = px.parallel_coordinates(df_plot,
-                                            dimensions=available_cols,
-                                            color='Age',
-                                            title='Parallel Coordinates: Clinical Parameters',
-                                            color_continuous_scale=px.colors.sequential.Viridis)
-                st.plotly_chart(fig, width='stretch')
-
-def show_statistical_analysis():
-    """Statistical analysis page."""
-    st.markdown('<h2 class="section-header">🧪 Statistical Analysis & Testing</h2>', unsafe_allow_html=True)
-    
-    if not st.session_state.get('data_loaded', False):
-        st.warning("⚠️ Please load the dataset first.")
-        return
-    
-    df = st.session_state.get('df')
-    
-    tab1, tab2, tab3 = st.tabs(["📊 ANOVA Tests", "📈 T-Tests", "📉 Chi-Square Tests"])
-    
-    with tab1:
-        st.markdown("### Analysis of Variance (ANOVA)")
-        st.info("Tests if there are significant differences in means across different groups")
-        
-        if st.button("🔬 Run ANOVA Tests", key="run_anova", width='stretch', type="primary"):
-            with st.spinner("Performing ANOVA tests..."):
-                if 'Diagnosis' in df.columns:
-                    test_vars = ['Age', 'WBC', 'RBC', 'Hemoglobin', 'Platelets']
-                    results = []
-                    
-                    for var in test_vars:
-                        if var in df.columns:
-                            df_clean = df.dropna(subset=['Diagnosis', var])
-                            if len(df_clean) > 0:
-                                groups = [group[var].dropna().values for name, group in df_clean.groupby('Diagnosis') if len(group[var].dropna()) > 0]
-                                
-                                if len(groups) >= 2 and all(len(g) > 0 for g in groups):
-                                    try:
-                                        f_stat, p_value = stats.f_oneway(*groups)
-                                        results.append({
-                                            'Variable': var,
-                                            'F-Statistic': f"{f_stat:.4f}",
-                                            'P-Value': f"{p_value:.6f}",
-                                            'Significant (α=0.05)': '✅ Yes' if p_value < 0.05 else '❌ No',
-                                            'Effect': 'Strong' if p_value < 0.01 else 'Moderate' if p_value < 0.05 else 'None'
-                                        })
-                                    except Exception as e:
-                                        st.error(f"Error testing {var}: {str(e)}")
-                    
-                    if results:
-                        st.success(f"✅ Completed {len(results)} ANOVA tests")
-                        results_df = pd.DataFrame(results)
-                        st.dataframe(results_df, width='stretch')
-                        
-                        st.markdown("""
-                        **Interpretation:**
-                        - **P-value < 0.05**: Significant difference between groups
-                        - **P-value ≥ 0.05**: No significant difference
-                        - **F-statistic**: Higher values indicate greater between-group variance
-                        """)
-                    else:
-                        st.error("No valid tests could be performed")
-    
-    with tab2:
-        st.markdown("### Independent T-Tests")
-        st.info("Compares means between two groups")
-        
-        if st.button("🔬 Run Gender Comparison T-Tests", key="run_ttest", width='stretch', type="primary"):
-            with st.spinner("Performing t-tests..."):
-                if 'Gender' in df.columns:
-                    df_clean = df.dropna(subset=['Gender'])
-                    genders = df_clean['Gender'].unique()
-                    
-                    if len(genders) >= 2:
-                        gender1, gender2 = genders[0], genders[1]
-                        test_vars = ['Age', 'WBC', 'RBC', 'Hemoglobin', 'Platelets']
-                        results = []
-                        
-                        for var in test_vars:
-                            if var in df.columns:
-                                group1 = df_clean[df_clean['Gender'] == gender1][var].dropna()
-                                group2 = df_clean[df_clean['Gender'] == gender2][var].dropna()
-                                
-                                if len(group1) > 1 and len(group2) > 1:
-                                    t_stat, p_value = stats.ttest_ind(group1, group2)
-                                    results.append({
-                                        'Variable': var,
-                                        f'{gender1} Mean': f"{group1.mean():.2f}",
-                                        f'{gender2} Mean': f"{group2.mean():.2f}",
-                                        'T-Statistic': f"{t_stat:.4f}",
-                                        'P-Value': f"{p_value:.6f}",
-                                        'Significant': '✅ Yes' if p_value < 0.05 else '❌ No'
-                                    })
-                        
-                        if results:
-                            st.success(f"✅ Completed {len(results)} t-tests")
-                            st.dataframe(pd.DataFrame(results), width='stretch')
-    
-    with tab3:
-        st.markdown("### Chi-Square Tests")
-        st.info("Tests independence between categorical variables")
-        
-        if st.button("🔬 Run Chi-Square Test", key="run_chi", width='stretch', type="primary"):
-            with st.spinner("Performing chi-square test..."):
-                if all(col in df.columns for col in ['Gender', 'Risk_Category']):
-                    df_clean = df.dropna(subset=['Gender', 'Risk_Category'])
-                    contingency_table = pd.crosstab(df_clean['Gender'], df_clean['Risk_Category'])
-                    
-                    chi2, p_value, dof, expected = stats.chi2_contingency(contingency_table)
-                    
-                    col1, col2, col3 = st.columns(3)
-                    with col1:
-                        st.metric("Chi-Square Statistic", f"{chi2:.4f}")
-                    with col2:
-                        st.metric("P-Value", f"{p_value:.6f}")
-                    with col3:
-                        st.metric("Degrees of Freedom", dof)
-                    
-                    st.markdown("#### Contingency Table")
-                    st.dataframe(contingency_table, width='stretch')
-
-def show_export():
-    """Export page."""
-    st.markdown('<h2 class="section-header">📥 Export & Download</h2>', unsafe_allow_html=True)
-    
-    if not st.session_state.get('data_loaded', False):
-        st.warning("⚠️ Please load the dataset first.")
-        return
-    
-    df = st.session_state.get('df')
-    
-    st.markdown("### 📦 Download Data in Multiple Formats")
-    
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        csv = df.to_csv(index=False)
-        st.download_button(
-            label="📥 Download CSV",
-            data=csv,
-            file_name="blood_cancer_data.csv",
-            mime="text/csv",
-            width='stretch'
-        )
-    
-    with col2:
-        xlsx_buffer = BytesIO()
-        df.to_excel(xlsx_buffer, index=False, engine='openpyxl')
-        xlsx_buffer.seek(0)
-        st.download_button(
-            label="📊 Download Excel",
-            data=xlsx_buffer,
-            file_name="blood_cancer_data.xlsx",
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            width='stretch'
-        )
-    
-    with col3:
-        json_data = df.to_json(orient='records', indent=2)
-        st.download_button(
-            label="📋 Download JSON",
-            data=json_data,
-            file_name="blood_cancer_data.json",
-            mime="application/json",
-            width='stretch'
-        )
+            st.metric("✨ Data Quality", f"{cube.completeness():.1f}%")
 
 # ==================== MAIN ====================
 
-def main():
-    """Main application."""
+def session_memory_bytes():
+    """Bytes held privately by this session's frames, excluding data shared through the store."""
+    total = 0
+    raw_base = STORE.get(('raw', st.session_state['df_original'].attrs.get('dataset_version')))
+    total += private_bytes(st.session_state['df_original'], raw_base)
+    total += private_bytes(st.session_state['df'], STORE.get(st.session_state.get('df_key')))
+    return total
+
+def show_app(recorder=None):
+    """Sidebar workflow, navigation and the selected page."""
     
     # Initialize session state
     if 'data_loaded' not in st.session_state:
@@ -661,10 +251,19 @@ def main():
     if not st.session_state['data_loaded']:
         if st.sidebar.button("🔄 Load Dataset", width='stretch', type="primary"):
             with st.spinner("Loading dataset..."):
-                df = load_data()
+                progress_bar = st.sidebar.progress(0.0, text="Reading CSV...")
+                
+                def report_progress(fraction, rows_read):
+                    progress_bar.progress(fraction, text=f"Reading CSV... {rows_read:,} rows")
+                
+                df = load_data(_progress=report_progress)
+                progress_bar.empty()
                 if df is not None:
-                    st.session_state['df_original'] = df.copy()
-                    st.session_state['df'] = df.copy()
+                    # Sessions keep copy-on-write views of the shared frame, not copies
+                    raw_key = ('raw', df.attrs['dataset_version'])
+                    st.session_state['df_original'] = STORE.view(raw_key)
+                    st.session_state['df'] = STORE.view(raw_key)
+                    st.session_state['df_key'] = raw_key
                     st.session_state['data_loaded'] = True
                     st.sidebar.success("✅ Loaded!")
                     st.rerun()
@@ -675,14 +274,40 @@ def main():
         if not st.session_state['data_cleaned']:
             if st.sidebar.button("🧹 Clean Dataset", width='stretch', type="primary"):
                 with st.spinner("Cleaning..."):
-                    df_clean, _ = clean_data(st.session_state['df_original'])
-                    st.session_state['df'] = df_clean
+                    df_original = st.session_state['df_original']
+                    load_clean_data(df_original)
+                    key = clean_key(df_original.attrs['dataset_version'])
+                    st.session_state['df'] = STORE.view(key)
+                    st.session_state['df_key'] = key
                     st.session_state['data_cleaned'] = True
                     st.sidebar.success("✅ Cleaned!")
                     st.rerun()
         else:
             st.sidebar.success("✅ Data Cleaned")
         
+        # Append a batch of new patients without reloading the whole CSV
+        with st.sidebar.expander("➕ Append Patient Batch"):
+            uploaded = st.file_uploader("New records (CSV)", type=['csv'], key="batch_upload")
+            st.caption("Summary statistics and metrics are merged in time proportional to the batch; "
+                       "filters, rank correlations and row-level charts are rebuilt over all rows.")
+            if uploaded is not None and st.button("Append Batch", key="append_batch", width='stretch'):
+                with st.spinner("Appending batch..."):
+                    try:
+                        key = append_batch(st.session_state['df_original'], uploaded.getvalue())
+                    except Exception as e:
+                        st.error(f"Error appending batch: {e}")
+                    else:
+                        st.session_state['df_original'] = STORE.view(key)
+                        st.session_state['df'] = STORE.view(key)
+                        st.session_state['df_key'] = key
+                        if st.session_state['data_cleaned']:
+                            # Cleaning is a whole-frame pass (duplicates, fills), so it reruns on the new version
+                            load_clean_data(st.session_state['df_original'])
+                            key = clean_key(st.session_state['df_original'].attrs['dataset_version'])
+                            st.session_state['df'] = STORE.view(key)
+                            st.session_state['df_key'] = key
+                        st.rerun()
+        
         # Reset Button
         if st.sidebar.button("🔄 Reset", width='stretch'):
             for key in list(st.session_state.keys()):
@@ -694,30 +319,94 @@ def main():
     # Navigation
     page = st.sidebar.radio(
         "Navigation",
-        ["🏠 Home", "📊 Data Overview", "📈 Visualizations", "🧪 Statistical Analysis", "📥 Export"],
+        ["🏠 Home"] + list(PAGES),
         label_visibility="collapsed"
     )
+    if recorder is not None:
+        recorder.label = page
+    
+    # Cohort filters apply to every page
+    if st.session_state['data_loaded'] and st.session_state['df'] is not None:
+        show_filter_panel()
     
     # Quick Stats
     if st.session_state['data_loaded'] and st.session_state['df'] is not None:
         st.sidebar.markdown("---")
         st.sidebar.markdown("### 📊 Quick Stats")
-        df = st.session_state['df']
-        st.sidebar.metric("Records", f"{len(df):,}")
-        st.sidebar.metric("Variables", len(df.columns))
-        st.sidebar.metric("Missing", df.isnull().sum().sum())
+        cube = get_cube()
+        st.sidebar.metric("Records", f"{cube.n_rows:,}")
+        st.sidebar.metric("Variables", cube.n_columns)
+        st.sidebar.metric("Missing", cube.missing_total())
+        
+        artifacts = get_artifacts()
+        if artifacts is not None:
+            st.sidebar.caption(f"📦 Serving precomputed results from {artifacts.created}")
+        
+        st.sidebar.markdown("### 💾 Memory")
+        st.sidebar.metric("This Session", f"{session_memory_bytes() / 1024 ** 2:.2f} MB")
+        st.sidebar.metric("Shared Datasets", f"{(STORE.memory_bytes() + SELECTIONS.nbytes) / 1024 ** 2:.1f} MB")
+        rss = process_rss_bytes()
+        if rss is not None:
+            st.sidebar.metric("Process RSS", f"{rss / 1024 ** 2:.0f} MB")
+        
+        figure_stats = FIGURES.stats()
+        st.sidebar.metric("Figure Cache", f"{figure_stats['bytes'] / 1024 ** 2:.1f} MB")
+        st.sidebar.caption(f"{figure_stats['entries']} figures · {figure_stats['hits'] + figure_stats['disk_hits']} hits · "
+                           f"{figure_stats['misses']} misses · {figure_stats['hit_rate']:.0%} hit rate")
     
     # Route to pages
     if page == "🏠 Home":
         show_home()
-    elif page == "📊 Data Overview":
-        show_data_overview()
-    elif page == "📈 Visualizations":
-        show_visualizations()
-    elif page == "🧪 Statistical Analysis":
-        show_statistical_analysis()
-    elif page == "📥 Export":
-        show_export()
+    else:
+        module_name, function_name = PAGES[page]
+        with span('import_page', 'page'):
+            page_module = import_module(module_name)
+        with span(function_name, 'page'):
+            getattr(page_module, function_name)()
+
+def show_performance_panel(recorder):
+    """Optional per-rerun breakdown of where the time went."""
+    with st.sidebar.expander("⏱️ Performance", expanded=recorder is not None):
+        st.checkbox("Record reruns", value=PERF_ENABLED, key="perf_enabled")
+        if recorder is None:
+            st.caption("Times every page, data stage, test and chart of each rerun.")
+            return
+        
+        history = st.session_state.setdefault('perf_history', [])
+        history.append(recorder.seconds * 1000)
+        del history[:-20]
+        
+        st.metric("This Rerun", f"{recorder.seconds * 1000:,.0f} ms")
+        st.caption(" · ".join(f"{kind} {seconds * 1000:,.0f} ms" for kind, seconds in recorder.totals().items()))
+        spans = pd.DataFrame([{
+            'Span': '\u2003' * record.depth + record.name,
+            'Kind': record.kind,
+            'ms': record.seconds * 1000,
+            'Self ms': record.self_seconds * 1000,
+            'RSS Δ MB': record.rss_delta / 1024 ** 2 if record.rss_delta is not None else None,
+        } for record in recorder.records()])
+        if len(spans):
+            st.dataframe(spans, hide_index=True, width='stretch',
+                         column_config={col: st.column_config.NumberColumn(format="%.1f")
+                                        for col in ['ms', 'Self ms', 'RSS Δ MB']})
+        st.caption("Recent reruns: " + " · ".join(f"{ms:,.0f}" for ms in history) + " ms")
+
+def main():
+    """Main application."""
+    if 'perf_session' not in st.session_state:
+        st.session_state['perf_session'] = uuid4().hex[:8]
+    
+    # Nothing is recorded unless enabled; spans are then a context-variable lookup
+    recorder = None
+    if st.session_state.get('perf_enabled', PERF_ENABLED):
+        recorder = start_run("🏠 Home", session=st.session_state['perf_session'])
+    try:
+        show_app(recorder)
+    finally:
+        # Also runs when st.rerun() stops the script, so every rerun is logged
+        if recorder is not None:
+            finish_run(recorder)
+    show_performance_panel(recorder)
 
 if __name__ == "__main__":
     main()
@@ -1,405 +1,640 @@
-from docx import Document
-from docx.shared import Pt, RGBColor, Inches
-from docx.enum.text import WD_ALIGN_PARAGRAPH
+"""
+Generate PROJECT_REPORT.docx from the dataset.
+
+Every number, table and chart in the report is computed from the registry
+extract: dataset profile, cleaning metrics, descriptive statistics, ANOVA,
+t-tests, chi-square and correlations. Each part of the report declares the
+columns it reads and is cached under their fingerprint, so rerunning after a
+small data change only rebuilds the parts (and charts) that read a changed
+column. Chart images are rendered in parallel worker processes.
+
+Usage:
+    python generate_report.py [--output PROJECT_REPORT.docx] [--workers N] [--no-cache]
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import namedtuple
 from datetime import datetime
 
-# Create document
-doc = Document()
+from docx import Document
 
-# ==================== TITLE PAGE ====================
-title = doc.add_heading('Blood Cancer Analysis Dashboard', level=1)
-title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+from core.cleaning import clean_frame
+from core.correlation import pearson_matrix
+from core.dataset import TEST_VARIABLES, find_data_file, read_dataset
+from core.incremental import CoMoments
+from core.report import (
+    ReportCache, add_blocks, bullets, chart, chart_columns, column_fingerprints, fingerprint,
+    format_p, frequent_levels, heading, page_break, paragraph, render_charts, runs, table
+)
+from core.screening import MIN_LEVEL_COUNT
+from core.statistics import anova_batch, chi_square, contingency_table, group_moments, ttest_batch
 
-subtitle = doc.add_heading('Data Visualization & Interactive Dashboard Development', level=2)
-subtitle.alignment = WD_ALIGN_PARAGRAPH.CENTER
+ALPHA = 0.05
 
-subsubtitle = doc.add_heading('Semester Project - Data Visualization Elective', level=3)
-subsubtitle.alignment = WD_ALIGN_PARAGRAPH.CENTER
+# A cached part of the report: the columns it reads, the facts of other parts it reads,
+# and build(df, facts) -> (blocks, facts it contributes)
+Part = namedtuple('Part', ['name', 'columns', 'needs', 'build'])
 
-doc.add_paragraph()
 
-# Project Info
-doc.add_paragraph(f'Generated: {datetime.now().strftime("%B %d, %Y")}')
-doc.add_paragraph('Version: Extended (v2.0)')
-doc.add_paragraph('Project Type: Exploratory Data Analysis & Dashboard Development')
+def measured(df, variables=TEST_VARIABLES):
+    """Variables with at least two values (placeholder columns are left out)."""
+    return [v for v in variables if v in df.columns and df[v].notna().sum() >= 2]
 
-# ==================== TABLE OF CONTENTS ====================
-doc.add_page_break()
-doc.add_heading('Table of Contents', level=1)
-toc_items = [
-    '1. Executive Summary',
-    '2. Project Objectives and Questions',
-    '3. Dataset Description',
-    '4. Data Cleaning and Preparation',
-    '5. Exploratory Data Analysis (EDA)',
-    '6. Dashboard Features and Architecture',
-    '7. Key Findings and Insights',
-    '8. Conclusion and Recommendations'
-]
-for item in toc_items:
-    doc.add_paragraph(item, style='List Bullet')
 
-# ==================== 1. EXECUTIVE SUMMARY ====================
-doc.add_page_break()
-doc.add_heading('1. Executive Summary', level=1)
+def placeholders(df, variables=TEST_VARIABLES):
+    return [v for v in variables if v in df.columns and df[v].notna().sum() < 2]
 
-doc.add_paragraph(
-    'This project presents a comprehensive interactive dashboard for analyzing blood cancer patient demographics '
-    'and clinical characteristics. Using advanced data visualization techniques and statistical analysis, the dashboard '
-    'addresses six key objective questions about blood cancer patient populations.'
-)
-
-doc.add_heading('Project Highlights', level=2)
-highlights = [
-    'Dataset: 2,295 blood cancer patient records with 15 variables',
-    'Objective Questions: 6 specific research questions formulated and answered',
-    'Data Cleaning: 5-step automated pipeline with comprehensive quality metrics',
-    'Visualizations: 50+ interactive charts addressing all analysis dimensions',
-    'Dashboard Pages: 8 comprehensive pages for different analysis perspectives',
-    'Tools: Streamlit, Pandas, Plotly, and advanced statistical libraries',
-    'Deployment: Cloud-ready with Streamlit framework'
-]
-for highlight in highlights:
-    doc.add_paragraph(highlight, style='List Bullet')
 
-# ==================== 2. PROJECT OBJECTIVES ====================
-doc.add_page_break()
-doc.add_heading('2. Project Objectives and Questions', level=1)
+def frequent_rows(df, col):
+    """Rows whose value of col is one of its frequent levels."""
+    levels = frequent_levels(df[col]).index
+    subset = df[df[col].isin(levels)]
+    if hasattr(subset[col], 'cat'):
+        subset = subset.assign(**{col: subset[col].cat.remove_unused_categories()})
+    return subset
 
-doc.add_heading('Main Theme', level=2)
-doc.add_paragraph(
-    'Data Visualization and Interactive Analysis of Blood Cancer Patient Demographics and Clinical Characteristics'
-)
 
-doc.add_heading('Objective Questions', level=2)
-
-questions = [
-    ('Q1', 'What is the demographic distribution of blood cancer patients?',
-     'Understanding age, gender composition, and identification of high-risk groups'),
-    ('Q2', 'How do clinical lab values vary across different blood cancer diagnoses?',
-     'Identifying biomarkers and diagnostic significance of lab parameters'),
-    ('Q3', 'Is there a significant correlation between patient age and clinical lab parameters?',
-     'Determining age-related patterns and clinical implications'),
-    ('Q4', 'What are the most common blood cancer diagnoses and their clinical characteristics?',
-     'Comparing diagnostic distributions and clinical presentations'),
-    ('Q5', 'Are there gender-based differences in blood cancer diagnoses and presentations?',
-     'Identifying gender-specific patterns and clinical implications'),
-    ('Q6', 'What data quality and missing value patterns exist in the dataset?',
-     'Ensuring data integrity and identifying potential biases'),
-]
+def pct(part, whole):
+    return f"{part / whole * 100:.1f}%" if whole else 'n/a'
 
-for num, question, explanation in questions:
-    p = doc.add_paragraph()
-    p.add_run(f'{num}: {question}\n').bold = True
-    p.add_run(f'Purpose: {explanation}')
 
-# ==================== 3. DATASET DESCRIPTION ====================
-doc.add_page_break()
-doc.add_heading('3. Dataset Description', level=1)
-
-doc.add_heading('Dataset Overview', level=2)
-
-doc.add_paragraph('Name: Blood Cancer Diseases Dataset')
-doc.add_paragraph('Total Records: 2,295 patient cases')
-doc.add_paragraph('Total Variables: 15 clinical and demographic features')
-doc.add_paragraph('Data Type: Medical research dataset')
-doc.add_paragraph('Time Period: Cross-sectional data')
-
-doc.add_heading('Key Variables', level=2)
-
-# Create table for variables
-table = doc.add_table(rows=16, cols=3)
-table.style = 'Light Grid Accent 1'
-
-# Header row
-hdr_cells = table.rows[0].cells
-hdr_cells[0].text = 'Variable'
-hdr_cells[1].text = 'Type'
-hdr_cells[2].text = 'Description'
-
-variables = [
-    ('PatientID', 'Categorical', 'Unique patient identifier'),
-    ('Age', 'Numeric', 'Patient age in years'),
-    ('Gender', 'Categorical', 'Patient gender (Male/Female)'),
-    ('Diagnosis', 'Categorical', 'Blood cancer diagnosis type'),
-    ('WBC', 'Numeric', 'White Blood Cell count'),
-    ('RBC', 'Numeric', 'Red Blood Cell count'),
-    ('Hemoglobin', 'Numeric', 'Hemoglobin level (g/dL)'),
-    ('Platelets', 'Numeric', 'Platelet count (cells/μL)'),
-    ('Treatment', 'Categorical', 'Treatment protocol type'),
-    ('Risk_Category', 'Categorical', 'Clinical risk classification'),
-    ('Disease_Stage', 'Categorical', 'Cancer stage classification'),
-    ('Treatment_Outcome', 'Categorical', 'Treatment result'),
-    ('Prognosis', 'Categorical', 'Clinical prognosis'),
-    ('Date_Diagnosis', 'Date', 'Diagnosis date'),
-    ('Last_Follow_up', 'Date', 'Last clinical follow-up date'),
-]
+# ==================== TITLE PAGE ====================
 
-for i, (var, var_type, desc) in enumerate(variables, 1):
-    row_cells = table.rows[i].cells
-    row_cells[0].text = var
-    row_cells[1].text = var_type
-    row_cells[2].text = desc
-
-doc.add_heading('Data Source Citation', level=2)
-doc.add_paragraph(
-    'Dataset: Blood Cancer Diseases Dataset\n'
-    'Source: Medical research database\n'
-    'Records: 2,295 patient cases\n'
-    'Variables: 15 clinical and demographic attributes\n'
-    'License: Open for educational use\n'
-    'Access Date: January 2026'
-)
+def build_title(df, facts):
+    blocks = [
+        heading('Blood Cancer Analysis Dashboard', 1, centered=True),
+        heading('Data Visualization & Interactive Dashboard Development', 2, centered=True),
+        heading('Semester Project - Data Visualization Elective', 3, centered=True),
+        paragraph(''),
+        paragraph(f"Generated: {facts['generated']}"),
+        paragraph('Version: Extended (v2.0)'),
+        paragraph('Project Type: Exploratory Data Analysis & Dashboard Development'),
+    ]
+    return blocks, {}
 
-# ==================== 4. DATA CLEANING ====================
-doc.add_page_break()
-doc.add_heading('4. Data Cleaning and Preparation', level=1)
-
-doc.add_heading('Cleaning Pipeline', level=2)
-
-steps = [
-    ('Step 1: Remove Duplicates', 
-     'Identified and removed exact duplicate records to ensure data uniqueness. '
-     'This step maintains data integrity and prevents biased analysis.'),
-    ('Step 2: Handle Missing Values',
-     'Numeric columns: Filled with median value (robust to outliers).\n'
-     'Categorical columns: Filled with mode (most common value).\n'
-     'Ensures complete dataset for analysis without data loss.'),
-    ('Step 3: Standardize Text',
-     'Stripped leading/trailing whitespace from all text fields.\n'
-     'Applied title case formatting for consistency.\n'
-     'Enables proper categorical analysis and comparison.'),
-    ('Step 4: Outlier Detection',
-     'Applied IQR (Interquartile Range) method for each numeric variable.\n'
-     'Identified data points beyond 1.5 × IQR from quartiles.\n'
-     'Flagged anomalies for investigation without automatic removal.'),
-    ('Step 5: Data Type Optimization',
-     'Converted numeric columns to appropriate types (int32, float64).\n'
-     'Optimized categorical encoding for memory efficiency.\n'
-     'Enhanced processing speed for large-scale operations.'),
-]
 
-for title, desc in steps:
-    p = doc.add_paragraph()
-    p.add_run(title).bold = True
-    p.add_run(f'\n{desc}')
+# ==================== TABLE OF CONTENTS ====================
 
-doc.add_heading('Data Quality Metrics', level=2)
+def build_toc(df, facts):
+    toc_items = [
+        '1. Executive Summary',
+        '2. Project Objectives and Questions',
+        '3. Dataset Description',
+        '4. Data Cleaning and Preparation',
+        '5. Exploratory Data Analysis (EDA)',
+        '6. Dashboard Features and Architecture',
+        '7. Key Findings and Insights',
+        '8. Conclusion and Recommendations'
+    ]
+    return [page_break(), heading('Table of Contents', 1)] + bullets(toc_items), {}
 
-quality_metrics = [
-    'Data Completeness: 99.5%+',
-    'Missing Values Detected: <1%',
-    'Duplicates Found: Removed as identified',
-    'Outliers Flagged: ~2% of data',
-    'Final Dataset: Grade A quality',
-]
 
-for metric in quality_metrics:
-    doc.add_paragraph(metric, style='List Bullet')
+# ==================== 1. EXECUTIVE SUMMARY ====================
 
-# ==================== 5. EXPLORATORY DATA ANALYSIS ====================
-doc.add_page_break()
-doc.add_heading('5. Exploratory Data Analysis (EDA)', level=1)
+def build_summary(df, facts):
+    blocks = [
+        page_break(),
+        heading('1. Executive Summary', 1),
+        paragraph(
+            'This project presents an interactive dashboard for analyzing blood cancer patient demographics '
+            'and clinical characteristics. Every figure in this report is computed from the dataset itself, '
+            'so the report stays in step with the data it describes.'
+        ),
+        heading('Project Highlights', 2),
+    ]
+    highlights = [
+        f"Dataset: {facts['rows']:,} patient records with {facts['columns']} variables",
+        f"Completeness: {facts['completeness']:.1f}% of cells hold a value",
+        f"Diagnoses: {len(facts['diagnosis_counts'])} cancer types, most often {facts['top_diagnosis']}",
+        f"Statistical tests: {facts['significant_tests']} of {facts['tests_run']} significant at α = {ALPHA}",
+        'Objective Questions: 6 specific research questions formulated and answered',
+        'Data Cleaning: 5-step automated pipeline with measured quality metrics',
+        'Dashboard Pages: Home, Data Overview, Visualizations, Statistical Analysis and Export',
+        'Tools: Streamlit, Pandas, Plotly, SciPy and Matplotlib',
+    ]
+    return blocks + bullets(highlights), {}
 
-doc.add_heading('Univariate Analysis', level=2)
 
-doc.add_paragraph(
-    'Univariate analysis examines each variable individually to understand distributions and characteristics.'
-)
+# ==================== 2. PROJECT OBJECTIVES ====================
 
-doc.add_paragraph('Age Distribution:')
-doc.add_paragraph('Age histogram reveals patient age distribution across cohorts.', style='List Bullet')
-doc.add_paragraph('Identifies age groups with highest prevalence of blood cancer.', style='List Bullet')
+def build_objectives(df, facts):
+    blocks = [
+        page_break(),
+        heading('2. Project Objectives and Questions', 1),
+        heading('Main Theme', 2),
+        paragraph('Data Visualization and Interactive Analysis of Blood Cancer Patient Demographics and Clinical Characteristics'),
+        heading('Objective Questions', 2),
+    ]
+
+    questions = [
+        ('Q1', 'What is the demographic distribution of blood cancer patients?',
+         'Understanding age, gender composition, and identification of high-risk groups'),
+        ('Q2', 'How do clinical lab values vary across different blood cancer diagnoses?',
+         'Identifying biomarkers and diagnostic significance of lab parameters'),
+        ('Q3', 'Is there a significant correlation between patient age and clinical lab parameters?',
+         'Determining age-related patterns and clinical implications'),
+        ('Q4', 'What are the most common blood cancer diagnoses and their clinical characteristics?',
+         'Comparing diagnostic distributions and clinical presentations'),
+        ('Q5', 'Are there gender-based differences in blood cancer diagnoses and presentations?',
+         'Identifying gender-specific patterns and clinical implications'),
+        ('Q6', 'What data quality and missing value patterns exist in the dataset?',
+         'Ensuring data integrity and identifying potential biases'),
+    ]
+    for num, question, explanation in questions:
+        blocks.append(runs((f'{num}: {question}\n', True), (f'Purpose: {explanation}', False)))
+    return blocks, {}
 
-doc.add_paragraph('Diagnosis Distribution:')
-doc.add_paragraph('Pie chart shows frequency of each cancer type.', style='List Bullet')
-doc.add_paragraph('Reveals most common and rare diagnoses in the dataset.', style='List Bullet')
 
-doc.add_paragraph('Gender Distribution:')
-doc.add_paragraph('Bar chart displays gender composition.', style='List Bullet')
-doc.add_paragraph('Identifies gender-based prevalence patterns.', style='List Bullet')
+# ==================== 3. DATASET DESCRIPTION ====================
 
-doc.add_heading('Bivariate Analysis', level=2)
+def build_dataset(df, facts):
+    rows, columns = df.shape
+    missing = df.isna().sum()
+    completeness = 100 - missing.sum() / (rows * columns) * 100 if rows and columns else 100.0
+
+    blocks = [
+        page_break(),
+        heading('3. Dataset Description', 1),
+        heading('Dataset Overview', 2),
+        paragraph('Name: Blood Cancer Diseases Dataset'),
+        paragraph(f'Total Records: {rows:,} patient cases'),
+        paragraph(f'Total Variables: {columns} clinical and demographic features'),
+        paragraph(f'Completeness: {completeness:.1f}% of cells hold a value'),
+        paragraph('Data Type: Medical research dataset (cross-sectional)'),
+        heading('Variables', 2),
+    ]
+
+    variable_rows = []
+    for col in df.columns:
+        series = df[col]
+        present = int(series.notna().sum())
+        if series.dtype.kind in 'biuf':
+            kind = 'Numeric'
+            values = f"{series.min():,.0f} – {series.max():,.0f}" if present else 'no values'
+        else:
+            kind = 'Categorical'
+            levels = frequent_levels(series)
+            values = f"{len(levels)} levels, most often {levels.index[0]}" if len(levels) else 'no values'
+        variable_rows.append((col, kind, f"{present:,}", pct(int(missing[col]), rows), values))
+    blocks.append(table(['Variable', 'Type', 'Values present', 'Missing', 'Range / levels'], variable_rows))
+
+    empty = placeholders(df)
+    if empty:
+        blocks.append(paragraph(
+            f"{', '.join(empty)} {'is' if len(empty) == 1 else 'are'} not recorded in this extract; the columns are "
+            'kept as placeholders so the dashboard code works on extracts that include them, and are left out '
+            'of every statistic below.'
+        ))
+
+    blocks += [
+        heading('Data Source Citation', 2),
+        paragraph(
+            'Dataset: Blood Cancer Diseases Dataset\n'
+            f"Source file: {facts['source_file']}\n"
+            f'Records: {rows:,} patient cases\n'
+            f'Variables: {columns} clinical and demographic attributes\n'
+            'License: Open for educational use'
+        ),
+    ]
+    return blocks, {'rows': rows, 'columns': columns, 'completeness': float(completeness),
+                    'missing_cells': int(missing.sum()), 'placeholders': empty}
 
-doc.add_paragraph(
-    'Bivariate analysis examines relationships between pairs of variables.'
-)
 
-doc.add_paragraph('Lab Values by Diagnosis:')
-doc.add_paragraph('Box plots show WBC, RBC, Hemoglobin, Platelet distributions by cancer type.', style='List Bullet')
-doc.add_paragraph('Identifies diagnostic biomarkers and clinical signatures.', style='List Bullet')
+# ==================== 4. DATA CLEANING ====================
 
-doc.add_paragraph('Age vs. Lab Parameters:')
-doc.add_paragraph('Scatter plots reveal age-related trends in clinical values.', style='List Bullet')
-doc.add_paragraph('Quantifies correlation between age and disease severity.', style='List Bullet')
+def build_cleaning(df, facts):
+    _, report = clean_frame(df)
+
+    blocks = [
+        page_break(),
+        heading('4. Data Cleaning and Preparation', 1),
+        heading('Cleaning Pipeline', 2),
+    ]
+    steps = [
+        ('Step 1: Remove Duplicates',
+         'Identified and removed exact duplicate records to ensure data uniqueness.'),
+        ('Step 2: Handle Missing Values',
+         'Numeric columns: Filled with median value (robust to outliers).\n'
+         'Categorical columns: Filled with mode (most common value).'),
+        ('Step 3: Standardize Text',
+         'Stripped leading/trailing whitespace from all text fields and applied title case formatting.'),
+        ('Step 4: Outlier Detection',
+         f"Applied the IQR method to each numeric variable, flagging values beyond "
+         f"{report['options']['iqr_multiplier']} × IQR from the quartiles without removing them."),
+        ('Step 5: Data Type Optimization',
+         'Narrowed numeric columns to the smallest lossless types and encoded text as categoricals.'),
+    ]
+    for title, desc in steps:
+        blocks.append(runs((title, True), (f'\n{desc}', False)))
+
+    filled = sum(fill['filled'] for fill in report['fills'].values())
+    standardized = sum(report['text_standardized'].values())
+    dtypes = report['dtype_optimization']
+    blocks.append(heading('Data Quality Metrics', 2))
+    blocks += bullets([
+        f"Records: {report['rows_before']:,} before cleaning, {report['rows_after']:,} after",
+        f"Duplicates removed: {report['duplicates_removed']:,}",
+        f"Missing cells filled: {filled:,} across {sum(1 for f in report['fills'].values() if f['filled'])} columns",
+        f"Text labels standardized: {standardized:,}",
+        f"Rows with an outlier flagged: {report.get('outlier_rows', 0):,} "
+        f"({pct(report.get('outlier_rows', 0), report['rows_after'])})",
+        f"Memory: {dtypes['memory_before'] / 1024:,.0f} KB → {dtypes['memory_after'] / 1024:,.0f} KB "
+        f"({dtypes['reduction_pct']:.1f}% smaller)",
+    ])
+
+    if report['fills']:
+        blocks.append(heading('Missing Values by Column', 2))
+        blocks.append(table(['Column', 'Missing', 'Filled', 'Method', 'Fill value'], [
+            (col, f"{fill['missing']:,}", f"{fill['filled']:,}", fill['method'],
+             'not filled (no values)' if fill['fill_value'] is None else fill['fill_value'])
+            for col, fill in report['fills'].items()
+        ]))
+
+    return blocks, {'duplicates_removed': report['duplicates_removed'], 'cells_filled': filled,
+                    'outlier_rows': report.get('outlier_rows', 0)}
 
-doc.add_heading('Multivariate Analysis', level=2)
 
-doc.add_paragraph(
-    'Multivariate analysis examines relationships among multiple variables simultaneously.'
-)
+# ==================== 5. EXPLORATORY DATA ANALYSIS ====================
 
-doc.add_paragraph('Correlation Analysis:')
-doc.add_paragraph('Correlation heatmap shows relationships among all numeric variables.', style='List Bullet')
-doc.add_paragraph('Identifies strong associations useful for predictive modeling.', style='List Bullet')
+def build_eda_intro(df, facts):
+    return [
+        page_break(),
+        heading('5. Exploratory Data Analysis (EDA)', 1),
+        paragraph(
+            'The analysis runs on the data as recorded, before missing values are filled: every statistic uses '
+            'the rows where its variables are present, so imputed values never shift a test result. '
+            f'Category levels seen fewer than {MIN_LEVEL_COUNT} times (stray header rows, typos) are left out.'
+        ),
+        heading('Univariate Analysis', 2),
+    ], {}
+
+
+def build_eda_age(df, facts):
+    age = df['Age'].dropna()
+    q1, median, q3 = age.quantile([0.25, 0.5, 0.75])
+    blocks = [
+        paragraph('Age Distribution:'),
+        *bullets([
+            f"{len(age):,} patients aged {age.min():.0f} to {age.max():.0f}",
+            f"Median age {median:.0f} (interquartile range {q1:.0f} – {q3:.0f}), mean {age.mean():.1f}",
+        ]),
+        chart('age_histogram'),
+    ]
+    return blocks, {'age_median': float(median), 'age_q1': float(q1), 'age_q3': float(q3)}
+
+
+def build_eda_gender(df, facts):
+    counts = frequent_levels(df['Gender'])
+    total = counts.sum()
+    blocks = [
+        paragraph('Gender Distribution:'),
+        *bullets([f"{level}: {count:,} patients ({pct(count, total)})" for level, count in counts.items()]),
+        chart('gender_counts', 5.0),
+    ]
+    return blocks, {'gender_counts': {str(level): int(count) for level, count in counts.items()}}
+
+
+def build_eda_diagnosis(df, facts):
+    counts = frequent_levels(df['Diagnosis'])
+    total = counts.sum()
+    blocks = [
+        paragraph('Diagnosis Distribution:'),
+        table(['Diagnosis', 'Patients', 'Share'],
+              [(level, f"{count:,}", pct(count, total)) for level, count in counts.items()]),
+        chart('diagnosis_counts'),
+    ]
+    return blocks, {'diagnosis_counts': {str(level): int(count) for level, count in counts.items()},
+                    'top_diagnosis': str(counts.index[0]) if len(counts) else 'n/a'}
+
+
+def build_eda_labs(df, facts):
+    variables = measured(df)
+    subset = frequent_rows(df, 'Diagnosis')
+    moments = group_moments(subset, 'Diagnosis', variables)
+    anova = anova_batch(moments)
+
+    blocks = [
+        heading('Bivariate Analysis', 2),
+        paragraph('Lab Values by Diagnosis:'),
+        table(['Diagnosis'] + [f'Mean {v}' for v in variables],
+              [(group, *(f"{value:,.1f}" for value in means))
+               for group, means in zip(moments.groups, moments.mean)]),
+        paragraph('One-way ANOVA across diagnoses:'),
+        table(['Variable', 'F', 'p-value', 'Groups', 'Patients', 'Significant'],
+              [(variable, f"{row.F:.3f}", format_p(row.p), int(row.groups), f"{int(row.n):,}",
+                'Yes' if row.p < ALPHA else 'No')
+               for variable, row in anova.iterrows()]),
+        chart('wbc_by_diagnosis'),
+        chart('platelets_by_diagnosis'),
+    ]
+    return blocks, {'anova': {variable: float(p) for variable, p in anova['p'].items()}}
+
+
+def build_eda_correlation(df, facts):
+    variables = measured(df)
+    result = pearson_matrix(CoMoments.from_frame(df, variables))
+    pairs = [(a, b) for i, a in enumerate(variables) for b in variables[i + 1:]]
+
+    blocks = [
+        heading('Multivariate Analysis', 2),
+        paragraph('Correlation Analysis (Pearson, pairwise complete):'),
+        table(['Variable 1', 'Variable 2', 'r', 'p-value', 'Patients'],
+              [(a, b, f"{result.corr.loc[a, b]:.3f}", format_p(result.pvalues.loc[a, b]),
+                f"{result.counts.loc[a, b]:,}") for a, b in pairs]),
+        chart('correlation_heatmap', 5.0),
+        paragraph('Age vs. WBC:'),
+        chart('age_vs_wbc'),
+    ]
+    strongest = max(pairs, key=lambda pair: abs(result.corr.loc[pair]), default=None)
+    return blocks, {
+        'age_correlations': {b: (float(result.corr.loc['Age', b]), float(result.pvalues.loc['Age', b]))
+                             for b in variables if b != 'Age'} if 'Age' in variables else {},
+        'strongest_pair': (strongest[0], strongest[1], float(result.corr.loc[strongest])) if strongest else None,
+    }
+
+
+def build_eda_gender_tests(df, facts):
+    variables = measured(df)
+    subset = frequent_rows(df, 'Gender')
+    # The two largest groups, as on the Statistical Analysis page
+    group1, group2 = frequent_levels(df['Gender']).index[:2]
+    ttest = ttest_batch(group_moments(subset, 'Gender', variables), group1, group2)
+
+    both = frequent_rows(subset, 'Diagnosis')
+    crosstab = contingency_table(both['Gender'], both['Diagnosis'])
+    chi2, chi_p, dof, _ = chi_square(crosstab.to_numpy())
+
+    blocks = [
+        heading('Gender Comparisons', 2),
+        paragraph(f"Two-sample t-tests, {group1} vs {group2}:"),
+        table(['Variable', f'Mean ({group1})', f'Mean ({group2})', 't', 'p-value', 'Significant'],
+              [(variable, f"{row.mean_1:,.1f}", f"{row.mean_2:,.1f}", f"{row.t:.3f}", format_p(row.p),
+                'Yes' if row.p < ALPHA else 'No')
+               for variable, row in ttest.iterrows()]),
+        paragraph(f"Chi-square test of Gender × Diagnosis: χ² = {chi2:.2f}, df = {dof}, p = {format_p(chi_p)} "
+                  f"({'dependent' if chi_p < ALPHA else 'no evidence of dependence'} at α = {ALPHA})."),
+    ]
+    return blocks, {'ttest': {variable: float(p) for variable, p in ttest['p'].items()},
+                    'ttest_groups': (str(group1), str(group2)), 'chi_square_p': float(chi_p)}
 
-doc.add_paragraph('3D Scatter Analysis:')
-doc.add_paragraph('Plots age, WBC, and other parameters with color/size encoding.', style='List Bullet')
-doc.add_paragraph('Reveals complex multivariate patterns in patient populations.', style='List Bullet')
 
 # ==================== 6. DASHBOARD FEATURES ====================
-doc.add_page_break()
-doc.add_heading('6. Dashboard Features and Architecture', level=1)
-
-doc.add_heading('Dashboard Pages', level=2)
-
-pages = [
-    ('Home Page', 'Project overview, objectives, quick statistics, navigation guide'),
-    ('Data Overview', 'Dataset preview, column information, basic statistics, univariate analysis'),
-    ('Data Cleaning', 'Cleaning process documentation, quality metrics, before/after comparison'),
-    ('Analytics', 'Bivariate, multivariate, correlation, statistical tests, group comparisons'),
-    ('Clinical Insights', 'Key findings, interpretations, clinical patterns, gender analysis'),
-    ('Statistics', 'Descriptive statistics, distribution analysis, advanced metrics'),
-    ('Export', 'Download cleaned data (CSV/Excel/JSON), generate reports'),
-    ('Help', 'Complete documentation, feature guide, technical details'),
-]
-
-for page, description in pages:
-    p = doc.add_paragraph()
-    p.add_run(f'{page}: ').bold = True
-    p.add_run(description)
-
-doc.add_heading('Visualization Types', level=2)
-
-viz_types = [
-    'Histograms - Distribution analysis',
-    'Pie Charts - Categorical proportions',
-    'Box Plots - Quartile analysis and outliers',
-    'Violin Plots - Distribution shape and density',
-    'Scatter Plots - Bivariate relationships',
-    'Heatmaps - Correlation matrices',
-    'Bar Charts - Categorical comparisons',
-    '3D Scatter - Multivariate visualization',
-    'Bubble Charts - Three-variable relationships',
-    'Cross-tabulations - Contingency analysis',
-]
 
-for viz in viz_types:
-    doc.add_paragraph(viz, style='List Bullet')
+def build_dashboard(df, facts):
+    blocks = [
+        page_break(),
+        heading('6. Dashboard Features and Architecture', 1),
+        heading('Dashboard Pages', 2),
+    ]
+    pages = [
+        ('Home', 'Project overview, objectives, quick statistics, navigation guide'),
+        ('Data Overview', 'Dataset preview, column information, missing values, cleaning with before/after metrics'),
+        ('Visualizations', 'Distributions, correlations, pair plots, group comparisons and multivariate charts'),
+        ('Statistical Analysis', 'ANOVA, t-tests, chi-square, variable screening and resampling tests'),
+        ('Export', 'Download the data as CSV, Excel, JSON, NDJSON or Parquet, optionally compressed'),
+    ]
+    for page, description in pages:
+        blocks.append(runs((f'{page}: ', True), (description, False)))
+
+    blocks.append(heading('Visualization Types', 2))
+    blocks += bullets([
+        'Histograms - Distribution analysis',
+        'Pie Charts - Categorical proportions',
+        'Box Plots - Quartile analysis and outliers',
+        'Violin Plots - Distribution shape and density',
+        'Scatter Plots - Bivariate relationships',
+        'Heatmaps - Correlation matrices',
+        'Sunburst and Treemap Charts - Hierarchical proportions',
+        '3D Scatter - Multivariate visualization',
+        'Bubble Charts - Three-variable relationships',
+        'Parallel Coordinates - Clinical parameter profiles',
+    ])
+
+    blocks.append(heading('Interactive Features', 2))
+    blocks += bullets([
+        'Real-time filtering by diagnosis, gender, age range',
+        'Zoom and pan on all charts',
+        'Legend toggling to show/hide data series',
+        'Hover tooltips with detailed information',
+        'Precomputed results served from the batch runner (batch_analysis.py)',
+        'Export functionality for data',
+    ])
+    return blocks, {}
 
-doc.add_heading('Interactive Features', level=2)
-
-features = [
-    'Real-time filtering by diagnosis, gender, age range',
-    'Zoom and pan on all charts',
-    'Legend toggling to show/hide data series',
-    'Hover tooltips with detailed information',
-    'Responsive design for multiple screen sizes',
-    'Export functionality for data and charts',
-]
-
-for feature in features:
-    doc.add_paragraph(feature, style='List Bullet')
 
 # ==================== 7. KEY FINDINGS ====================
-doc.add_page_break()
-doc.add_heading('7. Key Findings and Insights', level=1)
-
-findings = [
-    ('Demographic Distribution (Q1)',
-     'Blood cancer affects diverse age groups with specific patterns. Age-based risk analysis reveals '
-     'certain diagnoses predominate in specific age ranges. Gender distribution shows variations across cancer types.'),
-    
-    ('Clinical Biomarkers (Q2)',
-     'Lab values exhibit distinct signatures for each diagnosis type. WBC levels vary significantly by cancer type. '
-     'Hemoglobin and platelet counts show diagnostic specificity useful for early detection.'),
-    
-    ('Age-Related Patterns (Q3)',
-     'Strong correlation observed between patient age and clinical parameters. Clinical severity indicators '
-     'increase with age, suggesting age-based risk stratification for treatment planning.'),
-    
-    ('Diagnosis Prevalence (Q4)',
-     'Analysis reveals most common and rare cancer types in the patient population. Clinical presentation '
-     'varies significantly across diagnosis groups, impacting treatment selection.'),
-    
-    ('Gender-Based Differences (Q5)',
-     'Significant differences observed in diagnosis distribution between genders. Lab parameter ranges '
-     'show gender-specific variations, suggesting need for gender-adjusted clinical thresholds.'),
-    
-    ('Data Quality (Q6)',
-     'Dataset shows high completeness (>99%) with minimal missing values. Outlier detection identified ~2% '
-     'potential anomalies, warranting clinical review. Overall data quality suitable for statistical analysis.'),
-]
-
-for finding_title, finding_text in findings:
-    p = doc.add_paragraph()
-    p.add_run(f'{finding_title}\n').bold = True
-    p.add_run(finding_text)
-
-# ==================== 8. CONCLUSION ====================
-doc.add_page_break()
-doc.add_heading('8. Conclusion and Recommendations', level=1)
-
-doc.add_heading('Project Completion', level=2)
 
-doc.add_paragraph(
-    'This semester project successfully demonstrates comprehensive application of exploratory data analysis (EDA) '
-    'and data visualization techniques to a real-world blood cancer dataset. All project requirements have been fulfilled:'
-)
+def describe_tests(p_values):
+    significant = [variable for variable, p in p_values.items() if p < ALPHA]
+    if not significant:
+        return f"none of {', '.join(p_values)} differ significantly (α = {ALPHA})"
+    return f"{', '.join(significant)} differ significantly (α = {ALPHA})"
+
+
+def build_findings(df, facts):
+    genders = facts['gender_counts']
+    diagnoses = facts['diagnosis_counts']
+    total = sum(diagnoses.values())
+    top, rare = max(diagnoses, key=diagnoses.get), min(diagnoses, key=diagnoses.get)
+    age_corr = facts['age_correlations']
+    group1, group2 = facts['ttest_groups']
+
+    findings = [
+        ('Demographic Distribution (Q1)',
+         f"Median patient age is {facts['age_median']:.0f} (IQR {facts['age_q1']:.0f} – {facts['age_q3']:.0f}). "
+         + ', '.join(f"{level} {pct(count, sum(genders.values()))}" for level, count in genders.items()) + '.'),
+        ('Clinical Biomarkers (Q2)',
+         f"Across diagnoses, {describe_tests(facts['anova'])} by one-way ANOVA."),
+        ('Age-Related Patterns (Q3)',
+         ' '.join(f"Age vs {variable}: r = {r:.3f} (p = {format_p(p)})." for variable, (r, p) in age_corr.items())
+         or 'No lab variable has enough values to correlate with age.'),
+        ('Diagnosis Prevalence (Q4)',
+         f"{top} is the most common diagnosis ({pct(diagnoses[top], total)}) and {rare} the least common "
+         f"({pct(diagnoses[rare], total)}) across {len(diagnoses)} cancer types."),
+        ('Gender-Based Differences (Q5)',
+         f"Between {group1} and {group2} patients, {describe_tests(facts['ttest'])} by t-test; the chi-square "
+         f"test of Gender × Diagnosis gives p = {format_p(facts['chi_square_p'])}."),
+        ('Data Quality (Q6)',
+         f"{facts['completeness']:.1f}% of cells hold a value ({facts['missing_cells']:,} missing). "
+         f"{facts['duplicates_removed']:,} duplicates were removed, {facts['cells_filled']:,} missing cells filled "
+         f"and {facts['outlier_rows']:,} rows flagged as outliers."
+         + (f" {', '.join(facts['placeholders'])} carry no values in this extract." if facts['placeholders'] else '')),
+    ]
+
+    blocks = [page_break(), heading('7. Key Findings and Insights', 1)]
+    for finding_title, finding_text in findings:
+        blocks.append(runs((f'{finding_title}\n', True), (finding_text, False)))
+    return blocks, {}
 
-completion_items = [
-    'Dataset selected (2,295 records, real medical data)',
-    'Theme clearly defined (Blood cancer patient analysis)',
-    '6 objective questions formulated and answered',
-    'EDA completed with automated data cleaning',
-    'Interactive dashboard developed with 8 pages',
-    '50+ visualizations created across all analysis dimensions',
-    'Statistical analysis performed with significance testing',
-    'Clinical insights documented and interpreted',
-    'Comprehensive project report completed',
-    'Professional code with documentation',
-]
 
-for item in completion_items:
-    doc.add_paragraph(item, style='List Number')
-
-doc.add_heading('Key Achievements', level=2)
-
-achievements = [
-    'Full EDA pipeline with data cleaning, statistical analysis, and visualization',
-    'Interactive dashboard answering all 6 objective questions',
-    'Advanced statistical testing and correlation analysis',
-    'Export functionality for data sharing',
-    'Professional documentation and reporting',
-    'Cloud-ready deployment capability',
-]
-
-for achievement in achievements:
-    doc.add_paragraph(achievement, style='List Bullet')
-
-doc.add_heading('Recommendations for Future Work', level=2)
+# ==================== 8. CONCLUSION ====================
 
-recommendations = [
-    'Extend analysis with temporal trend analysis (if longitudinal data available)',
-    'Implement machine learning models for diagnosis prediction',
-    'Integrate real-time data feeds from hospital systems',
-    'Develop mobile application for clinical use',
-    'Perform multi-dataset comparative analysis',
-    'Create API endpoints for external system integration',
+def build_conclusion(df, facts):
+    blocks = [
+        page_break(),
+        heading('8. Conclusion and Recommendations', 1),
+        heading('Project Completion', 2),
+        paragraph(
+            'This semester project applies exploratory data analysis (EDA) and data visualization techniques '
+            'to a real-world blood cancer dataset:'
+        ),
+    ]
+    blocks += bullets([
+        f"Dataset selected ({facts['rows']:,} records, {facts['columns']} variables)",
+        'Theme clearly defined (Blood cancer patient analysis)',
+        '6 objective questions formulated and answered from the data',
+        'EDA completed with automated data cleaning',
+        'Interactive dashboard developed with 5 pages',
+        f"{facts['tests_run']} significance tests run, {facts['significant_tests']} significant at α = {ALPHA}",
+        'Project report generated from the dataset',
+    ], style='List Number')
+
+    blocks.append(heading('Recommendations for Future Work', 2))
+    recommendations = [
+        'Extend analysis with temporal trend analysis (if longitudinal data available)',
+        'Implement machine learning models for diagnosis prediction',
+        'Integrate real-time data feeds from hospital systems',
+        'Perform multi-dataset comparative analysis',
+    ]
+    if facts['placeholders']:
+        recommendations.insert(0, f"Obtain {', '.join(facts['placeholders'])} measurements to complete the lab panel")
+    blocks += bullets(recommendations)
+
+    blocks += [
+        heading('Conclusion', 2),
+        paragraph(
+            'This dashboard provides a platform for analyzing blood cancer patient data with interactive '
+            'visualization and statistical capabilities. The interactive nature of the dashboard enables medical '
+            'professionals and researchers to quickly explore data, identify patterns, and make data-driven decisions.'
+        ),
+    ]
+    return blocks, {}
+
+
+# ==================== REPORT ====================
+
+# Columns of parts that read the whole frame
+ALL_COLUMNS = None
+
+# Facts known before any part is built
+INPUT_FACTS = ('generated', 'source_file')
+
+FINDING_FACTS = ('gender_counts', 'diagnosis_counts', 'age_median', 'age_q1', 'age_q3', 'anova', 'age_correlations',
+                 'ttest', 'ttest_groups', 'chi_square_p', 'completeness', 'missing_cells', 'duplicates_removed',
+                 'cells_filled', 'outlier_rows', 'placeholders')
+
+# Document order; parts that read facts are built after the parts that produce them
+PARTS = [
+    Part('title', [], ('generated',), build_title),
+    Part('toc', [], (), build_toc),
+    Part('summary', [], ('rows', 'columns', 'completeness', 'diagnosis_counts', 'top_diagnosis',
+                         'tests_run', 'significant_tests'), build_summary),
+    Part('objectives', [], (), build_objectives),
+    Part('dataset', ALL_COLUMNS, ('source_file',), build_dataset),
+    Part('cleaning', ALL_COLUMNS, (), build_cleaning),
+    Part('eda_intro', [], (), build_eda_intro),
+    Part('eda_age', ['Age'], (), build_eda_age),
+    Part('eda_gender', ['Gender'], (), build_eda_gender),
+    Part('eda_diagnosis', ['Diagnosis'], (), build_eda_diagnosis),
+    Part('eda_labs', ['Diagnosis'] + TEST_VARIABLES, (), build_eda_labs),
+    Part('eda_correlation', TEST_VARIABLES, (), build_eda_correlation),
+    Part('eda_gender_tests', ['Gender', 'Diagnosis'] + TEST_VARIABLES, (), build_eda_gender_tests),
+    Part('dashboard', [], (), build_dashboard),
+    Part('findings', [], FINDING_FACTS, build_findings),
+    Part('conclusion', [], ('rows', 'columns', 'tests_run', 'significant_tests', 'placeholders'), build_conclusion),
 ]
 
-for recommendation in recommendations:
-    doc.add_paragraph(recommendation, style='List Bullet')
-
-doc.add_heading('Conclusion', level=2)
-
-doc.add_paragraph(
-    'This dashboard provides a comprehensive platform for analyzing blood cancer patient data with advanced '
-    'visualization and statistical capabilities. The interactive nature of the dashboard enables medical professionals '
-    'and researchers to quickly explore data, identify patterns, and make data-driven clinical decisions. The project '
-    'demonstrates mastery of EDA techniques, data visualization best practices, and modern dashboard development tools.'
-)
 
-# ==================== SAVE DOCUMENT ====================
-doc.save('PROJECT_REPORT.docx')
-print("✅ Project report generated: PROJECT_REPORT.docx")
+def test_counts(facts):
+    """Number of tests run and significant, across ANOVA, t-tests and chi-square."""
+    p_values = list(facts['anova'].values()) + list(facts['ttest'].values()) + [facts['chi_square_p']]
+    return {'tests_run': len(p_values), 'significant_tests': sum(p < ALPHA for p in p_values)}
+
+
+def build_parts(df, cache, facts):
+    """Build or load every part. Returns ({name: blocks}, names rebuilt)."""
+    fingerprints = column_fingerprints(df)
+    built, rebuilt = {}, []
+    data_parts = [part for part in PARTS if all(need in INPUT_FACTS for need in part.needs)]
+    derived_parts = [part for part in PARTS if part not in data_parts]
+
+    for parts in (data_parts, derived_parts):
+        for part in parts:
+            columns = list(df.columns) if part.columns is ALL_COLUMNS else part.columns
+            key = fingerprint(part.name, fingerprints, columns, tuple(repr(facts.get(need)) for need in part.needs))
+            section = cache.section(key)
+            if section is None:
+                section = part.build(df[columns], facts)
+                cache.store_section(key, section)
+                rebuilt.append(part.name)
+            blocks, part_facts = section
+            facts.update(part_facts)
+            built[part.name] = blocks
+        facts.update(test_counts(facts))
+    return built, rebuilt
+
+
+def build_charts(df, blocks, cache, max_workers=None):
+    """PNG of every chart the blocks use, rendering only those not cached. Returns ({name: png}, names rendered)."""
+    fingerprints = column_fingerprints(df)
+    names = [block[1] for block in blocks if block[0] == 'chart']
+    keys = {name: fingerprint(name, fingerprints, chart_columns(name)) for name in names}
+
+    images, jobs = {}, []
+    for name in names:
+        png = cache.chart(keys[name])
+        if png is None:
+            jobs.append((name, name, df[chart_columns(name)]))
+        else:
+            images[name] = png
+    if jobs:
+        for name, png in render_charts(jobs, max_workers).items():
+            cache.store_chart(keys[name], png)
+            images[name] = png
+    return images, [name for name, _, _ in jobs]
+
+
+def generate_report(output, data_file=None, max_workers=None, use_cache=True, log=print):
+    started = time.perf_counter()
+    file_path = find_data_file(data_file)
+    if file_path is None:
+        raise FileNotFoundError('Dataset not found; pass --data with the path to the CSV file.')
+
+    df = read_dataset(file_path)
+    cache = ReportCache(enabled=use_cache)
+    facts = {'generated': datetime.now().strftime("%B %d, %Y"), 'source_file': os.path.basename(file_path)}
+
+    built, rebuilt = build_parts(df, cache, facts)
+    blocks = [block for part in PARTS for block in built[part.name]]
+    images, rendered = build_charts(df, blocks, cache, max_workers)
+
+    doc = Document()
+    add_blocks(doc, blocks, images)
+    doc.save(output)
+
+    log(f"Sections rebuilt: {', '.join(rebuilt) or 'none'} ({len(PARTS) - len(rebuilt)} cached)")
+    log(f"Charts rendered: {', '.join(rendered) or 'none'} ({len(images) - len(rendered)} cached)")
+    log(f"✅ Project report generated: {output} in {time.perf_counter() - started:.1f}s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--output', default='PROJECT_REPORT.docx', help='report file to write')
+    parser.add_argument('--data', help='dataset CSV (defaults to the dashboard data file)')
+    parser.add_argument('--workers', type=int, help='chart rendering processes (default: one per CPU)')
+    parser.add_argument('--no-cache', action='store_true', help='rebuild every section and chart')
+    args = parser.parse_args(argv)
+
+    try:
+        generate_report(args.output, args.data, args.workers, use_cache=not args.no_cache)
+    except FileNotFoundError as error:
+        print(f"❌ {error}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
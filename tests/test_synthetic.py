@@ -0,0 +1,49 @@
+import pandas as pd
+import pytest
+
+from core import synthetic
+from core.synthetic import COHORT_COLUMNS, generate_cohort, write_cohort_csv
+
+BLOCK = 1_000
+
+
+@pytest.fixture(autouse=True)
+def small_blocks(monkeypatch):
+    # Same logic as the real block size, on frames small enough to compare quickly
+    monkeypatch.setattr(synthetic, 'BLOCK_ROWS', BLOCK)
+
+
+@pytest.mark.parametrize('chunk_rows', [7, BLOCK - 1, BLOCK, 3 * BLOCK, 1_000_000])
+def test_rows_do_not_depend_on_chunk_size(chunk_rows):
+    n_rows = 2 * BLOCK + 500
+    reference = generate_cohort(n_rows, seed=3)
+    pd.testing.assert_frame_equal(generate_cohort(n_rows, seed=3, chunk_rows=chunk_rows), reference)
+
+
+def test_chunks_have_requested_size():
+    sizes = [len(chunk) for chunk in synthetic.cohort_chunks(2 * BLOCK + 500, chunk_rows=700)]
+    assert sizes == [700, 700, 700, 400]
+
+
+def test_first_rows_do_not_depend_on_total_size():
+    larger = generate_cohort(3 * BLOCK + 10, seed=3, chunk_rows=333)
+    smaller = generate_cohort(1_200, seed=3)
+    pd.testing.assert_frame_equal(smaller, larger.iloc[:1_200])
+
+
+def test_seed_changes_rows():
+    assert not generate_cohort(500, seed=1).equals(generate_cohort(500, seed=2))
+
+
+def test_csv_matches_generated_cohort(tmp_path):
+    path = write_cohort_csv(str(tmp_path / "cohort.csv"), 2_500, chunk_rows=900)
+    df = pd.read_csv(path)
+    assert list(df.columns) == COHORT_COLUMNS
+    assert len(df) == 2_500
+    pd.testing.assert_series_equal(df['Age'], generate_cohort(2_500)['Age'].astype(df['Age'].dtype))
+
+
+def test_empty_cohort_has_columns(tmp_path):
+    assert list(generate_cohort(0).columns) == COHORT_COLUMNS
+    path = write_cohort_csv(str(tmp_path / "empty.csv"), 0)
+    assert list(pd.read_csv(path).columns) == COHORT_COLUMNS
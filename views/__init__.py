@@ -0,0 +1,3 @@
+"""
+Dashboard pages, imported on first visit so each page's dependencies load only when it is opened.
+"""
@@ -0,0 +1,52 @@
+"""
+Export page.
+"""
+
+import streamlit as st
+
+from core.export import EXPORTS, FORMATS, available_codecs, available_formats, export_bytes, export_file_name, export_mime
+from views.session import get_filtered_df
+
+CODEC_LABELS = {'none': 'None', 'gzip': 'gzip', 'zstd': 'zstd'}
+
+def show_export():
+    """Export page."""
+    st.markdown('<h2 class="section-header">📥 Export & Download</h2>', unsafe_allow_html=True)
+    
+    if not st.session_state.get('data_loaded', False):
+        st.warning("⚠️ Please load the dataset first.")
+        return
+    
+    df = get_filtered_df()
+    
+    st.markdown("### 📦 Download Data in Multiple Formats")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        fmt = st.selectbox("Format", available_formats(), format_func=lambda f: FORMATS[f].label, key="export_format")
+    
+    with col2:
+        codecs = available_codecs(fmt)
+        codec = st.selectbox("Compression", codecs, format_func=CODEC_LABELS.get, key=f"export_codec_{fmt}",
+                             disabled=len(codecs) == 1)
+    
+    # The file is built when the button is clicked, not on every visit, and kept for other sessions
+    key = ('export', st.session_state.get('df_key'), st.session_state.get('filter_key', ()), fmt, codec)
+    
+    def build():
+        return EXPORTS.get_or_build(key, lambda: export_bytes(df, fmt, codec))
+    
+    st.download_button(
+        label=f"📥 Download {FORMATS[fmt].label}",
+        data=build,
+        file_name=export_file_name("blood_cancer_data", fmt, codec),
+        mime=export_mime(fmt, codec),
+        on_click='ignore',
+        width='stretch'
+    )
+    
+    status = "ready" if key in EXPORTS else "generated on download"
+    st.caption(f"{len(df):,} rows · {status}")
+    if fmt == 'parquet' and codec != 'none':
+        st.caption(f"Parquet applies {CODEC_LABELS[codec]} inside the file, per column chunk.")
@@ -0,0 +1,112 @@
+"""
+Data overview page.
+"""
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+
+from core.cleaning import OUTLIER_COLUMN
+from core.dtypes import memory_footprint, text_columns
+from views.session import get_filtered_df
+
+def show_data_overview():
+    """Data overview page."""
+    st.markdown('<h2 class="section-header">📊 Data Overview & Exploration</h2>', unsafe_allow_html=True)
+    
+    if not st.session_state.get('data_loaded', False):
+        st.warning("⚠️ Please load the dataset first using the sidebar button.")
+        return
+    
+    df = get_filtered_df()
+    
+    # Dataset preview with toggle
+    if st.checkbox("📋 Show Dataset Preview", value=True):
+        st.markdown("### First 15 Rows")
+        st.dataframe(df.head(15), width='stretch', height=400)
+    
+    # Column information
+    if st.checkbox("ℹ️ Show Column Information"):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown("### Numeric Columns")
+            numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+            for col in numeric_cols:
+                st.write(f"• {col}: {df[col].dtype}")
+        
+        with col2:
+            st.markdown("### Categorical Columns")
+            cat_cols = text_columns(df)
+            for col in cat_cols:
+                st.write(f"• {col}: {df[col].nunique()} unique values ({df[col].dtype})")
+    
+    # Memory footprint of the compact representation
+    if st.checkbox("💾 Show Memory Footprint"):
+        dtype_report = df.attrs.get('dtype_report')
+        
+        if dtype_report:
+            # Both figures describe the whole dataset, whatever filter is active
+            before_mb = dtype_report['memory_before'] / 1024 ** 2
+            after_mb = dtype_report['memory_after'] / 1024 ** 2
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Before Optimization", f"{before_mb:.2f} MB")
+            with col2:
+                st.metric("After Optimization", f"{after_mb:.2f} MB",
+                          delta=f"-{dtype_report['reduction_pct']:.1f}%", delta_color="inverse")
+            with col3:
+                st.metric("Columns Converted", len(dtype_report['columns']))
+            
+            if dtype_report['columns']:
+                st.dataframe(pd.DataFrame(
+                    [{'Column': col, 'Before': before, 'After': after}
+                     for col, (before, after) in dtype_report['columns'].items()]
+                ), width='stretch')
+        else:
+            st.metric("Memory Usage", f"{memory_footprint(df) / 1024 ** 2:.2f} MB")
+    
+    # Cleaning report (attached to the shared cleaned frame)
+    cleaning_report = df.attrs.get('cleaning_report')
+    if cleaning_report and st.checkbox("🧹 Show Cleaning Report"):
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Rows Before", f"{cleaning_report['rows_before']:,}")
+        with col2:
+            st.metric("Rows After", f"{cleaning_report['rows_after']:,}")
+        with col3:
+            st.metric("Duplicates Removed", f"{cleaning_report['duplicates_removed']:,}")
+        with col4:
+            st.metric("Cleaning Time", f"{cleaning_report['timings']['total'] * 1000:.0f} ms")
+        
+        if cleaning_report['fills']:
+            st.markdown("#### Missing Values Filled")
+            st.dataframe(pd.DataFrame(
+                [{'Column': col, 'Missing': info['missing'], 'Filled': info['filled'],
+                  'Method': info['method'], 'Fill Value': str(info['fill_value'])}
+                 for col, info in cleaning_report['fills'].items()]
+            ), width='stretch')
+        
+        if cleaning_report.get('outliers'):
+            st.markdown(f"#### IQR Outliers ({cleaning_report['outlier_rows']:,} rows flagged in `{OUTLIER_COLUMN}`)")
+            st.dataframe(pd.DataFrame(
+                [{'Column': col, 'Lower Bound': info['lower'], 'Upper Bound': info['upper'],
+                  'Outliers': info['outliers']}
+                 for col, info in cleaning_report['outliers'].items()]
+            ), width='stretch')
+        
+        if cleaning_report.get('text_standardized'):
+            st.markdown("#### Text Standardized")
+            for col, n_changed in cleaning_report['text_standardized'].items():
+                st.write(f"• {col}: {n_changed} labels rewritten")
+        
+        st.markdown("#### Stage Timings")
+        st.dataframe(pd.DataFrame(
+            [{'Stage': stage, 'Time (ms)': round(seconds * 1000, 2)}
+             for stage, seconds in cleaning_report['timings'].items()]
+        ), width='stretch')
+    
+    # Interactive statistics
+    if st.checkbox("📊 Show Statistical Summary"):
+        if st.button("🔄 Generate Statistics", key="gen_stats"):
+            st.dataframe(df.describe(), width='stretch')
@@ -0,0 +1,60 @@
+"""
+Session-aware accessors shared by the dashboard and its pages.
+
+Each accessor resolves the session's dataset version and active filter, and
+returns a shared object from the dataset store (whole dataset) or the
+selection cache (filtered cohort).
+"""
+
+import streamlit as st
+
+from core.aggregates import build_cube
+from core.artifacts import Artifacts
+from core.dataset_store import STORE
+from core.filters import SELECTIONS, FilterIndex
+from core.incremental import IncrementalStats
+
+def dataset_cube(key):
+    """Aggregate cube of a whole dataset version."""
+    return STORE.get_or_build(('cube',) + key, lambda: build_cube(STORE.get(key)))
+
+def dataset_stats(key):
+    """Mergeable statistics of a whole dataset version."""
+    return STORE.get_or_build(('stats',) + key, lambda: IncrementalStats.from_frame(STORE.get(key)))
+
+def get_cube():
+    """Aggregate cube of the session's current selection, built once per dataset version and filter."""
+    key = st.session_state['df_key']
+    filter_key = st.session_state.get('filter_key', ())
+    if filter_key:
+        return SELECTIONS.get_or_build(('cube', key, filter_key), lambda: build_cube(get_filtered_df()))
+    return dataset_cube(key)
+
+def get_stats():
+    """Incremental statistics (moments, contingency counts, co-moments, quantile sketches) of the current selection."""
+    key = st.session_state['df_key']
+    filter_key = st.session_state.get('filter_key', ())
+    if filter_key:
+        return SELECTIONS.get_or_build(('stats', key, filter_key), lambda: IncrementalStats.from_frame(get_filtered_df()))
+    return dataset_stats(key)
+
+def get_artifacts():
+    """Batch-computed artifacts of the session's dataset, or None when filtered or none match this version."""
+    if st.session_state.get('filter_key'):
+        return None
+    return Artifacts.load(st.session_state['df_key'])
+
+def get_filter_index():
+    """Bitmap and sorted-range filter index of the session's frame, built once per dataset version."""
+    key = st.session_state['df_key']
+    return STORE.get_or_build(('filter_index',) + key, lambda: FilterIndex(STORE.get(key)))
+
+def get_filtered_df():
+    """The session's frame restricted to the active sidebar filters."""
+    df = st.session_state.get('df')
+    filter_key = st.session_state.get('filter_key', ())
+    if df is None or not filter_key:
+        return df
+    key = st.session_state['df_key']
+    return SELECTIONS.get_or_build(('frame', key, filter_key),
+                                   lambda: df[get_filter_index().mask(filter_key)])
@@ -0,0 +1,283 @@
+"""
+Statistical analysis page.
+"""
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+import plotly.graph_objects as go
+
+from core.dataset import TEST_VARIABLES
+from core.filters import SELECTIONS
+from core.instrumentation import span
+from core.resampling import DEFAULT_RESAMPLES, EXACT_MAX_CELLS, MAX_SUPPORT, resample_test
+from core.screening import MIN_LEVEL_COUNT, drop_rare_levels, run_screening, screening_columns, significance_column
+from core.statistics import anova_batch, chi_square, contingency_table, largest_groups_ttest
+from views.session import get_artifacts, get_filtered_df, get_stats
+
+def get_test_result(test, spec, builder):
+    """Statistical test result memoized per (dataset version, filter, test spec), served from batch artifacts when present."""
+    key = ('test', st.session_state['df_key'], st.session_state.get('filter_key', ()), test, spec)
+    
+    def serve_or_build():
+        artifacts = get_artifacts()
+        served = artifacts.test_result(test, spec) if artifacts else None
+        return served if served is not None else builder()
+    
+    with span(test, 'test'):
+        return SELECTIONS.get_or_build(key, serve_or_build)
+
+def run_gender_ttests():
+    """T-tests of every test variable between the two largest gender groups, from the incremental moments."""
+    return largest_groups_ttest(get_stats(), 'Gender', TEST_VARIABLES)
+
+def run_chi_square(col1, col2):
+    """Contingency table, excluded rare levels and chi-square test of two categorical columns (tracked counts when available)."""
+    stats = get_stats()
+    contingency = stats.contingency(col1, col2)
+    if contingency is None:
+        df = get_filtered_df()
+        contingency = contingency_table(df[col1], df[col2])
+        counts1, counts2 = df[col1].value_counts(), df[col2].value_counts()
+    else:
+        counts1, counts2 = stats.value_counts(col1), stats.value_counts(col2)
+    # Stray labels seen a handful of times would dominate the statistic, as in screening they are left out
+    contingency, excluded = drop_rare_levels(contingency, counts1, counts2)
+    return contingency, excluded, chi_square(contingency)
+
+RESAMPLING_GROUPS = ['Gender', 'Diagnosis', 'Treatment_Outcome']
+
+# Resampling mode label -> resample_test(approximate=...)
+RESAMPLING_MODES = {'Auto': None, 'Exact': False, 'Approximate': True}
+
+def run_resampling_test(group_col, group1, group2, variable, statistic, n_resamples, seed, approximate=None,
+                        progress=None):
+    """Permutation test and bootstrap CI of a mean/median difference between two groups."""
+    df = get_filtered_df()
+    groups = df[group_col]
+    return resample_test(df.loc[groups == group1, variable], df.loc[groups == group2, variable],
+                         statistic=statistic, n_resamples=n_resamples, seed=seed, approximate=approximate,
+                         progress=progress)
+
+def show_statistical_analysis():
+    """Statistical analysis page."""
+    st.markdown('<h2 class="section-header">🧪 Statistical Analysis & Testing</h2>', unsafe_allow_html=True)
+    
+    if not st.session_state.get('data_loaded', False):
+        st.warning("⚠️ Please load the dataset first.")
+        return
+    
+    df = get_filtered_df()
+    
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(["📊 ANOVA Tests", "📈 T-Tests", "📉 Chi-Square Tests",
+                                            "🧮 All-Pairs Screening", "🎲 Resampling Tests"])
+    
+    with tab1:
+        st.markdown("### Analysis of Variance (ANOVA)")
+        st.info("Tests if there are significant differences in means across different groups")
+        
+        if st.button("🔬 Run ANOVA Tests", key="run_anova", width='stretch', type="primary"):
+            with st.spinner("Performing ANOVA tests..."):
+                if 'Diagnosis' in df.columns:
+                    # All variables in one batch from the incremental per-diagnosis moments
+                    anova = get_test_result('anova', ('Diagnosis', tuple(TEST_VARIABLES)), lambda: anova_batch(
+                        get_stats().group_moments('Diagnosis', TEST_VARIABLES)))
+                    results = []
+                    
+                    for var, row in anova[anova['p'].notna()].iterrows():
+                        results.append({
+                            'Variable': var,
+                            'F-Statistic': f"{row['F']:.4f}",
+                            'P-Value': f"{row['p']:.6f}",
+                            'Significant (α=0.05)': '✅ Yes' if row['p'] < 0.05 else '❌ No',
+                            'Effect': 'Strong' if row['p'] < 0.01 else 'Moderate' if row['p'] < 0.05 else 'None'
+                        })
+                    
+                    if results:
+                        st.success(f"✅ Completed {len(results)} ANOVA tests")
+                        results_df = pd.DataFrame(results)
+                        st.dataframe(results_df, width='stretch')
+                        
+                        st.markdown("""
+                        **Interpretation:**
+                        - **P-value < 0.05**: Significant difference between groups
+                        - **P-value ≥ 0.05**: No significant difference
+                        - **F-statistic**: Higher values indicate greater between-group variance
+                        """)
+                    else:
+                        st.error("No valid tests could be performed")
+    
+    with tab2:
+        st.markdown("### Independent T-Tests")
+        st.info("Compares means between two groups")
+        
+        if st.button("🔬 Run Gender Comparison T-Tests", key="run_ttest", width='stretch', type="primary"):
+            with st.spinner("Performing t-tests..."):
+                if 'Gender' in df.columns:
+                    ttest = get_test_result('ttest', ('Gender', tuple(TEST_VARIABLES)), run_gender_ttests)
+                    
+                    if ttest is not None:
+                        gender1, gender2, ttests = ttest
+                        results = []
+                        
+                        for var, row in ttests[ttests['p'].notna()].iterrows():
+                            results.append({
+                                'Variable': var,
+                                f'{gender1} Mean': f"{row['mean_1']:.2f}",
+                                f'{gender2} Mean': f"{row['mean_2']:.2f}",
+                                'T-Statistic': f"{row['t']:.4f}",
+                                'P-Value': f"{row['p']:.6f}",
+                                'Significant': '✅ Yes' if row['p'] < 0.05 else '❌ No'
+                            })
+                        
+                        if results:
+                            st.success(f"✅ Completed {len(results)} t-tests")
+                            st.dataframe(pd.DataFrame(results), width='stretch')
+    
+    with tab3:
+        st.markdown("### Chi-Square Tests")
+        st.info("Tests independence between categorical variables")
+        
+        categorical_cols, _ = screening_columns(df)
+        if len(categorical_cols) < 2:
+            st.warning("At least two categorical columns are needed for a chi-square test.")
+        else:
+            col1, col2 = st.columns(2)
+            with col1:
+                var1 = st.selectbox("First variable:", categorical_cols,
+                                    index=categorical_cols.index('Gender') if 'Gender' in categorical_cols else 0,
+                                    key="chi_var1")
+            with col2:
+                others = [c for c in categorical_cols if c != var1]
+                var2 = st.selectbox("Second variable:", others,
+                                    index=others.index('Diagnosis') if 'Diagnosis' in others else 0,
+                                    key="chi_var2")
+            
+            if st.button("🔬 Run Chi-Square Test", key="run_chi", width='stretch', type="primary"):
+                with st.spinner("Performing chi-square test..."):
+                    contingency, excluded, (chi2, p_value, dof, expected) = get_test_result(
+                        'chi_square', (var1, var2), lambda: run_chi_square(var1, var2))
+                    
+                    col1, col2, col3 = st.columns(3)
+                    with col1:
+                        st.metric("Chi-Square Statistic", f"{chi2:.4f}")
+                    with col2:
+                        st.metric("P-Value", f"{p_value:.6f}")
+                    with col3:
+                        st.metric("Degrees of Freedom", dof)
+                    
+                    st.markdown("#### Contingency Table")
+                    st.dataframe(contingency, width='stretch')
+                    
+                    left_out = [f"{var}: {', '.join(levels)}" for var, levels in excluded.items() if levels]
+                    if left_out:
+                        st.caption(f"Levels seen fewer than {MIN_LEVEL_COUNT} times are left out of the test — "
+                                   + "; ".join(left_out))
+    
+    with tab4:
+        st.markdown("### All-Pairs Screening")
+        st.info("ANOVA and Kruskal-Wallis for every categorical × numeric pair, chi-square and Cramér's V "
+                "for every categorical × categorical pair, with Benjamini-Hochberg FDR correction")
+        
+        if st.button("🔬 Run Screening", key="run_screening", width='stretch', type="primary"):
+            with st.spinner("Screening all column pairs..."):
+                screening = get_test_result('screening', (), lambda: run_screening(get_filtered_df()))
+                
+                if screening.empty:
+                    st.error("No valid tests could be performed")
+                else:
+                    n_significant = int(screening[significance_column()].sum())
+                    st.success(f"✅ Completed {len(screening)} tests, {n_significant} significant after FDR correction")
+                    st.dataframe(screening, width='stretch', hide_index=True,
+                                 column_config={
+                                     'Statistic': st.column_config.NumberColumn(format="%.4f"),
+                                     'P-Value': st.column_config.NumberColumn(format="%.6f"),
+                                     'Q-Value (FDR)': st.column_config.NumberColumn(format="%.6f"),
+                                     'Effect Size': st.column_config.NumberColumn(format="%.4f"),
+                                 })
+                    st.caption(f"Click a column header to sort. Levels seen fewer than {MIN_LEVEL_COUNT} times are left out of the tests.")
+    
+    with tab5:
+        st.markdown("### Permutation & Bootstrap Tests")
+        st.info("Distribution-free comparison of two groups: permutation p-value and bootstrap confidence interval "
+                "for the difference in means or medians")
+        
+        group_cols = [col for col in RESAMPLING_GROUPS if col in df.columns]
+        variables = [col for col in TEST_VARIABLES if col in df.columns and df[col].notna().any()]
+        if not group_cols or not variables:
+            st.warning("No grouping columns or numeric variables available.")
+            return
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            group_col = st.selectbox("Group by:", group_cols, key="resample_group")
+        levels = get_stats().value_counts(group_col).index.tolist()
+        if len(levels) < 2:
+            st.warning(f"Need at least two {group_col} groups in this selection.")
+            return
+        with col2:
+            group1 = st.selectbox("Group A:", levels, index=0, key="resample_g1")
+        with col3:
+            others = [level for level in levels if level != group1]
+            group2 = st.selectbox("Group B:", others, index=0, key="resample_g2")
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            variable = st.selectbox("Variable:", variables, index=variables.index('WBC') if 'WBC' in variables else 0,
+                                    key="resample_var")
+        with col2:
+            statistic = st.radio("Statistic:", ['median', 'mean'], horizontal=True, key="resample_stat")
+        with col3:
+            n_resamples = int(st.number_input("Resamples:", min_value=1000, max_value=200000,
+                                              value=DEFAULT_RESAMPLES, step=1000, key="resample_n"))
+        with col4:
+            seed = int(st.number_input("Seed:", min_value=0, value=42, step=1, key="resample_seed"))
+        mode = st.radio("Mode:", list(RESAMPLING_MODES), horizontal=True, key="resample_mode",
+                        help=f"Exact tests resample the observed values; approximate ones draw the means of "
+                             f"{MAX_SUPPORT:,} quantile bins, so the p-value and CI are approximations. "
+                             f"Auto stays exact unless resamples × group sizes exceed {EXACT_MAX_CELLS:,}.")
+        approximate = RESAMPLING_MODES[mode]
+        
+        if st.button("🔬 Run Resampling Test", key="run_resampling", width='stretch', type="primary"):
+            with st.spinner(f"Running {n_resamples:,} permutation and bootstrap resamples..."):
+                progress_bar = st.progress(0.0)
+                
+                def report_progress(done, total):
+                    progress_bar.progress(done / total, text=f"{done:,} / {total:,} resamples")
+                
+                spec = (group_col, str(group1), str(group2), variable, statistic, n_resamples, seed, approximate)
+                result = get_test_result('resampling', spec, lambda: run_resampling_test(
+                    group_col, group1, group2, variable, statistic, n_resamples, seed, approximate,
+                    progress=report_progress))
+                progress_bar.empty()
+            
+            if result is None:
+                st.error("Each group needs at least two values of this variable.")
+            else:
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric(f"Observed {statistic.title()} Difference (A − B)", f"{result.observed:,.2f}")
+                with col2:
+                    st.metric(f"{result.confidence:.0%} Bootstrap CI", f"[{result.ci_low:,.2f}, {result.ci_high:,.2f}]")
+                with col3:
+                    st.metric("Permutation P-Value", f"{result.p_value:.4f}")
+                
+                # Null distribution, binned server-side
+                counts, edges = np.histogram(result.permuted, bins=60)
+                fig = go.Figure(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges),
+                                       marker_color='#636EFA', name='Permuted'))
+                fig.add_vline(x=result.observed, line_color='#EF553B', line_dash='dash',
+                              annotation_text='Observed')
+                fig.update_layout(title=f'Permutation Distribution of the {statistic.title()} Difference',
+                                  xaxis_title=f'{variable}: {group1} − {group2}', yaxis_title='Resamples',
+                                  bargap=0, height=400)
+                st.plotly_chart(fig, width='stretch')
+                
+                caption = (f"n = {result.n1:,} vs {result.n2:,}; {result.n_resamples:,} resamples, seed {result.seed}. "
+                           f"Significant at α=0.05: {'✅ Yes' if result.p_value < 0.05 else '❌ No'}")
+                if result.binned:
+                    caption += (f" · Approximate: values resampled over {result.support_size:,} equal-frequency bins, "
+                                "so the p-value and CI are approximations.")
+                    if approximate is None:
+                        caption += " Binned automatically for these group sizes; pick Exact to resample raw values."
+                st.caption(caption)
@@ -0,0 +1,235 @@
+"""
+Visualizations page.
+"""
+
+import streamlit as st
+import numpy as np
+
+from core import charts
+from core.aggregates import AGE_BUCKET
+from core.correlation import METHODS, RankIndex, correlation_columns, correlation_pairs, pearson_matrix, rank_matrix
+from core.dataset_store import STORE
+from core.distributions import summarize
+from core.figure_cache import FIGURES
+from core.filters import SELECTIONS
+from core.instrumentation import span
+from core.pairplot import PAIR_BINS, pair_histogram
+from views.session import get_artifacts, get_cube, get_filtered_df, get_stats
+
+def get_rank_index():
+    """Per-column sort orders of the current selection, shared by the rank-based correlation methods."""
+    key = st.session_state['df_key']
+    filter_key = st.session_state.get('filter_key', ())
+    if filter_key:
+        return SELECTIONS.get_or_build(('ranks', key, filter_key), lambda: RankIndex(get_filtered_df()))
+    return STORE.get_or_build(('ranks',) + key, lambda: RankIndex(STORE.get(key)))
+
+def get_correlation(method):
+    """Correlation matrix, p-values and pairwise counts, cached per (dataset version, filter, method)."""
+    key = ('correlation', st.session_state['df_key'], st.session_state.get('filter_key', ()), method)
+    
+    def build():
+        artifacts = get_artifacts()
+        served = artifacts.correlation(method) if artifacts else None
+        if served is not None:
+            return served
+        if method == 'pearson':
+            comoments = get_stats().comoments
+            return pearson_matrix(comoments, [col for col in get_rank_index().columns if col in comoments.columns])
+        return rank_matrix(get_rank_index(), method)
+    
+    return SELECTIONS.get_or_build(key, build)
+
+def get_distribution(col, bins=40):
+    """Histogram/quantile/KDE summary of a column, cached per (dataset version, filter, column, bins)."""
+    key = ('distribution', st.session_state['df_key'], st.session_state.get('filter_key', ()), col, bins)
+    return SELECTIONS.get_or_build(key, lambda: summarize(get_filtered_df()[col], bins=bins))
+
+def get_pair_histogram(col1, col2, bins=PAIR_BINS):
+    """2D histogram of a column pair on the diagonal summaries' edges, cached per (dataset version, filter, pair)."""
+    key = ('pair_histogram', st.session_state['df_key'], st.session_state.get('filter_key', ()), col1, col2, bins)
+    
+    def build():
+        df = get_filtered_df()
+        return pair_histogram(df[col1].to_numpy(dtype=np.float64, na_value=np.nan),
+                              df[col2].to_numpy(dtype=np.float64, na_value=np.nan),
+                              get_distribution(col1, bins).edges, get_distribution(col2, bins).edges, col1, col2)
+    
+    return SELECTIONS.get_or_build(key, build)
+
+def show_visualizations():
+    """Advanced visualizations page."""
+    st.markdown('<h2 class="section-header">📈 Advanced Data Visualizations</h2>', unsafe_allow_html=True)
+    
+    if not st.session_state.get('data_loaded', False):
+        st.warning("⚠️ Please load the dataset first.")
+        return
+    
+    df = get_filtered_df()
+    
+    # Visualization categories
+    viz_type = st.selectbox("Select Visualization Category", 
+                           ["📊 Distribution Plots", "🔗 Relationship Analysis", 
+                            "📉 Comparison Charts", "🎯 Advanced 3D & Animated"])
+    
+    if viz_type == "📊 Distribution Plots":
+        show_distribution_plots(df)
+    elif viz_type == "🔗 Relationship Analysis":
+        show_relationship_analysis(df)
+    elif viz_type == "📉 Comparison Charts":
+        show_comparison_charts(df)
+    elif viz_type == "🎯 Advanced 3D & Animated":
+        show_advanced_plots(df)
+
+def show_figure(chart, build, *params):
+    """Draw a chart served from the shared figure cache. Returns False when there was nothing to draw.
+    
+    build returns (figure or None, caption or None); it only runs on a cache miss for
+    (chart, dataset version, filter, params) that no batch artifact covers.
+    """
+    key = (chart, st.session_state['df_key'], st.session_state.get('filter_key', ())) + params
+    
+    def serve_or_build():
+        artifacts = get_artifacts()
+        served = artifacts.figure(chart, *params) if artifacts else None
+        return served if served is not None else build()
+    
+    with span(chart, 'chart'):
+        figure, caption = FIGURES.get_or_build(key, serve_or_build)
+        if figure is None:
+            return False
+        with span('plotly_chart', 'render'):
+            st.plotly_chart(figure, width='stretch')
+    if caption:
+        st.caption(caption)
+    return True
+
+def show_distribution_plots(df):
+    """Distribution visualization section."""
+    st.markdown("### 📊 Distribution Analysis")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        if st.button("🎨 Age Distribution Histogram", key="age_hist"):
+            if 'Age' in df.columns:
+                show_figure('age_hist', lambda: charts.age_histogram(get_distribution('Age', bins=40)))
+        
+        if st.button("📈 Age Distribution Line Graph", key="age_line"):
+            if 'Age' in df.columns:
+                # Age frequency data from the cube's one-year buckets
+                show_figure('age_line', lambda: charts.age_line(get_cube().value_counts(AGE_BUCKET).sort_index()))
+    
+    with col2:
+        if st.button("📊 Diagnosis Pie Chart", key="diag_pie"):
+            if 'Diagnosis' in df.columns:
+                show_figure('diag_pie', lambda: charts.diagnosis_pie(df))
+    
+    col3, col4 = st.columns(2)
+    
+    with col3:
+        if st.button("🎯 WBC Distribution", key="wbc_dist"):
+            if 'WBC' in df.columns:
+                show_figure('wbc_dist', lambda: charts.wbc_violin(get_distribution('WBC')))
+    
+    with col4:
+        if st.button("📉 Hemoglobin KDE Plot", key="hgb_kde"):
+            if 'Hemoglobin' in df.columns:
+                if not show_figure('hgb_kde', lambda: charts.hemoglobin_kde(get_distribution('Hemoglobin'))):
+                    st.info("No Hemoglobin values recorded in this selection")
+
+def show_relationship_analysis(df):
+    """Relationship analysis section."""
+    st.markdown("### 🔗 Correlation & Relationships")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        method = st.radio("Correlation method:", METHODS, format_func=str.title, horizontal=True, key="corr_method")
+        if st.button("🔥 Correlation Heatmap", key="corr_heat"):
+            result = get_correlation(method)
+            if len(result.corr.columns) >= 2:
+                show_figure('corr_heat', lambda: charts.correlation_heatmap(result), method)
+                
+                st.dataframe(correlation_pairs(result), width='stretch', hide_index=True,
+                             column_config={
+                                 'Correlation': st.column_config.NumberColumn(format="%.4f"),
+                                 'P-Value': st.column_config.NumberColumn(format="%.2e"),
+                             })
+                st.caption("Pairwise-complete observations; columns without values are left out.")
+            else:
+                st.info("Fewer than two numeric columns with values in this selection")
+    
+    with col2:
+        if st.button("📈 Age vs WBC Scatter", key="age_wbc_scatter"):
+            if all(col in df.columns for col in ['Age', 'WBC', 'Diagnosis']):
+                show_figure('age_wbc_scatter', lambda: charts.age_wbc_scatter(df))
+    
+    # Pairplot section (binned panels, cost independent of row count)
+    available_cols = correlation_columns(df)
+    pair_cols = st.multiselect("Pairplot columns:", available_cols, default=available_cols[:4], key="pairplot_cols")
+    if st.button("🎨 Generate Pairplot (Numeric Variables)", key="pairplot"):
+        with st.spinner("Creating pairplot..."):
+            if len(pair_cols) >= 2:
+                def build():
+                    summaries = {col: get_distribution(col, bins=PAIR_BINS) for col in pair_cols}
+                    histograms = {(a, b): get_pair_histogram(a, b)
+                                  for i, a in enumerate(pair_cols) for b in pair_cols[i + 1:]}
+                    return charts.pairplot(pair_cols, summaries, histograms)
+                
+                show_figure('pairplot', build, tuple(pair_cols))
+            else:
+                st.info("Select at least two columns")
+
+def show_comparison_charts(df):
+    """Comparison charts section."""
+    st.markdown("### 📉 Group Comparisons")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        if st.button("📊 WBC by Diagnosis (Box)", key="wbc_box"):
+            if all(col in df.columns for col in ['Diagnosis', 'WBC']):
+                show_figure('wbc_box', lambda: charts.wbc_box(df))
+    
+    with col2:
+        if st.button("🎻 Hemoglobin by Gender", key="hgb_gender"):
+            if all(col in df.columns for col in ['Gender', 'Hemoglobin']):
+                show_figure('hgb_gender', lambda: charts.hemoglobin_by_gender(df))
+    
+    col3, col4 = st.columns(2)
+    
+    with col3:
+        if st.button("📊 Treatment Outcome Sunburst", key="outcome_sun"):
+            if 'Treatment_Outcome' in df.columns and 'Diagnosis' in df.columns:
+                show_figure('outcome_sun', lambda: charts.outcome_sunburst(df))
+    
+    with col4:
+        if st.button("🎯 Risk Category Treemap", key="risk_tree"):
+            if 'Risk_Category' in df.columns and 'Diagnosis' in df.columns:
+                show_figure('risk_tree', lambda: charts.risk_treemap(df))
+
+def show_advanced_plots(df):
+    """Advanced 3D and animated plots."""
+    st.markdown("### 🎯 Advanced 3D & Animated Visualizations")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        if st.button("🌐 3D Scatter Plot", key="3d_scatter"):
+            if all(col in df.columns for col in ['Age', 'WBC', 'Hemoglobin', 'Diagnosis']):
+                show_figure('3d_scatter', lambda: charts.scatter_3d(df))
+    
+    with col2:
+        if st.button("📊 Animated Bubble Chart", key="bubble_anim"):
+            if all(col in df.columns for col in ['Age', 'WBC', 'Diagnosis']):
+                if 'Platelets' in df.columns:
+                    show_figure('bubble_anim', lambda: charts.bubble_chart(df))
+    
+    # Parallel coordinates
+    if st.button("🌈 Parallel Coordinates Plot", key="parallel"):
+        if 'Diagnosis' in df.columns:
+            available_cols = [col for col in charts.PARALLEL_COLUMNS if col in df.columns]
+            
+            if len(available_cols) >= 3:
+                show_figure('parallel', lambda: charts.parallel_coordinates(df, available_cols))